@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Achievement, UserAchievement
+from .models import Achievement, UserAchievement, AchievementEvent
 
 
 class AchievementAdmin(admin.ModelAdmin):
@@ -32,9 +32,14 @@ class UserAchievementAdmin(admin.ModelAdmin):
     readonly_fields = ('unlocked_at',)
 
 
-admin.site.register(Achievement, AchievementAdmin)
-admin.site.register(UserAchievement, UserAchievementAdmin)
-
-
+class AchievementEventAdmin(admin.ModelAdmin):
+    list_display = ('user', 'event_type', 'attempts', 'created_at')
+    list_filter = ('event_type', 'attempts')
+    search_fields = ('user__username',)
+    ordering = ('id',)
+    readonly_fields = ('created_at',)
 
 
+admin.site.register(Achievement, AchievementAdmin)
+admin.site.register(UserAchievement, UserAchievementAdmin)
+admin.site.register(AchievementEvent, AchievementEventAdmin)
@@ -0,0 +1,51 @@
+"""Achievement caches
+
+The active achievement list is cached under the rule engine's shared version,
+so every process replaces it whenever an Achievement row changes. Each user's unlocked
+achievement ids are cached as a frozenset and dropped whenever the user
+unlocks (or loses) an achievement.
+"""
+from django.core.cache import cache
+
+from .models import Achievement, UserAchievement
+from .engine import get_rules_version
+
+ACTIVE_ACHIEVEMENTS_KEY = 'achievements:active:v{version}'
+ACTIVE_ACHIEVEMENTS_TIMEOUT = 60 * 60
+UNLOCKED_IDS_KEY = 'achievements:unlocked:{user_id}'
+UNLOCKED_IDS_TIMEOUT = 60 * 60 * 24
+
+
+def get_active_achievements():
+    """Get all active achievements in display order (cached)
+    
+    Returns:
+        list: Achievement objects
+    """
+    key = ACTIVE_ACHIEVEMENTS_KEY.format(version=get_rules_version())
+    achievements = cache.get(key)
+    if achievements is None:
+        achievements = list(Achievement.objects.filter(is_active=True).order_by('order', 'created_at'))
+        cache.set(key, achievements, ACTIVE_ACHIEVEMENTS_TIMEOUT)
+    return achievements
+
+
+def get_unlocked_achievement_ids(user):
+    """Get ids of the achievements a user has unlocked (cached)
+    
+    Returns:
+        frozenset: Achievement ids
+    """
+    key = UNLOCKED_IDS_KEY.format(user_id=user.pk)
+    unlocked_ids = cache.get(key)
+    if unlocked_ids is None:
+        unlocked_ids = frozenset(
+            UserAchievement.objects.filter(user=user).values_list('achievement_id', flat=True)
+        )
+        cache.set(key, unlocked_ids, UNLOCKED_IDS_TIMEOUT)
+    return unlocked_ids
+
+
+def invalidate_unlocked_achievement_ids(user_id):
+    """Drop a user's cached unlocked achievement ids"""
+    cache.delete(UNLOCKED_IDS_KEY.format(user_id=user_id))
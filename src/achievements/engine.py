@@ -0,0 +1,185 @@
+"""Achievement rule engine
+
+Active achievements are compiled once into an in-process index keyed by
+achievement type, with count-based rules sorted by threshold. Evaluating an
+event is a bisect over the index plus one query for the user's unlocked set.
+Each process rebuilds its index when the rules version in the shared cache
+(see mysite.cache_versions) changes, which happens whenever an Achievement
+row is saved or deleted.
+"""
+import bisect
+import threading
+from collections import namedtuple
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from mysite.cache_versions import bump_version, get_version
+from .models import Achievement, UserAchievement
+from .notifications import bump_notification_version
+
+RULES_VERSION_KEY = 'achievements:rules:version'
+
+# Achievement type -> (requirements key, event kwarg) for count threshold rules
+COUNT_RULES = {
+    'lesson_complete': ('lesson_count', 'completed_count'),
+    'spending_tracked': ('spending_count', 'tracked_count'),
+    'wallet_created': ('wallet_count', 'wallet_count'),
+}
+
+Rule = namedtuple('Rule', ['threshold', 'goal_id', 'achievement'])
+
+
+class RuleIndex:
+    """Compiled active achievements, grouped by type"""
+    
+    def __init__(self, achievements):
+        self.rules = {}
+        for achievement in achievements:
+            requirements = achievement.requirements or {}
+            threshold = 0
+            if achievement.achievement_type in COUNT_RULES:
+                requirement_key = COUNT_RULES[achievement.achievement_type][0]
+                threshold = requirements.get(requirement_key, 1)
+            rule = Rule(threshold, requirements.get('goal_id'), achievement)
+            self.rules.setdefault(achievement.achievement_type, []).append(rule)
+        
+        # Stable sort keeps display order among rules with the same threshold
+        for rules in self.rules.values():
+            rules.sort(key=lambda rule: rule.threshold)
+        self.thresholds = {
+            achievement_type: [rule.threshold for rule in rules]
+            for achievement_type, rules in self.rules.items()
+        }
+    
+    def match(self, achievement_type, **kwargs):
+        """Get achievements whose requirements are met by an event
+        
+        Args:
+            achievement_type: Achievement type
+            **kwargs: Event parameters (completed_count, tracked_count, wallet_count, goal_id)
+        
+        Returns:
+            list: Matching Achievement objects
+        """
+        rules = self.rules.get(achievement_type)
+        if not rules:
+            return []
+        
+        if achievement_type in COUNT_RULES:
+            count = kwargs.get(COUNT_RULES[achievement_type][1], 0)
+            satisfied = bisect.bisect_right(self.thresholds[achievement_type], count)
+            return [rule.achievement for rule in rules[:satisfied]]
+        
+        if achievement_type == 'saving_goal_reached':
+            # Rules without a goal_id are unlocked by any completed goal
+            goal_id = kwargs.get('goal_id')
+            return [rule.achievement for rule in rules if rule.goal_id is None or rule.goal_id == goal_id]
+        
+        if achievement_type == 'milestone':
+            return [rule.achievement for rule in rules]
+        
+        return []
+
+
+_index_lock = threading.Lock()
+_index = None
+_index_version = None
+
+
+def get_rules_version():
+    """Get the current rules version from the shared cache"""
+    return get_version(RULES_VERSION_KEY)
+
+
+def get_rule_index():
+    """Get the compiled rule index, rebuilding it if the rules have changed"""
+    global _index, _index_version
+    version = get_rules_version()
+    index = _index
+    if index is None or _index_version != version:
+        with _index_lock:
+            if _index is None or _index_version != version:
+                achievements = Achievement.objects.filter(is_active=True).order_by('order', 'created_at')
+                _index = RuleIndex(achievements)
+                _index_version = version
+            index = _index
+    return index
+
+
+def invalidate_rule_index():
+    """Drop the compiled index and bump the shared rules version, so every process rebuilds it"""
+    global _index
+    _index = None
+    bump_version(RULES_VERSION_KEY)
+
+
+def unlock_matching_achievements(user, achievement_type, **kwargs):
+    """Unlock every achievement newly satisfied by an event
+    
+    Args:
+        user: User object
+        achievement_type: Achievement type
+        **kwargs: Event parameters
+    
+    Returns:
+        list: Newly created UserAchievement objects
+    """
+    candidates = get_rule_index().match(achievement_type, **kwargs)
+    if not candidates:
+        return []
+    
+    unlocked_ids = set(UserAchievement.objects.filter(
+        user=user,
+        achievement_id__in=[achievement.id for achievement in candidates]
+    ).values_list('achievement_id', flat=True))
+    new_achievements = [achievement for achievement in candidates if achievement.id not in unlocked_ids]
+    if not new_achievements:
+        return []
+    
+    try:
+        with transaction.atomic():
+            user_achievements = UserAchievement.objects.bulk_create([
+                UserAchievement(user=user, achievement=achievement, is_notified=False)
+                for achievement in new_achievements
+            ])
+    except IntegrityError:
+        # A concurrent event unlocked some of these first, fall back to get_or_create per achievement
+        from .utils import unlock_achievement
+        return [unlock_achievement(user, achievement) for achievement in new_achievements]
+    
+    # bulk_create sends no post_save, so refresh the unlocked-id cache here
+    from .cache import invalidate_unlocked_achievement_ids
+    invalidate_unlocked_achievement_ids(user.pk)
+    reward_achievements(user, new_achievements)
+    bump_notification_version(user.pk)
+    return user_achievements
+
+
+def reward_achievements(user, achievements):
+    """Credit coin rewards for unlocked achievements to the user's first wallet"""
+    rewarded = [achievement for achievement in achievements if achievement.coin_reward > 0]
+    if not rewarded:
+        return
+    
+    try:
+        from wallet.models import Wallet, WalletTransaction
+        from wallet.utils import bulk_create_transactions
+        # Skip rewards if the user has no wallet yet
+        wallet_id = Wallet.objects.filter(user=user).values_list('pk', flat=True).first()
+        if wallet_id is None:
+            return
+        today = timezone.now().date()
+        bulk_create_transactions([
+            WalletTransaction(
+                wallet_id=wallet_id,
+                transaction_type='income',
+                amount=achievement.coin_reward,
+                description=f'Achievement reward: {achievement.name}',
+                date=today
+            )
+            for achievement in rewarded
+        ])
+    except Exception:
+        # If wallet system unavailable, fail silently
+        pass
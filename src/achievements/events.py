@@ -0,0 +1,235 @@
+"""Achievement event outbox
+
+Signal handlers only record that something happened for a user; the
+process_achievement_events worker drains the outbox in batches, recomputes
+the relevant counts with grouped queries and runs the rule engine.
+"""
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import AchievementEvent, UserAchievement
+from .utils import check_and_unlock_achievements
+from .engine import get_rule_index
+from .notifications import bump_notification_version
+from .cache import invalidate_unlocked_achievement_ids
+
+User = get_user_model()
+
+logger = logging.getLogger(__name__)
+
+# Events that keep failing are left in the outbox for inspection until the
+# same event is recorded again
+MAX_ATTEMPTS = 5
+
+
+def enqueue_achievement_event(user, event_type):
+    """Record an achievement event for a user (one upsert, deduplicated per user and type)
+    
+    A new event resets the attempts of a pending row, so a row left behind
+    after MAX_ATTEMPTS failures is retried instead of swallowing the event.
+    
+    With ACHIEVEMENT_EVENTS_EAGER enabled (the default) the event is evaluated
+    instead, once the current transaction commits. Signals fire before the
+    sender has finished its write (e.g. a saving goal's stored progress), so
+    evaluating earlier could miss it. Queued events need a running worker.
+    """
+    if getattr(settings, 'ACHIEVEMENT_EVENTS_EAGER', True):
+        user_id = user.pk
+        transaction.on_commit(lambda: evaluate_achievement_events(event_type, [user_id]), robust=True)
+        return
+    AchievementEvent.objects.bulk_create(
+        [AchievementEvent(user=user, event_type=event_type, attempts=0)],
+        update_conflicts=True,
+        unique_fields=['user', 'event_type'],
+        update_fields=['attempts']
+    )
+
+
+def _count_by_user(queryset, user_ids):
+    rows = queryset.filter(user_id__in=user_ids).values('user_id').annotate(count=Count('id')).order_by()
+    return {row['user_id']: row['count'] for row in rows}
+
+
+def _completed_goals_by_user(user_ids):
+    from tracking.models import SavingGoal
+    goals = SavingGoal.objects.filter(user_id__in=user_ids).completed().values_list('user_id', 'id')
+    completed = {}
+    for user_id, goal_id in goals:
+        completed.setdefault(user_id, []).append(goal_id)
+    return completed
+
+
+def evaluate_achievement_events(event_type, user_ids):
+    """Evaluate one event type for many users
+    
+    Args:
+        event_type: Achievement type
+        user_ids: User ids with a pending event of this type
+    
+    Returns:
+        list: Newly unlocked UserAchievement objects
+    """
+    from tracking.models import Spending
+    from wallet.models import Wallet
+    from lessons.models import UserLessonProgress
+    
+    users = User.objects.in_bulk(user_ids)
+    unlocked = []
+    
+    if event_type == 'saving_goal_reached':
+        for user_id, goal_ids in _completed_goals_by_user(user_ids).items():
+            for goal_id in goal_ids:
+                unlocked += check_and_unlock_achievements(users[user_id], event_type, goal_id=goal_id)
+        return unlocked
+    
+    if event_type == 'lesson_complete':
+        counts = _count_by_user(UserLessonProgress.objects.filter(status='completed'), user_ids)
+        count_kwarg = 'completed_count'
+    elif event_type == 'spending_tracked':
+        counts = _count_by_user(Spending.objects.all(), user_ids)
+        count_kwarg = 'tracked_count'
+    elif event_type == 'wallet_created':
+        counts = _count_by_user(Wallet.objects.all(), user_ids)
+        count_kwarg = 'wallet_count'
+    else:
+        return unlocked
+    
+    for user_id, count in counts.items():
+        unlocked += check_and_unlock_achievements(users[user_id], event_type, **{count_kwarg: count})
+    return unlocked
+
+
+def process_achievement_events(batch_size=100):
+    """Process one batch of pending achievement events
+    
+    Events are claimed and deleted before evaluation, so an event recorded
+    while the batch runs creates a fresh row and is picked up next time.
+    
+    Returns:
+        tuple: (processed event count, failed event count)
+    """
+    with transaction.atomic():
+        events = list(
+            AchievementEvent.objects.select_for_update(skip_locked=True)
+            .filter(attempts__lt=MAX_ATTEMPTS)
+            .order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0, 0
+        AchievementEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+        
+        events_by_type = {}
+        for event in events:
+            events_by_type.setdefault(event.event_type, []).append(event)
+        
+        failed = []
+        for event_type, type_events in events_by_type.items():
+            try:
+                with transaction.atomic():
+                    evaluate_achievement_events(event_type, [event.user_id for event in type_events])
+            except Exception:
+                logger.exception('Failed to evaluate %s achievement events', event_type)
+                failed += type_events
+        
+        if failed:
+            # Put failed events back for a later retry
+            AchievementEvent.objects.bulk_create(
+                [AchievementEvent(user_id=event.user_id, event_type=event.event_type, attempts=event.attempts + 1)
+                 for event in failed],
+                ignore_conflicts=True
+            )
+    return len(events) - len(failed), len(failed)
+
+
+def recompute_achievements(user_ids, dry_run=False):
+    """Evaluate every rule for a chunk of users and unlock whatever they qualify for
+    
+    Counts come from grouped aggregates over the whole chunk; new unlocks and
+    their reward transactions are bulk inserted. Already unlocked
+    achievements are skipped, so re-running is safe. Milestone achievements
+    have no countable condition and are left alone.
+    
+    Args:
+        user_ids: User ids to evaluate
+        dry_run: Only count what would be unlocked
+    
+    Returns:
+        int: Number of achievements unlocked (or that would be unlocked)
+    """
+    from tracking.models import Spending
+    from wallet.models import Wallet, WalletTransaction
+    from wallet.utils import bulk_create_transactions
+    from lessons.models import UserLessonProgress
+    
+    index = get_rule_index()
+    counts = {
+        'lesson_complete': ('completed_count', _count_by_user(UserLessonProgress.objects.filter(status='completed'), user_ids)),
+        'spending_tracked': ('tracked_count', _count_by_user(Spending.objects.all(), user_ids)),
+        'wallet_created': ('wallet_count', _count_by_user(Wallet.objects.all(), user_ids)),
+    }
+    completed_goals = _completed_goals_by_user(user_ids)
+    
+    unlocked = {}
+    for user_id, achievement_id in UserAchievement.objects.filter(user_id__in=user_ids).values_list('user_id', 'achievement_id'):
+        unlocked.setdefault(user_id, set()).add(achievement_id)
+    
+    new_by_user = {}
+    for user_id in user_ids:
+        candidates = {}
+        for achievement_type, (count_kwarg, type_counts) in counts.items():
+            if user_id in type_counts:
+                for achievement in index.match(achievement_type, **{count_kwarg: type_counts[user_id]}):
+                    candidates[achievement.id] = achievement
+        for goal_id in completed_goals.get(user_id, []):
+            for achievement in index.match('saving_goal_reached', goal_id=goal_id):
+                candidates[achievement.id] = achievement
+        
+        user_unlocked = unlocked.get(user_id, set())
+        new_achievements = [achievement for achievement_id, achievement in candidates.items() if achievement_id not in user_unlocked]
+        if new_achievements:
+            new_by_user[user_id] = new_achievements
+    
+    unlock_count = sum(len(achievements) for achievements in new_by_user.values())
+    if dry_run or not new_by_user:
+        return unlock_count
+    
+    # Rewards go to each user's first wallet, as in reward_achievements
+    first_wallets = {}
+    for user_id, wallet_id in Wallet.objects.filter(user_id__in=list(new_by_user)).values_list('user_id', 'pk'):
+        first_wallets.setdefault(user_id, wallet_id)
+    
+    today = timezone.now().date()
+    try:
+        with transaction.atomic():
+            UserAchievement.objects.bulk_create([
+                UserAchievement(user_id=user_id, achievement=achievement, is_notified=False)
+                for user_id, achievements in new_by_user.items()
+                for achievement in achievements
+            ], batch_size=500)
+            bulk_create_transactions([
+                WalletTransaction(
+                    wallet_id=first_wallets[user_id],
+                    transaction_type='income',
+                    amount=achievement.coin_reward,
+                    description=f'Achievement reward: {achievement.name}',
+                    date=today
+                )
+                for user_id, achievements in new_by_user.items() if user_id in first_wallets
+                for achievement in achievements if achievement.coin_reward > 0
+            ])
+    except IntegrityError:
+        # Events unlocked some of these meanwhile, fall back to per-user evaluation
+        return sum(
+            len(evaluate_achievement_events(event_type, list(new_by_user)))
+            for event_type, _label in AchievementEvent.EVENT_TYPES
+        )
+    
+    for user_id in new_by_user:
+        invalidate_unlocked_achievement_ids(user_id)
+        bump_notification_version(user_id)
+    return unlock_count
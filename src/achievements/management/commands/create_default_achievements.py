@@ -97,6 +97,8 @@ class Command(BaseCommand):
                 f'\nSuccessfully created {created_count} and updated {updated_count} achievements!'
             )
         )
+        if created_count:
+            self.stdout.write('Run "python manage.py recompute_achievements" to unlock them for users who already qualify.')
 
 
 
@@ -0,0 +1,54 @@
+"""
+Management command: Process pending achievement events
+Usage: python manage.py process_achievement_events [--batch-size 100] [--loop] [--interval 5]
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from achievements.events import process_achievement_events
+
+
+class Command(BaseCommand):
+    help = 'Evaluate achievements for queued AchievementEvent rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of events processed per database transaction (default: 100)',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running and poll for new events',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds to wait when the queue is empty in --loop mode (default: 5)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(options['batch_size'], 1)
+        processed_total = 0
+        failed_total = 0
+        
+        while True:
+            processed, failed = process_achievement_events(batch_size=batch_size)
+            processed_total += processed
+            failed_total += failed
+            if processed or failed:
+                self.stdout.write(f'  Processed {processed} events ({failed} failed)')
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Processed {processed_total} achievement events'
+        ))
+        if failed_total:
+            self.stdout.write(self.style.WARNING(f'  {failed_total} events failed and were requeued'))
@@ -0,0 +1,48 @@
+"""
+Management command: Unlock achievements for users who already qualify
+Usage: python manage.py recompute_achievements [--chunk-size 500] [--dry-run]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from achievements.events import recompute_achievements
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Evaluate all users against all active achievements and unlock the ones they qualify for'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Number of users evaluated per database transaction (default: 500)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many achievements would be unlocked',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        dry_run = options['dry_run']
+        user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        total_users = len(user_ids)
+        unlock_count = 0
+        
+        for start in range(0, total_users, chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            unlock_count += recompute_achievements(chunk, dry_run=dry_run)
+            self.stdout.write(f'  {min(start + chunk_size, total_users)}/{total_users} users')
+        
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f'\nDry run: {unlock_count} achievements would be unlocked for {total_users} users'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'\n✓ Unlocked {unlock_count} achievements for {total_users} users'
+            ))
@@ -0,0 +1,32 @@
+# Generated by Django 6.0 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('achievements', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AchievementEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('lesson_complete', 'Lesson Completed'), ('saving_goal_reached', 'Saving Goal Reached'), ('spending_tracked', 'Spending Tracked'), ('wallet_created', 'Wallet Created')], max_length=50, verbose_name='Event Type')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='achievement_events', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Achievement Event',
+                'verbose_name_plural': 'Achievement Events',
+                'ordering': ['id'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'event_type'), name='achievements_event_user_type_uniq')],
+            },
+        ),
+    ]
@@ -71,3 +71,33 @@ class UserAchievement(models.Model):
 
 
 
+
+
+class AchievementEvent(models.Model):
+    """Pending achievement evaluation (outbox processed by process_achievement_events)
+    
+    At most one row exists per user and event type: the worker recomputes the
+    user's counts when it runs, so repeated events collapse into one.
+    """
+    EVENT_TYPES = [
+        ('lesson_complete', 'Lesson Completed'),
+        ('saving_goal_reached', 'Saving Goal Reached'),
+        ('spending_tracked', 'Spending Tracked'),
+        ('wallet_created', 'Wallet Created'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='achievement_events', verbose_name='User')
+    event_type = models.CharField(max_length=50, choices=EVENT_TYPES, verbose_name='Event Type')
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
+    
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Achievement Event'
+        verbose_name_plural = 'Achievement Events'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'event_type'], name='achievements_event_user_type_uniq'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} - {self.event_type}"
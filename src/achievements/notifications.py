@@ -0,0 +1,43 @@
+"""Achievement unlock notifications
+
+Every unlock bumps a per-user version in the cache. The notification stream
+watches that version and only queries the database when it changes (or on a
+slow fallback interval, for cache backends that are not shared between
+processes), so an idle stream costs one cache read every few seconds. With a
+database cache backend the stream only runs the slow fallback query.
+"""
+from django.core.cache import cache
+from django.dispatch import Signal
+
+from mysite.cache_versions import bump_version
+
+NOTIFY_VERSION_KEY = 'achievements:notify:{user_id}'
+
+# Sent with user_id whenever a user unlocks achievements (bulk unlocks send no post_save)
+achievements_unlocked = Signal()
+
+
+def serialize_user_achievement(user_achievement):
+    """Convert a UserAchievement (with achievement loaded) to notification data"""
+    achievement = user_achievement.achievement
+    return {
+        'id': user_achievement.id,
+        'achievement_id': achievement.id,
+        'name': achievement.name,
+        'description': achievement.description,
+        'icon': achievement.icon,
+        'color': achievement.color,
+        'coin_reward': float(achievement.coin_reward),
+        'unlocked_at': user_achievement.unlocked_at.isoformat(),
+    }
+
+
+def bump_notification_version(user_id):
+    """Signal open notification streams (and achievements_unlocked receivers) that the user has new achievements"""
+    bump_version(NOTIFY_VERSION_KEY.format(user_id=user_id))
+    achievements_unlocked.send(sender=None, user_id=user_id)
+
+
+async def aget_notification_version(user_id):
+    """Get the user's notification version (async)"""
+    return await cache.aget(NOTIFY_VERSION_KEY.format(user_id=user_id))
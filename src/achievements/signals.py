@@ -1,58 +1,52 @@
 """Achievement system signal handlers"""
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 
-from tracking.models import SavingGoal, Saving, Spending
+from tracking.models import Saving, Spending
 from wallet.models import Wallet
-from achievements.utils import check_and_unlock_achievements
+from achievements.models import Achievement, UserAchievement
+from achievements.engine import invalidate_rule_index
+from achievements.events import enqueue_achievement_event
+from achievements.cache import invalidate_unlocked_achievement_ids
 
 User = get_user_model()
 
 
 @receiver(post_save, sender=Saving)
 def check_saving_goal_achievements(sender, instance, created, **kwargs):
-    """When saving record is saved, check if associated saving goal is completed and unlock achievements"""
-    if created and instance.saving_goal:
-        # Refresh goal object to get latest progress
-        saving_goal = SavingGoal.objects.get(pk=instance.saving_goal.pk)
-        
-        # Check if goal is completed
-        if saving_goal.is_completed:
-            # Check and unlock "saving goal reached" type achievements
-            check_and_unlock_achievements(
-                user=instance.user,
-                achievement_type='saving_goal_reached',
-                goal_id=saving_goal.id
-            )
+    """When saving record is created for a goal, queue a saving goal achievement check"""
+    if created and instance.saving_goal_id:
+        enqueue_achievement_event(instance.user, 'saving_goal_reached')
 
 
 @receiver(post_save, sender=Wallet)
 def check_wallet_created_achievements(sender, instance, created, **kwargs):
-    """When wallet is created, check if achievements should be unlocked"""
+    """When wallet is created, queue a wallet achievement check"""
     if created:
-        # Get user's total wallet count
-        wallet_count = Wallet.objects.filter(user=instance.user).count()
-        
-        # Check and unlock "wallet created" type achievements
-        check_and_unlock_achievements(
-            user=instance.user,
-            achievement_type='wallet_created',
-            wallet_count=wallet_count
-        )
+        enqueue_achievement_event(instance.user, 'wallet_created')
 
 
 @receiver(post_save, sender=Spending)
 def check_spending_tracked_achievements(sender, instance, created, **kwargs):
-    """When spending record is created, check if achievements should be unlocked"""
+    """When spending record is created, queue a spending achievement check"""
     if created:
-        # Get user's total spending record count
-        spending_count = Spending.objects.filter(user=instance.user).count()
-        
-        # Check and unlock "spending tracked" type achievements
-        check_and_unlock_achievements(
-            user=instance.user,
-            achievement_type='spending_tracked',
-            tracked_count=spending_count
-        )
+        enqueue_achievement_event(instance.user, 'spending_tracked')
 
+
+@receiver(post_save, sender=Achievement)
+@receiver(post_delete, sender=Achievement)
+def invalidate_achievement_rules(sender, instance, **kwargs):
+    """When an achievement is saved or deleted, rebuild the rule index on next use
+    
+    Deferred until commit, so no process recompiles the old rules under the new version.
+    """
+    transaction.on_commit(invalidate_rule_index)
+
+
+@receiver(post_save, sender=UserAchievement)
+@receiver(post_delete, sender=UserAchievement)
+def invalidate_unlocked_achievements(sender, instance, **kwargs):
+    """When a user's achievement is saved or deleted, drop their cached unlocked ids"""
+    invalidate_unlocked_achievement_ids(instance.user_id)
@@ -1,6 +1,304 @@
-# Achievement system test file (to be implemented)
-# Unit tests can be added here to test achievement unlock logic
+import asyncio
+import json
+import threading
+from decimal import Decimal
+from unittest import mock
 
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
 
+from tracking.models import Saving, SavingGoal, Spending
+from wallet.models import Wallet
+from . import engine, views
+from .cache import get_active_achievements
+from .events import MAX_ATTEMPTS, evaluate_achievement_events, process_achievement_events
+from .models import Achievement, AchievementEvent, UserAchievement
+from .notifications import bump_notification_version
 
+User = get_user_model()
 
+
+class RuleIndexVersionTests(TestCase):
+    """Achievement changes reach compiled rule indexes in every process"""
+
+    def setUp(self):
+        cache.clear()
+        self.first = Achievement.objects.create(
+            name='First Wallet', description='Create a wallet', achievement_type='wallet_created',
+            requirements={'wallet_count': 1}
+        )
+
+    def _names(self, wallet_count):
+        return [achievement.name for achievement in engine.get_rule_index().match('wallet_created', wallet_count=wallet_count)]
+
+    def test_saved_achievement_rebuilds_an_index_compiled_elsewhere(self):
+        self.assertEqual(self._names(3), ['First Wallet'])
+        # What another process holds: the index compiled under the current version
+        stale_index, stale_version = engine._index, engine._index_version
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Achievement.objects.create(
+                name='Three Wallets', description='Create three wallets', achievement_type='wallet_created',
+                requirements={'wallet_count': 3}
+            )
+        engine._index, engine._index_version = stale_index, stale_version
+
+        self.assertEqual(self._names(3), ['First Wallet', 'Three Wallets'])
+
+    def test_rules_version_changes_only_after_commit(self):
+        version = engine.get_rules_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.first.is_active = False
+            self.first.save()
+            self.assertEqual(engine.get_rules_version(), version)
+
+        self.assertNotEqual(engine.get_rules_version(), version)
+        self.assertEqual(self._names(3), [])
+
+
+class ActiveAchievementCacheTests(TestCase):
+    """The cached active list follows achievement changes"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_deactivated_achievement_leaves_the_cached_list(self):
+        achievement = Achievement.objects.create(name='Saver', description='Reach a goal', achievement_type='saving_goal_reached')
+        self.assertEqual(get_active_achievements(), [achievement])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            achievement.is_active = False
+            achievement.save()
+
+        self.assertEqual(get_active_achievements(), [])
+
+
+class AchievementNotificationTests(TestCase):
+    """Unlocks reach open tabs through the event stream and are acknowledged in one request"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.friend = User.objects.create_user(username='friend', email='friend@example.com', password='secret')
+        self.first = Achievement.objects.create(name='First Wallet', description='Create a wallet', achievement_type='wallet_created')
+        self.second = Achievement.objects.create(name='Tracker', description='Track a spending', achievement_type='spending_tracked')
+
+    def _unlock(self, user, achievement):
+        user_achievement = UserAchievement.objects.create(user=user, achievement=achievement)
+        bump_notification_version(user.pk)
+        return user_achievement
+
+    @mock.patch('achievements.views.STREAM_POLL_INTERVAL', 0)
+    async def test_stream_sends_pending_then_new_unlocks(self):
+        pending = await sync_to_async(self._unlock)(self.user, self.first)
+        await sync_to_async(self._unlock)(self.friend, self.first)
+        stream = views._achievement_event_stream(self.user.pk)
+        try:
+            self.assertEqual(await anext(stream), f'retry: {views.STREAM_RETRY_MS}\n\n')
+            self.assertTrue((await anext(stream)).startswith(f'id: {pending.pk}\nevent: achievement\n'))
+
+            unlocked = await sync_to_async(self._unlock)(self.user, self.second)
+            event = await anext(stream)
+        finally:
+            await stream.aclose()
+
+        self.assertTrue(event.startswith(f'id: {unlocked.pk}\nevent: achievement\n'))
+        data = json.loads(event.split('data: ', 1)[1])
+        self.assertEqual(data['name'], 'Tracker')
+
+    @mock.patch('achievements.views.VERSION_POLL_CACHE_BACKENDS', set())
+    async def test_stream_polls_slowly_when_cache_reads_need_queries(self):
+        pending = await sync_to_async(self._unlock)(self.user, self.first)
+        stream = views._achievement_event_stream(self.user.pk)
+        with mock.patch('achievements.views.aget_notification_version') as aget_version, \
+                mock.patch('achievements.views.asyncio.sleep', side_effect=asyncio.CancelledError) as sleep:
+            await anext(stream)
+            self.assertTrue((await anext(stream)).startswith(f'id: {pending.pk}\n'))
+            with self.assertRaises(asyncio.CancelledError):
+                await anext(stream)
+
+        aget_version.assert_not_called()
+        sleep.assert_awaited_once_with(views.STREAM_DB_FALLBACK_INTERVAL)
+
+    def test_mark_notified_updates_only_own_achievements(self):
+        own = [self._unlock(self.user, self.first), self._unlock(self.user, self.second)]
+        other = self._unlock(self.friend, self.first)
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            reverse('achievements:mark_achievements_notified'),
+            json.dumps({'ids': [own[0].pk, own[1].pk, other.pk]}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.json(), {'success': True, 'updated': 2})
+        self.assertFalse(UserAchievement.objects.filter(user=self.user, is_notified=False).exists())
+        other.refresh_from_db()
+        self.assertFalse(other.is_notified)
+
+    def test_mark_notified_rejects_invalid_ids(self):
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            reverse('achievements:mark_achievements_notified'),
+            json.dumps({'ids': ['first']}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(ACHIEVEMENT_EVENTS_EAGER=False)
+class AchievementEventOutboxTests(TestCase):
+    """Signals queue events that process_achievement_events drains in batches"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.friend = User.objects.create_user(username='friend', email='friend@example.com', password='secret')
+        self.tracker = Achievement.objects.create(
+            name='Tracker', description='Track two spendings', achievement_type='spending_tracked',
+            requirements={'spending_count': 2}
+        )
+
+    def _spend(self, user):
+        return Spending.objects.create(user=user, amount=Decimal('1.00'), description='Candy', date=timezone.now().date())
+
+    def _unlocked(self, user):
+        return list(UserAchievement.objects.filter(user=user).values_list('achievement__name', flat=True))
+
+    def test_events_are_deduplicated_per_user_and_type(self):
+        self._spend(self.user)
+        self._spend(self.user)
+        self._spend(self.friend)
+        Wallet.objects.create(user=self.user, coin_name='Star Coin')
+
+        events = AchievementEvent.objects.values_list('user__username', 'event_type')
+        self.assertEqual(sorted(events), [
+            ('friend', 'spending_tracked'), ('kid', 'spending_tracked'), ('kid', 'wallet_created'),
+        ])
+        self.assertEqual(self._unlocked(self.user), [])
+
+    def test_batches_drain_the_outbox_and_unlock(self):
+        for user in (self.user, self.friend):
+            self._spend(user)
+            self._spend(user)
+        Wallet.objects.create(user=self.user, coin_name='Star Coin')
+
+        self.assertEqual(process_achievement_events(batch_size=2), (2, 0))
+        self.assertEqual(process_achievement_events(batch_size=2), (1, 0))
+        self.assertEqual(process_achievement_events(batch_size=2), (0, 0))
+
+        self.assertFalse(AchievementEvent.objects.exists())
+        self.assertEqual(self._unlocked(self.user), ['Tracker'])
+        self.assertEqual(self._unlocked(self.friend), ['Tracker'])
+
+    def test_failed_events_are_retried_until_max_attempts(self):
+        self._spend(self.user)
+
+        with mock.patch('achievements.events.evaluate_achievement_events', side_effect=RuntimeError('boom')):
+            for attempt in range(1, MAX_ATTEMPTS + 1):
+                with self.assertLogs('achievements.events', 'ERROR'):
+                    self.assertEqual(process_achievement_events(), (0, 1))
+                self.assertEqual(AchievementEvent.objects.get().attempts, attempt)
+            # Exhausted events stay in the outbox for inspection
+            self.assertEqual(process_achievement_events(), (0, 0))
+
+        self.assertEqual(AchievementEvent.objects.get().attempts, MAX_ATTEMPTS)
+
+    def test_new_event_revives_an_exhausted_one(self):
+        self._spend(self.user)
+        with mock.patch('achievements.events.evaluate_achievement_events', side_effect=RuntimeError('boom')):
+            for attempt in range(MAX_ATTEMPTS):
+                with self.assertLogs('achievements.events', 'ERROR'):
+                    process_achievement_events()
+        self.assertEqual(process_achievement_events(), (0, 0))
+
+        self._spend(self.user)
+
+        self.assertEqual(AchievementEvent.objects.get().attempts, 0)
+        self.assertEqual(process_achievement_events(), (1, 0))
+        self.assertFalse(AchievementEvent.objects.exists())
+        self.assertEqual(self._unlocked(self.user), ['Tracker'])
+
+    def test_evaluate_unlocks_count_thresholds_and_reached_goals(self):
+        saver = Achievement.objects.create(
+            name='Saver', description='Reach a goal', achievement_type='saving_goal_reached'
+        )
+        goal = SavingGoal.objects.create(user=self.friend, goal_name='Bike', target_amount=Decimal('5.00'))
+        Saving.objects.create(user=self.friend, saving_goal=goal, amount=Decimal('5.00'), description='Jar', date=timezone.now().date())
+        self._spend(self.user)
+        self._spend(self.user)
+        self._spend(self.friend)
+
+        unlocked = evaluate_achievement_events('spending_tracked', [self.user.pk, self.friend.pk])
+        self.assertEqual([(item.user_id, item.achievement_id) for item in unlocked], [(self.user.pk, self.tracker.pk)])
+
+        unlocked = evaluate_achievement_events('saving_goal_reached', [self.user.pk, self.friend.pk])
+        self.assertEqual([(item.user_id, item.achievement_id) for item in unlocked], [(self.friend.pk, saver.pk)])
+
+        # Already unlocked achievements are not unlocked again
+        self.assertEqual(evaluate_achievement_events('spending_tracked', [self.user.pk]), [])
+
+
+@override_settings(ACHIEVEMENT_EVENTS_EAGER=True)
+class EagerAchievementEventTests(TestCase):
+    """Eager evaluation runs after commit and sees the sender's full write"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.saver = Achievement.objects.create(
+            name='Saver', description='Reach a goal', achievement_type='saving_goal_reached'
+        )
+
+    def test_saving_that_reaches_a_goal_unlocks_it(self):
+        goal = SavingGoal.objects.create(user=self.user, goal_name='Bike', target_amount=Decimal('5.00'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Saving.objects.create(user=self.user, saving_goal=goal, amount=Decimal('5.00'), description='Jar', date=timezone.now().date())
+            self.assertFalse(UserAchievement.objects.exists())
+
+        goal.refresh_from_db()
+        self.assertIsNotNone(goal.completed_at)
+        self.assertEqual(list(UserAchievement.objects.values_list('user', 'achievement')), [(self.user.pk, self.saver.pk)])
+        self.assertFalse(AchievementEvent.objects.exists())
+
+
+@skipUnlessDBFeature('has_select_for_update_skip_locked')
+@override_settings(ACHIEVEMENT_EVENTS_EAGER=False)
+class AchievementEventLockingTests(TransactionTestCase):
+    """Workers skip events another worker has claimed"""
+
+    def test_locked_events_are_skipped(self):
+        user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        friend = User.objects.create_user(username='friend', email='friend@example.com', password='secret')
+        claimed = AchievementEvent.objects.create(user=user, event_type='spending_tracked')
+        AchievementEvent.objects.create(user=friend, event_type='spending_tracked')
+        locked, release = threading.Event(), threading.Event()
+
+        def other_worker():
+            try:
+                with transaction.atomic():
+                    AchievementEvent.objects.select_for_update().get(pk=claimed.pk)
+                    locked.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=other_worker)
+        thread.start()
+        try:
+            self.assertTrue(locked.wait(10))
+            self.assertEqual(process_achievement_events(), (1, 0))
+        finally:
+            release.set()
+            thread.join()
+
+        self.assertEqual(list(AchievementEvent.objects.values_list('pk', flat=True)), [claimed.pk])
@@ -10,5 +10,7 @@ urlpatterns = [
     path('<int:pk>/', views.achievement_detail_view, name='achievement_detail'),
     path('api/unnotified/', views.get_unnotified_achievements_view, name='get_unnotified_achievements'),
     path('api/<int:pk>/mark-notified/', views.mark_achievement_notified_view, name='mark_achievement_notified'),
+    path('api/mark-notified/', views.mark_achievements_notified_view, name='mark_achievements_notified'),
+    path('api/stream/', views.achievement_stream_view, name='achievement_stream'),
 ]
 
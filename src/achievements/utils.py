@@ -2,6 +2,9 @@
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from .models import Achievement, UserAchievement
+from .engine import unlock_matching_achievements
+from .notifications import bump_notification_version
+from .cache import get_active_achievements, get_unlocked_achievement_ids
 from decimal import Decimal
 
 User = get_user_model()
@@ -48,6 +51,7 @@ def unlock_achievement(user, achievement, notify=True):
         if notify:
             user_achievement.is_notified = False
             user_achievement.save()
+            bump_notification_version(user.pk)
     
     return user_achievement
 
@@ -59,72 +63,11 @@ def check_and_unlock_achievements(user, achievement_type, **kwargs):
         user: User object
         achievement_type: Achievement type
         **kwargs: Additional condition parameters
-    """
-    # Get all active achievements of this type
-    achievements = Achievement.objects.filter(
-        achievement_type=achievement_type,
-        is_active=True
-    )
-    
-    unlocked_achievements = []
-    
-    for achievement in achievements:
-        # Check if already unlocked
-        if UserAchievement.objects.filter(user=user, achievement=achievement).exists():
-            continue
-        
-        # Check conditions based on achievement type
-        if _check_achievement_requirements(user, achievement, achievement_type, **kwargs):
-            user_achievement = unlock_achievement(user, achievement)
-            unlocked_achievements.append(user_achievement)
     
-    return unlocked_achievements
-
-
-def _check_achievement_requirements(user, achievement, achievement_type, **kwargs):
-    """Check if achievement meets unlock conditions (internal function)
-    
-    Args:
-        user: User object
-        achievement: Achievement object
-        achievement_type: Achievement type
-        **kwargs: Condition parameters
+    Returns:
+        list: Newly unlocked UserAchievement objects
     """
-    requirements = achievement.requirements or {}
-    
-    if achievement_type == 'lesson_complete':
-        # Check completed lesson count
-        required_count = requirements.get('lesson_count', 1)
-        completed_count = kwargs.get('completed_count', 0)
-        return completed_count >= required_count
-    
-    elif achievement_type == 'saving_goal_reached':
-        # Check if saving goal reached
-        # If goal_id not specified in requirements, any goal completion works
-        goal_id = kwargs.get('goal_id')
-        target_id = requirements.get('goal_id')
-        # If no specific goal specified, any goal completion can unlock
-        if target_id is None:
-            return True
-        return goal_id == target_id
-    
-    elif achievement_type == 'spending_tracked':
-        # Check tracked spending count
-        required_count = requirements.get('spending_count', 1)
-        tracked_count = kwargs.get('tracked_count', 0)
-        return tracked_count >= required_count
-    
-    elif achievement_type == 'wallet_created':
-        # Check created wallet count
-        required_count = requirements.get('wallet_count', 1)
-        wallet_count = kwargs.get('wallet_count', 0)
-        return wallet_count >= required_count
-    
-    elif achievement_type == 'milestone':
-        # Generic milestone type, can define various conditions via requirements
-        return True  # Temporarily always return True, can implement specific logic based on requirements later
-    
-    return False
+    return unlock_matching_achievements(user, achievement_type, **kwargs)
 
 
 def get_user_achievements(user):
@@ -138,10 +81,8 @@ def get_user_achievements(user):
             'unlocked_count': int,  # Unlocked count
         }
     """
-    all_achievements = Achievement.objects.filter(is_active=True).order_by('order', 'created_at')
-    unlocked_achievement_ids = UserAchievement.objects.filter(
-        user=user
-    ).values_list('achievement_id', flat=True)
+    all_achievements = get_active_achievements()
+    unlocked_achievement_ids = get_unlocked_achievement_ids(user)
     
     unlocked = []
     locked = []
@@ -155,7 +96,6 @@ def get_user_achievements(user):
     return {
         'unlocked': unlocked,
         'locked': locked,
-        'total': all_achievements.count(),
+        'total': len(all_achievements),
         'unlocked_count': len(unlocked),
     }
-
@@ -1,11 +1,33 @@
+import asyncio
+import json
+import time
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 
 from .models import Achievement, UserAchievement
 from .utils import get_user_achievements
+from .notifications import serialize_user_achievement, aget_notification_version
+
+# Notification stream timing (seconds)
+STREAM_POLL_INTERVAL = 2        # How often the cache version is checked
+STREAM_DB_FALLBACK_INTERVAL = 30  # Query anyway, for caches not shared between processes
+STREAM_HEARTBEAT_INTERVAL = 15  # Keep proxies from closing idle connections
+STREAM_TIMEOUT = 300            # Close the stream; EventSource reconnects on its own
+STREAM_RETRY_MS = 5000
+
+# Cache backends read without a database query; with any other backend the
+# stream skips the version check and only queries every STREAM_DB_FALLBACK_INTERVAL
+VERSION_POLL_CACHE_BACKENDS = {
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+}
 
 
 @login_required
@@ -93,18 +115,10 @@ def get_unnotified_achievements_view(request):
         is_notified=False
     ).select_related('achievement').order_by('-unlocked_at')[:5]
     
-    achievements_data = []
-    for user_achievement in unnotified_achievements:
-        achievements_data.append({
-            'id': user_achievement.id,
-            'achievement_id': user_achievement.achievement.id,
-            'name': user_achievement.achievement.name,
-            'description': user_achievement.achievement.description,
-            'icon': user_achievement.achievement.icon,
-            'color': user_achievement.achievement.color,
-            'coin_reward': float(user_achievement.achievement.coin_reward),
-            'unlocked_at': user_achievement.unlocked_at.isoformat(),
-        })
+    achievements_data = [
+        serialize_user_achievement(user_achievement)
+        for user_achievement in unnotified_achievements
+    ]
     
     return JsonResponse({
         'success': True,
@@ -128,3 +142,75 @@ def mark_achievement_notified_view(request, pk):
     except UserAchievement.DoesNotExist:
         return JsonResponse({'success': False, 'message': 'Achievement not found'}, status=404)
 
+
+@login_required
+@require_http_methods(["POST"])
+def mark_achievements_notified_view(request):
+    """Mark several achievements as notified (API endpoint)
+    
+    Expects a JSON body: {"ids": [1, 2, 3]}
+    """
+    try:
+        ids = [int(pk) for pk in json.loads(request.body or '{}').get('ids', [])]
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({'success': False, 'message': 'Invalid achievement ids'}, status=400)
+    
+    updated = UserAchievement.objects.filter(
+        user=request.user,
+        pk__in=ids,
+        is_notified=False
+    ).update(is_notified=True)
+    return JsonResponse({'success': True, 'updated': updated})
+
+
+async def _achievement_event_stream(user_id):
+    """Yield server-sent events for the user's unnotified achievements"""
+    poll_versions = settings.CACHES['default']['BACKEND'] in VERSION_POLL_CACHE_BACKENDS
+    poll_interval = STREAM_POLL_INTERVAL if poll_versions else STREAM_DB_FALLBACK_INTERVAL
+    sent_ids = set()
+    last_version = None
+    first_check = True
+    last_query = last_write = time.monotonic()
+    deadline = last_query + STREAM_TIMEOUT
+    
+    yield f'retry: {STREAM_RETRY_MS}\n\n'
+    while time.monotonic() < deadline:
+        now = time.monotonic()
+        version = await aget_notification_version(user_id) if poll_versions else None
+        if first_check or version != last_version or now - last_query >= STREAM_DB_FALLBACK_INTERVAL:
+            first_check = False
+            last_version = version
+            last_query = now
+            unnotified_achievements = UserAchievement.objects.filter(
+                user_id=user_id,
+                is_notified=False
+            ).exclude(pk__in=sent_ids).select_related('achievement').order_by('unlocked_at')[:20]
+            async for user_achievement in unnotified_achievements:
+                sent_ids.add(user_achievement.pk)
+                data = json.dumps(serialize_user_achievement(user_achievement))
+                yield f'id: {user_achievement.pk}\nevent: achievement\ndata: {data}\n\n'
+                last_write = now
+        
+        if now - last_write >= STREAM_HEARTBEAT_INTERVAL:
+            yield ': heartbeat\n\n'
+            last_write = now
+        await asyncio.sleep(poll_interval)
+
+
+@login_required
+@require_http_methods(["GET"])
+async def achievement_stream_view(request):
+    """Stream newly unlocked achievements as server-sent events
+    
+    Meant to be served through mysite.asgi, where a waiting stream holds no
+    worker thread. Between unlocks the stream only reads a cache key, or with
+    a database cache backend, queries at the slow fallback interval.
+    """
+    user = await request.auser()
+    response = StreamingHttpResponse(
+        _achievement_event_stream(user.pk),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
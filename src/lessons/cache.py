@@ -0,0 +1,37 @@
+"""Lesson navigation menu cache
+
+The menu is cached under a shared version (mysite.cache_versions) that is
+bumped once a Lesson save or delete commits. Every process then builds the
+new menu, and old entries simply expire.
+"""
+from django.core.cache import cache
+
+from mysite.cache_versions import bump_version, get_version
+from .models import Lesson
+
+MENU_VERSION_KEY = 'lessons:menu:version'
+MENU_KEY = 'lessons:menu:v{version}'
+MENU_TIMEOUT = 60 * 60 * 24
+
+
+def get_lesson_menu():
+    """Get published lessons for the navigation menu (cached)
+    
+    Returns:
+        list: Dictionaries with lesson_number, title, slug and icon
+    """
+    key = MENU_KEY.format(version=get_version(MENU_VERSION_KEY))
+    menu = cache.get(key)
+    if menu is None:
+        menu = list(
+            Lesson.objects.filter(status='published')
+            .order_by('lesson_number')
+            .values('lesson_number', 'title', 'slug', 'icon')
+        )
+        cache.set(key, menu, MENU_TIMEOUT)
+    return menu
+
+
+def invalidate_lesson_menu():
+    """Drop the cached navigation menu"""
+    bump_version(MENU_VERSION_KEY)
@@ -0,0 +1,127 @@
+"""Remix Icon lookup for lesson icons
+
+Icon names are mapped from Bootstrap-style names to Remix Icon classes. The
+table is frozen at import time and lookups are memoized, so rendering an icon
+is a dictionary hit. Lesson, LessonSection and LessonTip also store the
+computed class in icon_class when saved.
+"""
+from functools import lru_cache
+from types import MappingProxyType
+
+# Map Bootstrap icon names to Remix icon names (using correct Remix Icon names)
+ICON_MAPPING = MappingProxyType({
+    # Main lesson icons
+    'piggy-bank': 'ri-piggy-bank-line',
+    'briefcase': 'ri-briefcase-line',
+    'safe-fill': 'ri-safe-line',
+    'target': 'ri-target-line',
+    'graph-up': 'ri-line-chart-line',
+    'heart-fill': 'ri-heart-line',
+    'cart': 'ri-shopping-cart-line',
+    'bank': 'ri-bank-line',
+    'trending-up': 'ri-stock-line',
+    'credit-card-2-front': 'ri-bank-card-line',
+    
+    # Section icons
+    'rocket-takeoff': 'ri-rocket-line',
+    'lightbulb': 'ri-lightbulb-line',
+    'journal-plus': 'ri-book-open-line',
+    'star-fill': 'ri-star-line',
+    'briefcase-fill': 'ri-briefcase-line',
+    'bullseye': 'ri-focus-line',
+    'clipboard-check': 'ri-clipboard-check-line',
+    'chat-dots': 'ri-chat-3-line',
+    'safe2': 'ri-safe-line',
+    'palette': 'ri-palette-line',
+    'house': 'ri-home-line',
+    'controller': 'ri-gamepad-line',
+    'lightbulb-fill': 'ri-lightbulb-flash-line',
+    'shuffle': 'ri-shuffle-line',
+    'question-circle': 'ri-question-line',
+    'pie-chart': 'ri-pie-chart-line',
+    'cash-coin': 'ri-coin-line',
+    'bucket': 'ri-archive-line',
+    'journal-text': 'ri-file-text-line',
+    'chat-quote': 'ri-chat-quote-line',
+    'heart': 'ri-heart-line',
+    'gift': 'ri-gift-line',
+    'search': 'ri-search-line',
+    'cup-straw': 'ri-cup-line',
+    'scale': 'ri-scales-line',
+    'seedling': 'ri-plant-line',
+    'exclamation-triangle': 'ri-error-warning-line',
+    'clock': 'ri-time-line',
+    'tv': 'ri-tv-line',
+    'question-circle-fill': 'ri-question-answer-line',
+    '1-circle': 'ri-number-1',
+    'cash-stack': 'ri-money-dollar-circle-line',
+    'building': 'ri-building-line',
+    'credit-card': 'ri-bank-card-line',
+    'calculator': 'ri-calculator-line',
+    'graph-up-arrow': 'ri-bar-chart-line',
+    'egg': 'ri-egg-line',
+    'bookshelf': 'ri-book-line',
+    'mask': 'ri-emotion-line',
+    'check-circle': 'ri-checkbox-circle-line',
+    'shield-check': 'ri-shield-check-line',
+    'currency-dollar': 'ri-money-dollar-box-line',
+    'eye': 'ri-eye-line',
+    'flag': 'ri-flag-line',
+    'pencil': 'ri-pencil-line',
+    'trophy': 'ri-trophy-line',
+    'clock-history': 'ri-history-line',
+})
+
+
+@lru_cache(maxsize=1024)
+def get_icon_class(icon_name):
+    """Get the Remix Icon class for an icon name
+    
+    Returns:
+        str: Remix class, or '' for empty icons and raw HTML (returned as is when rendered)
+    """
+    if not icon_name:
+        return ''
+    # If it's already an emoji or HTML, it is rendered as is (for backward compatibility)
+    if icon_name.startswith('<') or len(icon_name) > 30:
+        return ''
+    
+    if icon_name in ICON_MAPPING:
+        return ICON_MAPPING[icon_name]
+    
+    # Try to auto-convert format
+    # Remove common suffixes
+    clean_name = icon_name.replace('-fill', '').replace('-2-front', '').replace('-front', '')
+    # Convert to Remix format (ri-{name}-line)
+    return f'ri-{clean_name}-line'
+
+
+def icon_html(icon_name, icon_class):
+    """Build icon markup from an icon name and its Remix class"""
+    if not icon_class:
+        return icon_name or ''
+    # Note: Cover icons will be set to white in CSS via .lesson-default-cover-icon class
+    # Use default color here, let CSS control the cover icon color
+    return f'<i class="{icon_class} lesson-icon"></i>'
+
+
+@lru_cache(maxsize=1024)
+def render_icon_html(icon_name):
+    """Render Remix Icon markup for an icon name (memoized)"""
+    return icon_html(icon_name, get_icon_class(icon_name))
+
+
+class IconClassMixin:
+    """Store the Remix class for the model's icon in icon_class on save"""
+    
+    def save(self, *args, **kwargs):
+        self.icon_class = get_icon_class(self.icon)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'icon' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'icon_class'}
+        super().save(*args, **kwargs)
+    
+    @property
+    def icon_html(self):
+        """Icon markup built from the stored icon class"""
+        return icon_html(self.icon, self.icon_class)
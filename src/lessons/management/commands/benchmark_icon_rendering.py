@@ -0,0 +1,72 @@
+"""
+Management command: Measure icon rendering cost for a lesson page
+Usage: python manage.py benchmark_icon_rendering [--lesson 1] [--iterations 1000]
+"""
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from lessons.icons import ICON_MAPPING, get_icon_class, render_icon_html
+from lessons.models import Lesson
+from lessons.templatetags.lessons_tags import render_icon
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the render_icon filter over the icons used on one lesson page'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lesson',
+            type=int,
+            help='Lesson number to take icons from (default: first published lesson)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=1000,
+            help='Number of simulated page renders (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(options['iterations'], 1)
+        lessons = Lesson.objects.filter(status='published').order_by('lesson_number')
+        if options['lesson'] is not None:
+            lessons = lessons.filter(lesson_number=options['lesson'])
+        lesson = lessons.prefetch_related('sections', 'tips').first()
+        
+        if lesson:
+            # Detail page: cover + title icons, sections, tips, plus the nav menu
+            page_objects = [lesson, lesson] + list(lesson.sections.all()) + list(lesson.tips.all())
+            page_objects += list(Lesson.objects.filter(status='published'))
+            self.stdout.write(f'Lesson {lesson.lesson_number}: {len(page_objects)} icons per page')
+        else:
+            page_objects = []
+            self.stdout.write(f'No published lessons, using the {len(ICON_MAPPING)} mapped icon names')
+        icon_names = [obj.icon for obj in page_objects] or list(ICON_MAPPING)
+        
+        def render_cold():
+            render_icon_html.cache_clear()
+            get_icon_class.cache_clear()
+            for icon_name in icon_names:
+                render_icon(icon_name)
+        
+        def render_warm():
+            for icon_name in icon_names:
+                render_icon(icon_name)
+        
+        def render_stored():
+            for obj in page_objects:
+                obj.icon_html
+        
+        results = [
+            ('render_icon, cold memo', render_cold),
+            ('render_icon, warm memo', render_warm),
+        ]
+        if page_objects:
+            results.append(('stored icon_class', render_stored))
+        
+        for label, func in results:
+            seconds = timeit.timeit(func, number=iterations)
+            self.stdout.write(f'  {label:<24} {seconds / iterations * 1e6:8.2f} µs/page')
+        
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Ran {iterations} page renders per variant'))
@@ -0,0 +1,30 @@
+"""
+Management command: Re-render stored HTML for lesson sections
+Usage: python manage.py render_lesson_content [--lesson 3]
+"""
+from django.core.management.base import BaseCommand
+
+from lessons.models import LessonSection
+from lessons.utils import render_lesson_sections
+
+
+class Command(BaseCommand):
+    help = 'Re-render LessonSection.content_html from markdown content'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lesson',
+            type=int,
+            help='Only re-render sections of this lesson number',
+        )
+
+    def handle(self, *args, **options):
+        sections = LessonSection.objects.only('id', 'lesson_id', 'content').order_by('pk')
+        if options['lesson'] is not None:
+            sections = sections.filter(lesson__lesson_number=options['lesson'])
+        
+        rendered_count = render_lesson_sections(sections.iterator(chunk_size=200))
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Rendered {rendered_count} lesson sections'
+        ))
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-18 13:20
+
+from django.db import migrations, models
+from markdown import markdown
+
+
+def render_section_content(apps, schema_editor):
+    """Render stored HTML for existing sections"""
+    LessonSection = apps.get_model('lessons', 'LessonSection')
+    sections = list(LessonSection.objects.only('id', 'content'))
+    for section in sections:
+        section.content_html = markdown(section.content)
+    LessonSection.objects.bulk_update(sections, ['content_html'], batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lessons', '0004_lesson_coin_reward'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lessonsection',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Content (rendered HTML)'),
+        ),
+        migrations.RunPython(render_section_content, migrations.RunPython.noop),
+    ]
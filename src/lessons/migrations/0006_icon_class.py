@@ -0,0 +1,113 @@
+# Generated by Django 6.0 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+# Frozen copy of lessons.icons as of this migration, so later edits to the
+# live icon table do not change what it writes
+ICON_MAPPING = {
+    # Main lesson icons
+    'piggy-bank': 'ri-piggy-bank-line',
+    'briefcase': 'ri-briefcase-line',
+    'safe-fill': 'ri-safe-line',
+    'target': 'ri-target-line',
+    'graph-up': 'ri-line-chart-line',
+    'heart-fill': 'ri-heart-line',
+    'cart': 'ri-shopping-cart-line',
+    'bank': 'ri-bank-line',
+    'trending-up': 'ri-stock-line',
+    'credit-card-2-front': 'ri-bank-card-line',
+    
+    # Section icons
+    'rocket-takeoff': 'ri-rocket-line',
+    'lightbulb': 'ri-lightbulb-line',
+    'journal-plus': 'ri-book-open-line',
+    'star-fill': 'ri-star-line',
+    'briefcase-fill': 'ri-briefcase-line',
+    'bullseye': 'ri-focus-line',
+    'clipboard-check': 'ri-clipboard-check-line',
+    'chat-dots': 'ri-chat-3-line',
+    'safe2': 'ri-safe-line',
+    'palette': 'ri-palette-line',
+    'house': 'ri-home-line',
+    'controller': 'ri-gamepad-line',
+    'lightbulb-fill': 'ri-lightbulb-flash-line',
+    'shuffle': 'ri-shuffle-line',
+    'question-circle': 'ri-question-line',
+    'pie-chart': 'ri-pie-chart-line',
+    'cash-coin': 'ri-coin-line',
+    'bucket': 'ri-archive-line',
+    'journal-text': 'ri-file-text-line',
+    'chat-quote': 'ri-chat-quote-line',
+    'heart': 'ri-heart-line',
+    'gift': 'ri-gift-line',
+    'search': 'ri-search-line',
+    'cup-straw': 'ri-cup-line',
+    'scale': 'ri-scales-line',
+    'seedling': 'ri-plant-line',
+    'exclamation-triangle': 'ri-error-warning-line',
+    'clock': 'ri-time-line',
+    'tv': 'ri-tv-line',
+    'question-circle-fill': 'ri-question-answer-line',
+    '1-circle': 'ri-number-1',
+    'cash-stack': 'ri-money-dollar-circle-line',
+    'building': 'ri-building-line',
+    'credit-card': 'ri-bank-card-line',
+    'calculator': 'ri-calculator-line',
+    'graph-up-arrow': 'ri-bar-chart-line',
+    'egg': 'ri-egg-line',
+    'bookshelf': 'ri-book-line',
+    'mask': 'ri-emotion-line',
+    'check-circle': 'ri-checkbox-circle-line',
+    'shield-check': 'ri-shield-check-line',
+    'currency-dollar': 'ri-money-dollar-box-line',
+    'eye': 'ri-eye-line',
+    'flag': 'ri-flag-line',
+    'pencil': 'ri-pencil-line',
+    'trophy': 'ri-trophy-line',
+    'clock-history': 'ri-history-line',
+}
+
+
+def get_icon_class(icon_name):
+    if not icon_name or icon_name.startswith('<') or len(icon_name) > 30:
+        return ''
+    if icon_name in ICON_MAPPING:
+        return ICON_MAPPING[icon_name]
+    clean_name = icon_name.replace('-fill', '').replace('-2-front', '').replace('-front', '')
+    return f'ri-{clean_name}-line'
+
+
+def fill_icon_classes(apps, schema_editor):
+    """Store Remix icon classes for existing lessons, sections and tips"""
+    for model_name in ('Lesson', 'LessonSection', 'LessonTip'):
+        model = apps.get_model('lessons', model_name)
+        objects = list(model.objects.only('id', 'icon'))
+        for obj in objects:
+            obj.icon_class = get_icon_class(obj.icon)
+        model.objects.bulk_update(objects, ['icon_class'], batch_size=200)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lessons', '0005_lessonsection_content_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='icon_class',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='Icon Class (Remix)'),
+        ),
+        migrations.AddField(
+            model_name='lessonsection',
+            name='icon_class',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='Icon Class (Remix)'),
+        ),
+        migrations.AddField(
+            model_name='lessontip',
+            name='icon_class',
+            field=models.CharField(blank=True, editable=False, max_length=100, verbose_name='Icon Class (Remix)'),
+        ),
+        migrations.RunPython(fill_icon_classes, migrations.RunPython.noop),
+    ]
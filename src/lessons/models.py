@@ -1,11 +1,14 @@
+from markdown import markdown
 from django.db import models
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 
+from .icons import IconClassMixin
+
 User = get_user_model()
 
 
-class Lesson(models.Model):
+class Lesson(IconClassMixin, models.Model):
     """Lesson model"""
     LESSON_STATUS = [
         ('draft', 'Draft'),
@@ -20,6 +23,7 @@ class Lesson(models.Model):
     # Cover image
     cover_image = models.ImageField(upload_to='lessons/covers/', blank=True, null=True, verbose_name='Cover Image')
     icon = models.CharField(max_length=50, default='💰', verbose_name='Icon (emoji)')
+    icon_class = models.CharField(max_length=100, blank=True, editable=False, verbose_name='Icon Class (Remix)')
     
     # Lesson info
     lesson_number = models.IntegerField(unique=True, verbose_name='Lesson Number')
@@ -46,7 +50,7 @@ class Lesson(models.Model):
         return reverse('lessons:lesson_detail', kwargs={'slug': self.slug})
 
 
-class LessonSection(models.Model):
+class LessonSection(IconClassMixin, models.Model):
     """Lesson section/chapter model"""
     SECTION_TYPES = [
         ('intro', 'Introduction'),
@@ -61,8 +65,10 @@ class LessonSection(models.Model):
     title = models.CharField(max_length=200, verbose_name='Section Title')
     section_type = models.CharField(max_length=20, choices=SECTION_TYPES, default='content', verbose_name='Section Type')
     content = models.TextField(verbose_name='Content (Markdown supported)')
+    content_html = models.TextField(blank=True, editable=False, verbose_name='Content (rendered HTML)')
     image = models.ImageField(upload_to='lessons/sections/', blank=True, null=True, verbose_name='Image')
     icon = models.CharField(max_length=50, blank=True, verbose_name='Icon (emoji)')
+    icon_class = models.CharField(max_length=100, blank=True, editable=False, verbose_name='Icon Class (Remix)')
     
     # Ordering
     order = models.IntegerField(default=0, verbose_name='Order')
@@ -74,14 +80,23 @@ class LessonSection(models.Model):
     
     def __str__(self):
         return f"{self.lesson.title} - {self.title}"
+    
+    def save(self, *args, **kwargs):
+        """Render markdown content once here, so page views never run the markdown parser"""
+        self.content_html = markdown(self.content)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'content' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'content_html'}
+        super().save(*args, **kwargs)
 
 
-class LessonTip(models.Model):
+class LessonTip(IconClassMixin, models.Model):
     """Lesson tip/model hint model"""
     lesson = models.ForeignKey(Lesson, related_name='tips', on_delete=models.CASCADE, verbose_name='Lesson')
     title = models.CharField(max_length=200, verbose_name='Tip Title')
     content = models.TextField(verbose_name='Content')
     icon = models.CharField(max_length=50, default='💡', verbose_name='Icon (emoji)')
+    icon_class = models.CharField(max_length=100, blank=True, editable=False, verbose_name='Icon Class (Remix)')
     order = models.IntegerField(default=0, verbose_name='Order')
     
     class Meta:
@@ -122,6 +137,22 @@ class UserLessonProgress(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.lesson.title} - {self.get_status_display()}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so signal handlers can detect transitions without a query
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+    
+    @property
+    def loaded_status(self):
+        """Status as last loaded from or saved to the database (None for new records)"""
+        return getattr(self, '_loaded_status', None)
+    
     def mark_as_started(self):
         """Mark lesson as started"""
         if self.status == 'not_started':
@@ -131,14 +162,46 @@ class UserLessonProgress(models.Model):
             self.save()
     
     def mark_as_completed(self):
-        """Mark lesson as completed"""
-        if self.status != 'completed':
-            from django.utils import timezone
+        """Mark lesson as completed
+        
+        Uses a conditional UPDATE (WHERE status != 'completed'), so when the same
+        lesson is completed twice at once only one call wins and rewards the user.
+        
+        Returns:
+            bool: Whether this call completed the lesson
+        """
+        from django.utils import timezone
+        from django.db.models import Value
+        from django.db.models.functions import Coalesce
+        from .utils import handle_lesson_completion
+        
+        if self.pk is None:
+            if self.status == 'completed':
+                return False
+            now = timezone.now()
             self.status = 'completed'
-            if not self.started_at:
-                self.started_at = timezone.now()
-            self.completed_at = timezone.now()
+            self.started_at = self.started_at or now
+            self.completed_at = now
             self.save()
+            return True
+        
+        now = timezone.now()
+        updated = UserLessonProgress.objects.filter(pk=self.pk).exclude(status='completed').update(
+            status='completed',
+            started_at=Coalesce('started_at', Value(now)),
+            completed_at=now,
+            updated_at=now,
+        )
+        self.refresh_from_db(fields=['status', 'started_at', 'completed_at', 'updated_at'])
+        self._loaded_status = self.status
+        if not updated:
+            return False
+        
+        # update() sends no post_save, so tell receivers (e.g. the dashboard) here
+        from .signals import lesson_completed
+        lesson_completed.send(sender=UserLessonProgress, instance=self)
+        handle_lesson_completion(self)
+        return True
     
     def mark_as_in_progress(self):
         """Mark lesson as in progress (cancel completion status)"""
@@ -1,56 +1,43 @@
 """Lesson system signal handlers"""
-from django.db.models.signals import post_save, pre_save
-from django.dispatch import receiver
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from django.utils import timezone
 
-from .models import UserLessonProgress
-from .utils import reward_lesson_completion
-from achievements.utils import check_and_unlock_achievements
+from .models import Lesson, LessonSection, LessonTip, UserLessonProgress
+from .utils import handle_lesson_completion
+from .cache import invalidate_lesson_menu
 
-
-# For tracking previous status
-_previous_status = {}
-
-
-@receiver(pre_save, sender=UserLessonProgress)
-def save_previous_status(sender, instance, **kwargs):
-    """Save previous status"""
-    if instance.pk:
-        try:
-            previous = UserLessonProgress.objects.get(pk=instance.pk)
-            _previous_status[instance.pk] = previous.status
-        except UserLessonProgress.DoesNotExist:
-            _previous_status[instance.pk] = None
+# Sent with the UserLessonProgress instance when mark_as_completed() completes
+# a lesson with a queryset update (which sends no post_save)
+lesson_completed = Signal()
 
 
 @receiver(post_save, sender=UserLessonProgress)
-def handle_lesson_completion(sender, instance, **kwargs):
-    """When lesson progress is saved, check if completed and handle rewards"""
-    # Check if lesson was just marked as completed (previous status was not completed)
-    previous_status = _previous_status.get(instance.pk)
+def reward_lesson_completion_on_save(sender, instance, **kwargs):
+    """When lesson progress is saved as completed, handle rewards
     
+    The previous status comes from the instance itself (loaded_status), so no
+    extra query is needed. mark_as_completed() does not save() and calls
+    handle_lesson_completion itself.
+    """
     if (instance.status == 'completed' and 
         instance.completed_at and 
-        previous_status != 'completed'):
-        
-        # Reward virtual coins
-        reward_lesson_completion(instance.user, instance.lesson)
-        
-        # Check and unlock achievements
-        try:
-            completed_count = UserLessonProgress.objects.filter(
-                user=instance.user,
-                status='completed'
-            ).count()
-            
-            check_and_unlock_achievements(
-                user=instance.user,
-                achievement_type='lesson_complete',
-                completed_count=completed_count
-            )
-        except Exception:
-            pass  # If achievement system unavailable, fail silently
-        
-        # Clean up temporary status
-        if instance.pk in _previous_status:
-            del _previous_status[instance.pk]
+        instance.loaded_status != 'completed'):
+        handle_lesson_completion(instance)
+
+
+@receiver(post_save, sender=LessonSection)
+@receiver(post_delete, sender=LessonSection)
+@receiver(post_save, sender=LessonTip)
+@receiver(post_delete, sender=LessonTip)
+def touch_lesson_on_content_change(sender, instance, **kwargs):
+    """When a section or tip changes, bump its lesson's updated_at so cached lesson fragments are replaced"""
+    Lesson.objects.filter(pk=instance.lesson_id).update(updated_at=timezone.now())
+
 
+@receiver(post_save, sender=Lesson)
+@receiver(post_delete, sender=Lesson)
+def invalidate_menu_on_lesson_change(sender, instance, **kwargs):
+    """When a lesson is saved or deleted, drop the cached navigation menu once the change commits"""
+    transaction.on_commit(invalidate_lesson_menu)
@@ -1,3 +1,214 @@
-from django.test import TestCase
+import importlib
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from wallet.models import WalletTransaction
+from . import icons
+from .models import Lesson, LessonSection, LessonTip, UserLessonProgress
+from .utils import get_user_lesson_statistics, get_user_lessons_with_progress
+
+User = get_user_model()
+
+icon_class_migration = importlib.import_module('lessons.migrations.0006_icon_class')
+
+
+class LessonMenuCacheTests(TestCase):
+    """Navigation menu rendering from the lesson menu cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.lesson = Lesson.objects.create(
+            title='What Is Money?', slug='what-is-money', lesson_number=1, icon='piggy-bank', status='published'
+        )
+        Lesson.objects.create(title='Draft Lesson', slug='draft-lesson', lesson_number=2, status='draft')
+
+    def _render_nav(self):
+        request = RequestFactory().get('/')
+        request.user = self.user
+        return render_to_string('includes/nav_in.html', {'user': self.user}, request=request)
+
+    def test_nav_renders_without_queries_on_warm_cache(self):
+        self._render_nav()
+
+        with self.assertNumQueries(0):
+            html = self._render_nav()
+
+        self.assertIn('Lesson 1: What Is Money?', html)
+        self.assertNotIn('Draft Lesson', html)
+
+    def test_lesson_save_and_delete_refresh_menu(self):
+        self._render_nav()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lesson.title = 'Money Basics'
+            self.lesson.save()
+        self.assertIn('Lesson 1: Money Basics', self._render_nav())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lesson.delete()
+        self.assertNotIn('Money Basics', self._render_nav())
+
+
+class LessonCompletionTests(TestCase):
+    """Lesson completion rewards"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.lesson = Lesson.objects.create(
+            title='What Is Money?', slug='what-is-money', lesson_number=1, coin_reward=50, status='published'
+        )
+
+    def _reward_count(self):
+        return WalletTransaction.objects.filter(wallet__user=self.user, transaction_type='income').count()
+
+    def test_double_completion_rewards_once(self):
+        progress = UserLessonProgress.objects.create(user=self.user, lesson=self.lesson, status='in_progress')
+        # Two requests that loaded the same record before either completed it
+        first = UserLessonProgress.objects.get(pk=progress.pk)
+        second = UserLessonProgress.objects.get(pk=progress.pk)
+
+        self.assertTrue(first.mark_as_completed())
+        self.assertFalse(second.mark_as_completed())
+
+        self.assertEqual(second.status, 'completed')
+        self.assertEqual(self._reward_count(), 1)
+
+    def test_saving_completed_progress_rewards_once(self):
+        progress = UserLessonProgress.objects.create(user=self.user, lesson=self.lesson, status='in_progress')
+        progress.status = 'completed'
+        progress.completed_at = timezone.now()
+        progress.save()
+        progress.save()
+
+        self.assertEqual(self._reward_count(), 1)
+
+    def test_completion_can_be_reset_and_repeated(self):
+        progress = UserLessonProgress.objects.create(user=self.user, lesson=self.lesson, status='in_progress')
+        progress.mark_as_completed()
+        progress.mark_as_in_progress()
+
+        self.assertTrue(progress.mark_as_completed())
+        self.assertEqual(self._reward_count(), 2)
+
+
+class LessonSectionRenderingTests(TestCase):
+    """Section markdown is rendered to stored HTML on save and by render_lesson_content"""
+
+    def setUp(self):
+        self.lesson = Lesson.objects.create(title='What Is Money?', slug='what-is-money', lesson_number=1, status='published')
+
+    def test_content_html_is_rendered_on_save(self):
+        section = LessonSection.objects.create(lesson=self.lesson, title='Coins', content='Coins are **money**.')
+        self.assertEqual(LessonSection.objects.get(pk=section.pk).content_html, '<p>Coins are <strong>money</strong>.</p>')
+
+        section.content = '* Save\n* Spend'
+        section.save(update_fields=['content'])
+
+        self.assertEqual(
+            LessonSection.objects.get(pk=section.pk).content_html,
+            '<ul>\n<li>Save</li>\n<li>Spend</li>\n</ul>'
+        )
+
+    def test_render_command_replaces_cached_lesson_fragments(self):
+        section = LessonSection.objects.create(lesson=self.lesson, title='Coins', content='Coins are **money**.')
+        other = Lesson.objects.create(title='Saving', slug='saving', lesson_number=2, status='published')
+        stale = timezone.now() - timedelta(days=1)
+        Lesson.objects.update(updated_at=stale)
+        # Stored HTML from an older markdown renderer
+        LessonSection.objects.filter(pk=section.pk).update(content_html='<p>old</p>')
+
+        call_command('render_lesson_content', '--lesson', '1', stdout=StringIO())
+
+        self.assertEqual(LessonSection.objects.get(pk=section.pk).content_html, '<p>Coins are <strong>money</strong>.</p>')
+        # updated_at is part of the lesson fragment cache keys
+        self.assertGreater(Lesson.objects.get(pk=self.lesson.pk).updated_at, stale)
+        self.assertEqual(Lesson.objects.get(pk=other.pk).updated_at, stale)
+
+
+class LessonProgressListingTests(TestCase):
+    """Progress listing and statistics come from one filtered LEFT JOIN"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.friend = User.objects.create_user(username='friend', email='friend@example.com', password='secret')
+        self.lessons = [
+            Lesson.objects.create(title=f'Lesson {number}', slug=f'lesson-{number}', lesson_number=number, status='published')
+            for number in (1, 2, 3)
+        ]
+        Lesson.objects.create(title='Draft Lesson', slug='draft-lesson', lesson_number=4, status='draft')
+        self.completed = UserLessonProgress.objects.create(
+            user=self.user, lesson=self.lessons[0], status='completed', completed_at=timezone.now()
+        )
+        UserLessonProgress.objects.create(user=self.user, lesson=self.lessons[1], status='in_progress')
+        # Another learner's progress must not show up
+        UserLessonProgress.objects.create(user=self.friend, lesson=self.lessons[2], status='completed', completed_at=timezone.now())
+
+    def test_partial_progress_status_per_lesson(self):
+        with self.assertNumQueries(1):
+            items = get_user_lessons_with_progress(self.user)
+
+        self.assertEqual(
+            [(item['lesson'].lesson_number, item['status']) for item in items],
+            [(1, 'completed'), (2, 'in_progress'), (3, 'not_started')]
+        )
+        self.assertEqual(items[0]['progress']['id'], self.completed.pk)
+        self.assertEqual(items[0]['progress']['completed_at'], self.completed.completed_at)
+        self.assertIsNone(items[2]['progress'])
+
+    def test_statistics_count_only_the_users_progress(self):
+        with self.assertNumQueries(1):
+            stats = get_user_lesson_statistics(self.user)
+
+        self.assertEqual(stats, {
+            'total_lessons': 3,
+            'completed_count': 1,
+            'in_progress_count': 1,
+            'not_started_count': 1,
+            'completion_percentage': 1 / 3 * 100,
+        })
+
+
+class LessonIconClassTests(TestCase):
+    """Remix icon classes are stored on save and backfilled by migration 0006"""
+
+    def setUp(self):
+        self.lesson = Lesson.objects.create(
+            title='What Is Money?', slug='what-is-money', lesson_number=1, icon='piggy-bank', status='published'
+        )
+
+    def test_icon_class_is_stored_on_save(self):
+        self.assertEqual(Lesson.objects.get(pk=self.lesson.pk).icon_class, 'ri-piggy-bank-line')
+
+        self.lesson.icon = 'star-fill'
+        self.lesson.save(update_fields=['icon'])
+        section = LessonSection.objects.create(lesson=self.lesson, title='Coins', content='Coins', icon='wallet2-fill')
+        tip = LessonTip.objects.create(lesson=self.lesson, title='Tip', content='Save first', icon='<svg></svg>')
+
+        self.assertEqual(Lesson.objects.get(pk=self.lesson.pk).icon_class, 'ri-star-line')
+        # Unmapped names are converted, raw HTML is rendered as is
+        self.assertEqual(LessonSection.objects.get(pk=section.pk).icon_class, 'ri-wallet2-line')
+        self.assertEqual(LessonTip.objects.get(pk=tip.pk).icon_class, '')
+        self.assertEqual(self.lesson.icon_html, '<i class="ri-star-line lesson-icon"></i>')
+        self.assertEqual(tip.icon_html, '<svg></svg>')
+
+    def test_migration_fills_icon_classes_from_its_frozen_table(self):
+        LessonSection.objects.create(lesson=self.lesson, title='Coins', content='Coins', icon='cash-coin')
+        Lesson.objects.update(icon_class='')
+        LessonSection.objects.update(icon_class='')
+
+        icon_class_migration.fill_icon_classes(apps, None)
+
+        self.assertEqual(Lesson.objects.get().icon_class, 'ri-piggy-bank-line')
+        self.assertEqual(LessonSection.objects.get().icon_class, 'ri-coin-line')
+        # The migration keeps its own copy, so later icon table edits cannot change it
+        self.assertIsNot(icon_class_migration.ICON_MAPPING, icons.ICON_MAPPING)
+        self.assertEqual(icon_class_migration.get_icon_class('cash-stack'), 'ri-money-dollar-circle-line')
@@ -1,5 +1,7 @@
 from markdown import markdown
 from django.contrib.auth import get_user_model
+from django.db.models import Count, F, FilteredRelation, Q, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from .models import Lesson, LessonSection, LessonTip, UserLessonProgress
 
@@ -37,21 +39,32 @@ def get_next_lesson(current_lesson):
         return None
 
 
-def convert_sections_to_html(sections):
-    """Convert markdown content in sections to HTML"""
+def render_lesson_sections(sections):
+    """Re-render stored HTML for sections from their markdown content
+    
+    bulk_update() sends no signals, so the affected lessons' updated_at is
+    bumped here to replace their cached page fragments.
+    
+    Returns:
+        int: Number of sections rendered
+    """
+    rendered = []
     for section in sections:
         section.content_html = markdown(section.content)
-    return sections
+        rendered.append(section)
+    LessonSection.objects.bulk_update(rendered, ['content_html'], batch_size=200)
+    lesson_ids = {section.lesson_id for section in rendered}
+    if lesson_ids:
+        Lesson.objects.filter(pk__in=lesson_ids).update(updated_at=timezone.now())
+    return len(rendered)
 
 
 def prepare_lesson_detail_data(lesson):
     """Prepare lesson detail page data"""
+    # Section HTML is rendered when the section is saved (LessonSection.content_html)
     sections = lesson.sections.all()
     tips = lesson.tips.all()
     
-    # Convert Markdown content to HTML
-    sections = convert_sections_to_html(sections)
-    
     return {
         'lesson': lesson,
         'sections': sections,
@@ -93,31 +106,65 @@ def get_or_create_user_lesson_progress(user, lesson):
     return progress
 
 
+def get_published_lessons_with_progress(user):
+    """Get published lessons annotated with the user's progress (one LEFT JOIN)
+    
+    Annotations:
+        progress_id, progress_status ('not_started' if no record),
+        progress_started_at, progress_completed_at
+    """
+    return get_published_lessons().annotate(
+        user_progress=FilteredRelation('user_progresses', condition=Q(user_progresses__user=user)),
+    ).annotate(
+        progress_id=F('user_progress__id'),
+        progress_status=Coalesce(F('user_progress__status'), Value('not_started')),
+        progress_started_at=F('user_progress__started_at'),
+        progress_completed_at=F('user_progress__completed_at'),
+    )
+
+
 def get_user_lessons_with_progress(user):
-    """Get all published lessons with user's progress status
+    """Get all published lessons with user's progress status (single query)
     
     Args:
         user: User object
     
     Returns:
-        list: List of dictionaries containing lesson and progress information
+        list: List of dictionaries containing lesson and progress information.
+            progress holds the annotated values (id, status, started_at,
+            completed_at) as a plain dict, or None without a progress record;
+            load the UserLessonProgress itself to change progress.
     """
-    lessons = get_published_lessons()
     lessons_with_progress = []
     
-    for lesson in lessons:
-        progress = get_user_lesson_progress(user, lesson)
+    for lesson in get_published_lessons_with_progress(user):
+        progress = None
+        if lesson.progress_id is not None:
+            progress = {
+                'id': lesson.progress_id,
+                'status': lesson.progress_status,
+                'started_at': lesson.progress_started_at,
+                'completed_at': lesson.progress_completed_at,
+            }
         lessons_with_progress.append({
             'lesson': lesson,
             'progress': progress,
-            'status': progress.status if progress else 'not_started',
+            'status': lesson.progress_status,
         })
     
     return lessons_with_progress
 
 
+def summarize_lesson_progress(lessons_with_progress):
+    """Build lesson statistics from get_user_lessons_with_progress() output (no queries)"""
+    total_lessons = len(lessons_with_progress)
+    completed_count = sum(1 for item in lessons_with_progress if item['status'] == 'completed')
+    in_progress_count = sum(1 for item in lessons_with_progress if item['status'] == 'in_progress')
+    return _lesson_statistics(total_lessons, completed_count, in_progress_count)
+
+
 def get_user_lesson_statistics(user):
-    """Get user's lesson statistics
+    """Get user's lesson statistics (single query)
     
     Returns:
         dict: {
@@ -128,13 +175,16 @@ def get_user_lesson_statistics(user):
             'completion_percentage': float,  # Completion percentage
         }
     """
-    total_lessons = get_published_lessons().count()
-    user_progresses = UserLessonProgress.objects.filter(user=user)
-    
-    completed_count = user_progresses.filter(status='completed').count()
-    in_progress_count = user_progresses.filter(status='in_progress').count()
+    totals = get_published_lessons_with_progress(user).aggregate(
+        total_lessons=Count('id'),
+        completed_count=Count('id', filter=Q(user_progress__status='completed')),
+        in_progress_count=Count('id', filter=Q(user_progress__status='in_progress')),
+    )
+    return _lesson_statistics(totals['total_lessons'], totals['completed_count'], totals['in_progress_count'])
+
+
+def _lesson_statistics(total_lessons, completed_count, in_progress_count):
     not_started_count = total_lessons - completed_count - in_progress_count
-    
     completion_percentage = (completed_count / total_lessons * 100) if total_lessons > 0 else 0
     
     return {
@@ -146,6 +196,23 @@ def get_user_lesson_statistics(user):
     }
 
 
+def handle_lesson_completion(progress):
+    """Reward coins and queue achievement checks for a newly completed lesson
+    
+    Args:
+        progress: UserLessonProgress object that just became completed
+    """
+    # Reward virtual coins
+    reward_lesson_completion(progress.user, progress.lesson)
+    
+    # Queue achievement check (evaluated by process_achievement_events)
+    try:
+        from achievements.events import enqueue_achievement_event
+        enqueue_achievement_event(progress.user, 'lesson_complete')
+    except Exception:
+        pass  # If achievement system unavailable, fail silently
+
+
 def reward_lesson_completion(user, lesson):
     """Reward user for completing lesson (add virtual coins to wallet)
     
@@ -163,8 +163,10 @@ def lesson_complete_view(request, slug):
         messages.info(request, f'You have reset the progress for "{lesson.title}". You can complete it again!')
         return redirect('lessons:lesson_detail', slug=slug)
     else:
-        # If not completed, mark as completed (signal handler will automatically handle rewards and achievements)
-        progress.mark_as_completed()
+        # If not completed, mark as completed (rewards and achievements are handled once, by the call that completes it)
+        if not progress.mark_as_completed():
+            # Another request (e.g. a double click) completed it first
+            return redirect('lessons:lesson_detail', slug=slug)
         
         # Build success message
         message = f'Congratulations! You completed "{lesson.title}"!'
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class MyhomeConfig(AppConfig):
     name = 'myhome'
+    
+    def ready(self):
+        """When app is ready, import signal handlers"""
+        import myhome.signals
@@ -0,0 +1,242 @@
+"""Unified dashboard data
+
+Each block of the dashboard is built by one function from a few grouped
+aggregate queries, so the query count stays fixed no matter how many
+wallets, goals or transactions a user has.
+
+Blocks are cached per user and independently. myhome.signals drops a
+user's block when a model feeding it is saved or deleted; the timeout only
+bounds staleness from changes that are not per user (e.g. a new lesson).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DecimalField, F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+CHART_DAYS = 30
+
+
+def get_wallet_block(user, today=None):
+    """Wallet totals and this month's income/expense (2 queries)"""
+    from wallet.models import Wallet, WalletDailyRollup
+    
+    today = today or timezone.now().date()
+    totals = Wallet.objects.filter(user=user).balance_totals()
+    month = WalletDailyRollup.objects.filter(
+        wallet__user=user,
+        date__gte=today.replace(day=1)
+    ).aggregate(
+        income=Coalesce(Sum('income'), Value(Decimal('0.00')), output_field=DecimalField()),
+        expense=Coalesce(Sum('expense'), Value(Decimal('0.00')), output_field=DecimalField())
+    )
+    
+    return {
+        'wallet_total_balance': totals['total_balance'],
+        'wallet_total_count': totals['total_wallets'],
+        'wallet_month_income': month['income'],
+        'wallet_month_expense': month['expense'],
+        'practice_balance': totals['practice_balance'],
+        'real_balance': totals['real_balance'],
+        'practice_count': totals['practice_count'],
+        'real_count': totals['real_count'],
+    }
+
+
+def get_wallet_chart_block(user, today=None):
+    """Daily wallet income/expense for the last CHART_DAYS days (1 query)"""
+    from wallet.models import WalletDailyRollup
+    
+    today = today or timezone.now().date()
+    daily_rows = WalletDailyRollup.objects.filter(
+        wallet__user=user,
+        date__gte=today - timedelta(days=CHART_DAYS)
+    ).values('date').annotate(
+        income=Sum('income'),
+        expense=Sum('expense')
+    ).order_by('date')
+    
+    chart_data = {
+        'labels': [],
+        'income': [],
+        'expense': []
+    }
+    for row in daily_rows:
+        chart_data['labels'].append(row['date'].strftime('%m/%d'))
+        chart_data['income'].append(float(row['income'] or 0))
+        chart_data['expense'].append(float(row['expense'] or 0))
+    
+    return {'wallet_chart_data': chart_data}
+
+
+def get_spending_block(user, today=None):
+    """Spending totals and top categories from the daily rollups (2 queries)"""
+    from tracking.models import SpendingDailyRollup
+    
+    today = today or timezone.now().date()
+    rollups = SpendingDailyRollup.objects.filter(user=user)
+    totals = rollups.aggregate(
+        month_total=Sum('amount', filter=Q(date__gte=today.replace(day=1))),
+        recent_total=Sum('amount', filter=Q(date__gte=today - timedelta(days=7))),
+        total_count=Sum('spending_count'),
+    )
+    top_spending_categories = list(
+        rollups.values('category__name', 'category__icon', 'category__color').annotate(
+            total=Sum('amount'),
+            count=Sum('spending_count')
+        ).order_by('-total')[:5]
+    )
+    
+    return {
+        'spending_month_total': totals['month_total'] or 0,
+        'spending_recent_total': totals['recent_total'] or 0,
+        'spending_total_count': totals['total_count'] or 0,
+        'top_spending_categories': top_spending_categories,
+    }
+
+
+def get_saving_block(user, today=None):
+    """Saving totals and goal progress (3 queries)"""
+    from tracking.models import Saving, SavingGoal
+    
+    today = today or timezone.now().date()
+    totals = Saving.objects.filter(user=user).aggregate(
+        month_total=Sum('amount', filter=Q(date__gte=today.replace(day=1))),
+        total_amount=Sum('amount'),
+        total_count=Count('id'),
+    )
+    
+    # Goals store their saved amount, so progress properties need no extra queries
+    goals = SavingGoal.objects.filter(user=user)
+    goal_counts = goals.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(current_amount__gte=F('target_amount'))),
+    )
+    
+    return {
+        'saving_month_total': totals['month_total'] or 0,
+        'saving_total_amount': totals['total_amount'] or 0,
+        'saving_total_count': totals['total_count'],
+        'saving_goals': list(goals.order_by('-created_at')[:6]),
+        'saving_goals_total': goal_counts['total'],
+        'saving_goals_completed': goal_counts['completed'],
+        'saving_goals_active': goal_counts['total'] - goal_counts['completed'],
+    }
+
+
+def get_lesson_block(user):
+    """Lesson progress statistics and recent lessons (1 query)"""
+    from lessons.utils import get_user_lessons_with_progress, summarize_lesson_progress
+    
+    lessons_with_progress = get_user_lessons_with_progress(user)
+    lesson_stats = summarize_lesson_progress(lessons_with_progress)
+    
+    return {
+        'lessons_total': lesson_stats['total_lessons'],
+        'lessons_completed': lesson_stats['completed_count'],
+        'lessons_in_progress': lesson_stats['in_progress_count'],
+        'lessons_completion_percentage': lesson_stats['completion_percentage'],
+        'recent_lessons': [item['lesson'] for item in lessons_with_progress[:5]],
+    }
+
+
+def get_achievement_block(user):
+    """Achievement progress and recent unlocks (1 query, plus cache misses)"""
+    from achievements.utils import get_user_achievements
+    from achievements.models import UserAchievement
+    
+    achievements_data = get_user_achievements(user)
+    recent_achievements = list(
+        UserAchievement.objects.filter(user=user).select_related('achievement').order_by('-unlocked_at')[:5]
+    )
+    
+    return {
+        'achievements_unlocked_count': achievements_data['unlocked_count'],
+        'achievements_total': achievements_data['total'],
+        'achievements_progress': (achievements_data['unlocked_count'] / achievements_data['total'] * 100) if achievements_data['total'] > 0 else 0,
+        'recent_achievements': recent_achievements,
+    }
+
+
+# Dashboard block snapshots =====================================================
+
+DASHBOARD_BLOCK_KEY = 'dashboard:{user_id}:{block}'
+DASHBOARD_STATS_KEY = 'dashboard:{stat}:{block}'
+DASHBOARD_BLOCK_TIMEOUT = 60 * 5
+
+DASHBOARD_BLOCKS = {
+    'wallet': lambda user, today: get_wallet_block(user, today),
+    'chart': lambda user, today: get_wallet_chart_block(user, today),
+    'spending': lambda user, today: get_spending_block(user, today),
+    'saving': lambda user, today: get_saving_block(user, today),
+    'lessons': lambda user, today: get_lesson_block(user),
+    'achievements': lambda user, today: get_achievement_block(user),
+}
+
+
+def _count(stat, block):
+    if not settings.CACHE_STATS:
+        return
+    key = DASHBOARD_STATS_KEY.format(stat=stat, block=block)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_dashboard_block(user, block, today=None):
+    """Get one dashboard block from the user's snapshot, building it on a miss
+    
+    Returns:
+        tuple: (block data dict, datetime the block was built)
+    """
+    today = today or timezone.now().date()
+    key = DASHBOARD_BLOCK_KEY.format(user_id=user.pk, block=block)
+    snapshot = cache.get(key)
+    # Date-relative numbers (this month, last 7 days) expire with the day
+    if snapshot is not None and snapshot['date'] == today:
+        _count('hits', block)
+        return snapshot['data'], snapshot['built_at']
+    
+    _count('misses', block)
+    snapshot = {
+        'data': DASHBOARD_BLOCKS[block](user, today),
+        'built_at': timezone.now(),
+        'date': today,
+    }
+    cache.set(key, snapshot, DASHBOARD_BLOCK_TIMEOUT)
+    return snapshot['data'], snapshot['built_at']
+
+
+def invalidate_dashboard_blocks(user_id, *blocks):
+    """Drop cached dashboard blocks for a user (all blocks if none are given)"""
+    blocks = blocks or tuple(DASHBOARD_BLOCKS)
+    cache.delete_many([DASHBOARD_BLOCK_KEY.format(user_id=user_id, block=block) for block in blocks])
+
+
+def get_dashboard_cache_stats():
+    """Get hit/miss counters per dashboard block (only counted with CACHE_STATS enabled)
+    
+    Returns:
+        list: [{'block', 'hits', 'misses', 'hit_ratio'}, ...]
+    """
+    keys = [
+        DASHBOARD_STATS_KEY.format(stat=stat, block=block)
+        for block in DASHBOARD_BLOCKS
+        for stat in ('hits', 'misses')
+    ]
+    counters = cache.get_many(keys)
+    stats = []
+    for block in DASHBOARD_BLOCKS:
+        hits = counters.get(DASHBOARD_STATS_KEY.format(stat='hits', block=block), 0)
+        misses = counters.get(DASHBOARD_STATS_KEY.format(stat='misses', block=block), 0)
+        stats.append({
+            'block': block,
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': (hits / (hits + misses)) if hits + misses else 0,
+        })
+    return stats
@@ -0,0 +1,92 @@
+"""Dashboard snapshot invalidation
+
+Drops the affected block of a user's dashboard snapshot whenever a model
+feeding that block is saved or deleted. Blocks are dropped once the write
+commits; dropping them earlier would let a concurrent request rebuild and
+cache the pre-commit data.
+"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from wallet.models import Wallet, WalletTransaction
+from tracking.models import Spending, Saving, SavingGoal
+from tracking.utils import spending_rollups_rebuilt
+from lessons.models import UserLessonProgress
+from lessons.signals import lesson_completed
+from achievements.models import UserAchievement
+from achievements.notifications import achievements_unlocked
+from .dashboard import invalidate_dashboard_blocks
+
+
+def _invalidate_on_commit(user_id, *blocks):
+    """Drop a user's dashboard blocks after the current transaction commits"""
+    transaction.on_commit(lambda: invalidate_dashboard_blocks(user_id, *blocks), robust=True)
+
+
+@receiver(post_save, sender=Wallet)
+@receiver(post_delete, sender=Wallet)
+def invalidate_wallet_block(sender, instance, **kwargs):
+    """When a wallet changes, drop the wallet and chart blocks"""
+    _invalidate_on_commit(instance.user_id, 'wallet', 'chart')
+
+
+@receiver(post_save, sender=WalletTransaction)
+@receiver(post_delete, sender=WalletTransaction)
+def invalidate_wallet_block_on_transaction(sender, instance, **kwargs):
+    """When a wallet transaction changes, drop the wallet and chart blocks of the wallet's owner"""
+    if 'wallet' in instance._state.fields_cache:
+        user_id = instance.wallet.user_id
+    else:
+        user_id = Wallet.objects.filter(pk=instance.wallet_id).values_list('user_id', flat=True).first()
+    if user_id is not None:
+        _invalidate_on_commit(user_id, 'wallet', 'chart')
+
+
+@receiver(post_save, sender=Spending)
+@receiver(post_delete, sender=Spending)
+def invalidate_spending_block(sender, instance, **kwargs):
+    """When a spending record changes, drop the spending block"""
+    _invalidate_on_commit(instance.user_id, 'spending')
+
+
+@receiver(spending_rollups_rebuilt)
+def invalidate_spending_blocks_on_rebuild(sender, user_ids, **kwargs):
+    """Rollup rebuilds (e.g. after a category delete) send no post_save"""
+    for user_id in user_ids:
+        _invalidate_on_commit(user_id, 'spending')
+
+
+@receiver(post_save, sender=Saving)
+@receiver(post_delete, sender=Saving)
+@receiver(post_save, sender=SavingGoal)
+@receiver(post_delete, sender=SavingGoal)
+def invalidate_saving_block(sender, instance, **kwargs):
+    """When a saving record or goal changes, drop the saving block"""
+    _invalidate_on_commit(instance.user_id, 'saving')
+
+
+@receiver(post_save, sender=UserLessonProgress)
+@receiver(post_delete, sender=UserLessonProgress)
+def invalidate_lesson_block(sender, instance, **kwargs):
+    """When lesson progress changes, drop the lessons block"""
+    _invalidate_on_commit(instance.user_id, 'lessons')
+
+
+@receiver(lesson_completed)
+def invalidate_lesson_block_on_completion(sender, instance, **kwargs):
+    """mark_as_completed() uses a queryset update, which sends no post_save"""
+    _invalidate_on_commit(instance.user_id, 'lessons')
+
+
+@receiver(post_save, sender=UserAchievement)
+@receiver(post_delete, sender=UserAchievement)
+def invalidate_achievement_block(sender, instance, **kwargs):
+    """When a user achievement changes, drop the achievements block"""
+    _invalidate_on_commit(instance.user_id, 'achievements')
+
+
+@receiver(achievements_unlocked)
+def invalidate_blocks_on_unlock(sender, user_id, **kwargs):
+    """Bulk unlocks send no post_save; their rewards also change wallet totals"""
+    _invalidate_on_commit(user_id, 'achievements', 'wallet', 'chart')
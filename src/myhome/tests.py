@@ -1,3 +1,189 @@
-from django.test import TestCase
+from datetime import timedelta
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from lessons.models import Lesson, UserLessonProgress
+from tracking.models import Saving, SavingGoal, Spending, SpendingCategory
+from wallet.models import Wallet, WalletTransaction
+from .dashboard import DASHBOARD_BLOCKS, get_dashboard_block, invalidate_dashboard_blocks
+from .views import DASHBOARD_WIDGET_SLOTS
+
+User = get_user_model()
+
+
+class DashboardQueryCountTests(TestCase):
+    """The unified dashboard runs a fixed number of queries"""
+    MAX_QUERIES = 14
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='parent', email='parent@example.com', password='secret')
+        self.category = SpendingCategory.objects.create(name='Toys')
+
+    def _add_data(self, start, count):
+        today = timezone.now().date()
+        for index in range(start, start + count):
+            wallet = Wallet.objects.create(user=self.user, coin_name=f'Coin {index}', is_practice_mode=index % 2 == 0)
+            WalletTransaction.objects.create(
+                wallet=wallet, transaction_type='income', amount=Decimal('10.00'),
+                description='Allowance', date=today - timedelta(days=index)
+            )
+            Spending.objects.create(
+                user=self.user, category=self.category, amount=Decimal('2.00'),
+                description='Snack', date=today - timedelta(days=index)
+            )
+            goal = SavingGoal.objects.create(user=self.user, goal_name=f'Goal {index}', target_amount=Decimal('5.00'))
+            Saving.objects.create(
+                user=self.user, saving_goal=goal, amount=Decimal('5.00') if index % 2 else Decimal('1.00'),
+                description='Jar', date=today
+            )
+
+    def _dashboard_queries(self):
+        """Build every dashboard block, returning the merged data and the query count"""
+        data = {}
+        with CaptureQueriesContext(connection) as queries:
+            for block in DASHBOARD_BLOCKS:
+                block_data, _built_at = get_dashboard_block(self.user, block)
+                data.update(block_data)
+        return data, len(queries)
+
+    def test_query_count_is_bounded_and_independent_of_data_size(self):
+        self._add_data(0, 1)
+        self._dashboard_queries()  # Warm the achievement and lesson menu caches
+        invalidate_dashboard_blocks(self.user.pk)
+        _data, small_count = self._dashboard_queries()
+
+        self._add_data(1, 10)
+        invalidate_dashboard_blocks(self.user.pk)
+        data, large_count = self._dashboard_queries()
+
+        self.assertLessEqual(large_count, self.MAX_QUERIES)
+        self.assertEqual(large_count, small_count)
+        self.assertEqual(data['wallet_total_count'], 11)
+        self.assertEqual(data['saving_goals_total'], 11)
+        self.assertEqual(data['saving_goals_completed'], 5)
+        self.assertEqual(data['spending_total_count'], 11)
+
+
+class DashboardSnapshotTests(TestCase):
+    """Dashboard blocks are cached per user and dropped on writes"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='parent', email='parent@example.com', password='secret')
+        self.client.force_login(self.user)
+        self.wallet = Wallet.objects.create(user=self.user, coin_name='Star Coin')
+
+    def _widget(self, section, **headers):
+        return self.client.get(reverse('myhome:dashboard_widget', args=[section]), headers=headers)
+
+    @override_settings(CACHE_STATS=True)
+    def test_warm_block_skips_queries(self):
+        with CaptureQueriesContext(connection) as cold:
+            self._widget('wallet')
+        with CaptureQueriesContext(connection) as warm:
+            self._widget('wallet')
+
+        self.assertLess(len(warm), len(cold))
+        self.user.is_staff = True
+        self.user.save()
+        stats = {stat['block']: stat for stat in self.client.get(reverse('myhome:dashboard')).context['dashboard_cache_stats']}
+        self.assertEqual(set(stats), set(DASHBOARD_BLOCKS))
+        self.assertEqual(stats['wallet']['hits'], 1)
+        self.assertEqual(stats['wallet']['misses'], 1)
+
+    def test_hit_counters_are_off_by_default(self):
+        self.user.is_staff = True
+        self.user.save()
+        self._widget('wallet')
+
+        self.assertIsNone(cache.get('dashboard:misses:wallet'))
+        self.assertIsNone(self.client.get(reverse('myhome:dashboard')).context['dashboard_cache_stats'])
+
+    def test_unchanged_widget_answers_not_modified(self):
+        response = self._widget('chart')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('labels', response.json()['data'])
+
+        not_modified = self._widget('chart', if_none_match=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletTransaction.objects.create(
+                wallet=self.wallet, transaction_type='income', amount=Decimal('7.00'),
+                description='Allowance', date=timezone.now().date()
+            )
+        changed = self._widget('chart', if_none_match=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()['data']['income'], [7.0])
+
+    @override_settings(CACHE_STATS=True)
+    def test_rebuilt_block_with_same_content_answers_not_modified(self):
+        response = self._widget('wallet')
+        invalidate_dashboard_blocks(self.user.pk, 'wallet')
+
+        not_modified = self._widget('wallet', if_none_match=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(cache.get('dashboard:misses:wallet'), 2)
+
+    @override_settings(CACHE_STATS=True)
+    def test_write_drops_only_the_affected_block(self):
+        for section in DASHBOARD_WIDGET_SLOTS:
+            self._widget(section)
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletTransaction.objects.create(
+                wallet=self.wallet, transaction_type='income', amount=Decimal('7.00'),
+                description='Allowance', date=timezone.now().date()
+            )
+            Spending.objects.create(
+                user=self.user, category=SpendingCategory.objects.create(name='Toys'), amount=Decimal('2.00'),
+                description='Snack', date=timezone.now().date()
+            )
+
+        self.assertEqual(self._widget('spending').context['spending_total_count'], 1)
+        self.assertEqual(self._widget('wallet').context['wallet_total_balance'], Decimal('7.00'))
+        self._widget('lessons')
+        self.assertEqual(cache.get('dashboard:misses:lessons'), 1)
+        self.assertEqual(cache.get('dashboard:misses:wallet'), 2)
+
+    def test_blocks_are_dropped_only_after_commit(self):
+        self._widget('wallet')
+        with self.captureOnCommitCallbacks(execute=True):
+            WalletTransaction.objects.create(
+                wallet=self.wallet, transaction_type='income', amount=Decimal('7.00'),
+                description='Allowance', date=timezone.now().date()
+            )
+            # A request racing the uncommitted write still gets the cached block
+            self.assertEqual(self._widget('wallet').context['wallet_total_balance'], Decimal('0.00'))
+
+        self.assertEqual(self._widget('wallet').context['wallet_total_balance'], Decimal('7.00'))
+
+    def test_category_delete_drops_the_spending_block(self):
+        category = SpendingCategory.objects.create(name='Dashboard Test')
+        Spending.objects.create(user=self.user, category=category, amount=Decimal('2.00'), description='Card', date=timezone.now().date())
+        self.assertEqual(self._widget('spending').context['top_spending_categories'][0]['category__name'], 'Dashboard Test')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            category.delete()
+
+        self.assertIsNone(self._widget('spending').context['top_spending_categories'][0]['category__name'])
+
+    def test_lesson_completion_drops_the_lessons_block(self):
+        lesson = Lesson.objects.create(title='What Is Money?', slug='what-is-money', lesson_number=1, status='published')
+        progress = UserLessonProgress.objects.create(user=self.user, lesson=lesson, status='in_progress')
+        self.assertEqual(self._widget('lessons').context['lessons_completed'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            progress.mark_as_completed()
+
+        self.assertEqual(self._widget('lessons').context['lessons_completed'], 1)
+
+    def test_unknown_section_is_not_found(self):
+        self.assertEqual(self._widget('profile').status_code, 404)
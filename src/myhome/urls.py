@@ -7,6 +7,7 @@ app_name = 'myhome'
 urlpatterns = [
     path('', views.home_view, name='home'),
     path('dashboard/', views.dashboard_view, name='dashboard'),
+    path('dashboard/widgets/<slug:section>/', views.dashboard_widget_view, name='dashboard_widget'),
     path('about/', views.about_view, name='about'),
     path('contact/', views.contact_view, name='contact'),
     path('terms/', views.terms_view, name='terms'),
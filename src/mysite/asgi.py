@@ -3,6 +3,10 @@ ASGI config for mysite project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run the site through this entry point (e.g. with uvicorn or daphne) so
+streaming views such as the achievement notification stream are served
+asynchronously.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
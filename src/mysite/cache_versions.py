@@ -0,0 +1,31 @@
+"""Versioned cache keys
+
+A version number is kept in the shared cache under a fixed key and cached
+entries put the current version in their own key. Bumping the version makes
+every process stop reading the old entries, which simply expire.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def _new_version():
+    # Time based, so a version key lost to eviction never reuses an old number
+    return int(time.time() * 1000)
+
+
+def get_version(key):
+    """Get the current version stored under a key, starting one if missing"""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    """Move a key to a new version, so entries built under the old one are no longer read"""
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
@@ -0,0 +1,98 @@
+"""Keyset (cursor) pagination shared by list views
+
+Unlike OFFSET pagination, each page is fetched with a WHERE clause on the
+ordering columns of the last row shown, so deep pages cost the same as the
+first one as long as an index covers the ordering.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# Keyset ordering for dated records (Spending, Saving, WalletTransaction):
+# their Meta.ordering plus the primary key as a unique tie-breaker
+DATED_RECORD_ORDERING = ['-date', '-created_at', '-id']
+
+
+class KeysetPage:
+    """One page of results plus the cursor for the next page"""
+
+    def __init__(self, object_list, next_cursor, is_first_page):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.is_first_page = is_first_page
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def _parse_ordering(model, ordering):
+    """Turn ['-date', 'id'] into [(field, descending), ...]"""
+    return [
+        (model._meta.get_field(name.lstrip('-')), name.startswith('-'))
+        for name in ordering
+    ]
+
+
+def encode_cursor(obj, ordering):
+    """Encode the ordering values of `obj` as an opaque URL-safe cursor"""
+    fields = _parse_ordering(type(obj), ordering)
+    values = [field.value_to_string(obj) for field, _ in fields]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, ordering):
+    """Decode a cursor back into typed ordering values (None if missing or invalid)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        values = json.loads(raw)
+        fields = _parse_ordering(model, ordering)
+        if not isinstance(values, list) or len(values) != len(fields):
+            return None
+        return [field.to_python(value) for (field, _), value in zip(fields, values)]
+    except (ValueError, TypeError, binascii.Error, ValidationError):
+        return None
+
+
+def _after_filter(fields, values):
+    """Build the WHERE clause selecting rows that sort after the cursor row"""
+    condition = Q()
+    for index, (field, descending) in enumerate(fields):
+        lookup = 'lt' if descending else 'gt'
+        step = Q(**{f'{field.name}__{lookup}': values[index]})
+        for (previous_field, _), previous_value in zip(fields[:index], values[:index]):
+            step &= Q(**{previous_field.name: previous_value})
+        condition |= step
+    return condition
+
+
+def paginate_keyset(queryset, ordering, cursor=None, per_page=20):
+    """Return one KeysetPage of `queryset` ordered by `ordering`
+    
+    Args:
+        queryset: Filtered QuerySet to paginate
+        ordering: Non-null field names ending with a unique field, e.g. ['-date', '-created_at', '-id']
+        cursor: Cursor from a previous page's next_cursor (optional)
+        per_page: Page size
+    """
+    model = queryset.model
+    values = decode_cursor(cursor, model, ordering)
+    queryset = queryset.order_by(*ordering)
+    if values is not None:
+        queryset = queryset.filter(_after_filter(_parse_ordering(model, ordering), values))
+    
+    rows = list(queryset[:per_page + 1])
+    next_cursor = encode_cursor(rows[per_page - 1], ordering) if len(rows) > per_page else None
+    return KeysetPage(rows[:per_page], next_cursor, is_first_page=values is None)
@@ -135,6 +135,35 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+
+# The prize catalog, achievement rules, lesson menu and dashboard caches are
+# invalidated by writing to the cache, so every web and worker process must
+# share it. Uses Redis if REDIS_URL is provided, otherwise a per-process memory
+# cache, which is only consistent for a single process (e.g. runserver).
+# Deployments running several web or worker processes must set REDIS_URL.
+REDIS_URL = config('REDIS_URL', default=None)
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Count cache hits and misses (shown to staff on the prize list and dashboard).
+# Each count is an extra cache write, so leave it off unless measuring
+CACHE_STATS = config('CACHE_STATS', default=False, cast=bool)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -231,5 +260,11 @@ CONTEXT_WINDOW = 10
 # conversation thread identifier length
 THREAD_LENGTH = 10
 
+# Achievements
+# Evaluate achievement events when the request's transaction commits (the default).
+# Set to False to queue them in the outbox instead; a
+# `python manage.py process_achievement_events --loop` worker must then run
+ACHIEVEMENT_EVENTS_EAGER = config('ACHIEVEMENT_EVENTS_EAGER', default=True, cast=bool)
+
 # Version
 VERSION = '2.0'
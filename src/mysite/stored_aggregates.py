@@ -0,0 +1,71 @@
+"""Stored aggregate upkeep
+
+Wallet ledger totals, daily rollups and saving goal progress are stored
+aggregates, kept current by writes to the rows they count. StoredAggregateMixin
+remembers the state a row was loaded with, so save() and delete() move exactly
+what changed inside the same database transaction. The aggregates are updated
+with F() expressions, so concurrent writers never lose each other's changes.
+"""
+from django.db import transaction
+
+
+class StoredAggregateMixin:
+    """Apply aggregate deltas for a model's writes
+
+    Models list the fields that place a row in its aggregates in
+    AGGREGATE_STATE_FIELDS and implement apply_aggregate_change().
+    """
+    AGGREGATE_STATE_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_aggregate_state()
+        return instance
+
+    def _aggregate_state(self):
+        return tuple(getattr(self, field) for field in self.AGGREGATE_STATE_FIELDS)
+
+    def _remember_aggregate_state(self):
+        """Remember the field values currently counted in the aggregates"""
+        if all(field in self.__dict__ for field in self.AGGREGATE_STATE_FIELDS):
+            self._counted_state = self._aggregate_state()
+        else:
+            self._counted_state = None
+
+    def save(self, *args, **kwargs):
+        """Save the row and apply its aggregate deltas in the same database transaction"""
+        adding = self._state.adding
+        previous = getattr(self, '_counted_state', None)
+        with transaction.atomic():
+            if not adding and previous is None:
+                # Unknown previous state (e.g. deferred fields), read it under a row lock
+                previous = (
+                    type(self)._default_manager.select_for_update()
+                    .filter(pk=self.pk).values_list(*self.AGGREGATE_STATE_FIELDS).first()
+                )
+            super().save(*args, **kwargs)
+            self.apply_aggregate_change(previous, self._aggregate_state())
+        self._remember_aggregate_state()
+        self.aggregates_changed()
+
+    def delete(self, *args, **kwargs):
+        """Delete the row and remove it from its aggregates"""
+        previous = getattr(self, '_counted_state', None) or self._aggregate_state()
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            self.apply_aggregate_change(previous, None)
+        self.aggregates_changed()
+        return result
+
+    def apply_aggregate_change(self, previous, current):
+        """Move the row's contribution from one aggregate state to another
+
+        Args:
+            previous: AGGREGATE_STATE_FIELDS values counted so far (None for a new row)
+            current: Values to count from now on (None for a deleted row)
+        """
+        raise NotImplementedError
+
+    def aggregates_changed(self):
+        """Called after each write, e.g. to reload aggregates on cached related objects"""
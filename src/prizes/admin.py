@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Prize
+from .models import Prize, PrizeRedemption
 
 
 @admin.register(Prize)
@@ -32,5 +32,10 @@ class PrizeAdmin(admin.ModelAdmin):
         return super().get_queryset(request).select_related()
 
 
-
-
+@admin.register(PrizeRedemption)
+class PrizeRedemptionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'prize_name', 'cost', 'wallet', 'created_at')
+    list_filter = ('created_at',)
+    search_fields = ('user__username', 'prize_name')
+    raw_id_fields = ('user', 'prize', 'wallet', 'transaction')
+    readonly_fields = ('created_at',)
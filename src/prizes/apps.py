@@ -4,6 +4,10 @@ from django.apps import AppConfig
 class PrizesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'prizes'
+    
+    def ready(self):
+        """When app is ready, import signal handlers"""
+        import prizes.signals
 
 
 
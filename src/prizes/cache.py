@@ -0,0 +1,85 @@
+"""Prize catalog cache
+
+Snapshots of the available catalog are stored under a version number that is
+bumped (in the shared cache, see mysite.cache_versions) whenever a prize or its
+stock changes. Readers in every process build keys from the current version, so
+old snapshots are never served and simply expire.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from mysite.cache_versions import bump_version, get_version
+from .utils import get_available_prizes
+
+CATALOG_VERSION_KEY = 'prizes:catalog:version'
+CATALOG_HITS_KEY = 'prizes:catalog:hits'
+CATALOG_MISSES_KEY = 'prizes:catalog:misses'
+CATALOG_TIMEOUT = 60 * 60  # Seconds; availability dates are also part of the key
+
+
+def get_catalog_version():
+    """Get current catalog version"""
+    return get_version(CATALOG_VERSION_KEY)
+
+
+def invalidate_prize_catalog():
+    """Invalidate all cached catalog snapshots"""
+    bump_version(CATALOG_VERSION_KEY)
+
+
+def _count(key):
+    if not settings.CACHE_STATS:
+        return
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_cached_catalog(category=None, featured=False, limit=None):
+    """Get available prizes from the catalog cache
+    
+    Args:
+        category: Prize category (optional)
+        featured: Whether to return only featured prizes
+        limit: Maximum number of prizes (optional)
+    
+    Returns:
+        list: Available prizes
+    """
+    key = 'prizes:catalog:v{}:{}:{}:{}:{}'.format(
+        get_catalog_version(),
+        timezone.now().date().isoformat(),
+        category or 'all',
+        'featured' if featured else 'all',
+        limit or 'all',
+    )
+    prizes = cache.get(key)
+    if prizes is not None:
+        _count(CATALOG_HITS_KEY)
+        return prizes
+    
+    _count(CATALOG_MISSES_KEY)
+    prizes = get_available_prizes(category=category, featured=featured)
+    if limit:
+        prizes = prizes[:limit]
+    prizes = list(prizes)
+    cache.set(key, prizes, CATALOG_TIMEOUT)
+    return prizes
+
+
+def get_catalog_cache_stats():
+    """Get catalog cache hit/miss counters (only counted with CACHE_STATS enabled)
+    
+    Returns:
+        dict: {'hits': int, 'misses': int, 'hit_ratio': float}
+    """
+    hits = cache.get(CATALOG_HITS_KEY) or 0
+    misses = cache.get(CATALOG_MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': (hits / total) if total else 0,
+    }
@@ -18,22 +18,13 @@ class PrizeRedeemForm(forms.Form):
         super().__init__(*args, **kwargs)
         
         if user:
-            # Only show wallets with sufficient balance
-            from wallet.utils import calculate_wallet_balance
+            # Only show wallets with sufficient balance (filtered in the database)
             from decimal import Decimal
             
             wallets = Wallet.objects.filter(user=user)
-            available_wallets = []
-            
-            for wallet in wallets:
-                balance = calculate_wallet_balance(wallet)
-                if balance >= Decimal(str(prize_cost)):
-                    available_wallets.append(wallet)
-            
-            self.fields['wallet'].queryset = Wallet.objects.filter(
-                id__in=[w.id for w in available_wallets]
-            )
+            available_wallets = wallets.with_balances().filter(current_balance__gte=Decimal(str(prize_cost)))
+            self.fields['wallet'].queryset = available_wallets
             
             # If no available wallets, show all wallets (let user see insufficient balance message)
-            if not available_wallets:
+            if not available_wallets.exists():
                 self.fields['wallet'].queryset = wallets
@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-18 11:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prizes', '0001_initial'),
+        ('wallet', '0004_walletdailyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrizeRedemption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prize_name', models.CharField(help_text='Prize name at redemption time', max_length=200, verbose_name='Prize Name')),
+                ('cost', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Cost')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Redeemed At')),
+                ('prize', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='redemptions', to='prizes.prize', verbose_name='Prize')),
+                ('transaction', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='prize_redemption', to='wallet.wallettransaction', verbose_name='Wallet Transaction')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prize_redemptions', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                ('wallet', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='prize_redemptions', to='wallet.wallet', verbose_name='Wallet')),
+            ],
+            options={
+                'verbose_name': 'Prize Redemption',
+                'verbose_name_plural': 'Prize Redemptions',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user', '-created_at', '-id'], name='prizes_redemption_user_idx'), models.Index(fields=['prize', '-created_at'], name='prizes_redemption_prize_idx')],
+            },
+        ),
+    ]
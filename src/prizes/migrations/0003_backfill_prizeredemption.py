@@ -0,0 +1,58 @@
+# Generated manually to backfill prize redemptions from wallet transactions
+
+import re
+
+from django.db import migrations
+
+
+# Matched case-insensitively anywhere in the description, like the history query this replaces
+REDEMPTION_MARKER = 'Prize redemption:'
+REDEMPTION_PATTERN = re.compile(re.escape(REDEMPTION_MARKER) + r'\s*(.*)', re.IGNORECASE | re.DOTALL)
+
+
+def backfill_prize_redemptions(apps, schema_editor):
+    """Create PrizeRedemption records for existing prize redemption transactions"""
+    Prize = apps.get_model('prizes', 'Prize')
+    PrizeRedemption = apps.get_model('prizes', 'PrizeRedemption')
+    WalletTransaction = apps.get_model('wallet', 'WalletTransaction')
+    
+    prize_ids_by_name = {}
+    for prize_id, name in Prize.objects.order_by('pk').values_list('pk', 'name'):
+        prize_ids_by_name.setdefault(name, prize_id)
+    
+    transactions = WalletTransaction.objects.filter(
+        transaction_type='expense',
+        description__icontains=REDEMPTION_MARKER,
+        prize_redemption__isnull=True,
+    ).select_related('wallet').order_by('pk')
+    
+    redemptions = []
+    for transaction in transactions.iterator():
+        prize_name = REDEMPTION_PATTERN.search(transaction.description).group(1).strip()[:200]
+        redemptions.append(PrizeRedemption(
+            user_id=transaction.wallet.user_id,
+            prize_id=prize_ids_by_name.get(prize_name),
+            prize_name=prize_name,
+            wallet_id=transaction.wallet_id,
+            transaction_id=transaction.pk,
+            cost=transaction.amount,
+            created_at=transaction.created_at,
+        ))
+    PrizeRedemption.objects.bulk_create(redemptions, batch_size=500)
+
+
+def remove_backfilled_redemptions(apps, schema_editor):
+    """Remove all redemption records (used for rollback)"""
+    PrizeRedemption = apps.get_model('prizes', 'PrizeRedemption')
+    PrizeRedemption.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prizes', '0002_prizeredemption'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_prize_redemptions, remove_backfilled_redemptions),
+    ]
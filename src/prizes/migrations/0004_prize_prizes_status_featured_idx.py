@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-18 11:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('prizes', '0003_backfill_prizeredemption'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='prize',
+            index=models.Index(fields=['status', 'is_featured', 'priority'], name='prizes_status_featured_idx'),
+        ),
+    ]
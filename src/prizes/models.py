@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
@@ -6,6 +7,19 @@ from django.utils import timezone
 User = get_user_model()
 
 
+class PrizeQuerySet(models.QuerySet):
+    """Prize queryset with catalog filters"""
+    
+    def available(self, today=None):
+        """Prizes that can be redeemed today (same rules as Prize.is_available, evaluated in the database)"""
+        today = today or timezone.now().date()
+        return self.filter(
+            Q(available_from__isnull=True) | Q(available_from__lte=today),
+            Q(available_until__isnull=True) | Q(available_until__gte=today),
+            status='active',
+        ).exclude(stock_quantity=0)
+
+
 class Prize(models.Model):
     """Prize model"""
     PRIZE_CATEGORIES = [
@@ -49,10 +63,15 @@ class Prize(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
+    objects = PrizeQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-priority', '-is_featured', 'name']
         verbose_name = 'Prize'
         verbose_name_plural = 'Prizes'
+        indexes = [
+            models.Index(fields=['status', 'is_featured', 'priority'], name='prizes_status_featured_idx'),
+        ]
     
     def __str__(self):
         return f"{self.icon} {self.name}"
@@ -98,11 +117,9 @@ class Prize(models.Model):
         
         # Check user balance (need to get from wallet system)
         try:
-            from wallet.models import Wallet
-            from wallet.utils import get_user_wallets_summary
+            from wallet.utils import get_user_total_balance
             
-            wallet_summary = get_user_wallets_summary(user)
-            total_balance = wallet_summary.get('total_balance', 0)
+            total_balance = get_user_total_balance(user)
             
             if total_balance < self.coin_cost:
                 return False, f"Insufficient balance. You need {self.coin_cost} coins, but you have {total_balance} coins"
@@ -112,42 +129,96 @@ class Prize(models.Model):
             return False, "Error checking balance"
     
     def redeem_for_user(self, user, wallet=None):
-        """Redeem prize for user (deduct virtual coins)"""
+        """Redeem prize for user (deduct virtual coins)
+        
+        Runs in a single database transaction: the prize and wallet rows are locked
+        while availability and balance are re-checked, and stock is reserved with a
+        conditional F() decrement, so concurrent redemptions cannot oversell stock
+        or overdraw a wallet.
+        """
         can_redeem, message = self.can_be_redeemed_by(user)
         if not can_redeem:
             return False, message
         
         try:
             from wallet.models import Wallet, WalletTransaction
-            from wallet.utils import get_user_wallets_summary
-            from django.utils import timezone
             
-            # If no wallet specified, use first wallet
-            if not wallet:
-                wallet = Wallet.objects.filter(user=user).first()
+            with transaction.atomic():
+                prize = Prize.objects.select_for_update().get(pk=self.pk)
+                if not prize.is_available:
+                    return False, "This prize is sold out" if prize.status == 'sold_out' else "This prize is not available"
+                
+                # If no wallet specified, use first wallet
+                user_wallets = Wallet.objects.select_for_update().filter(user=user)
+                if wallet:
+                    wallet = user_wallets.filter(pk=wallet.pk).first()
+                else:
+                    wallet = user_wallets.first()
                 if not wallet:
                     return False, "No wallet found. Please create a wallet first."
+                
+                if wallet.balance < prize.coin_cost:
+                    return False, f"Insufficient balance. You need {prize.coin_cost} coins, but you have {wallet.balance} coins"
+                
+                # If stock limited, reserve one item (only succeeds while stock remains)
+                if prize.stock_quantity >= 0:
+                    reserved = Prize.objects.filter(pk=prize.pk, stock_quantity__gt=0).update(
+                        stock_quantity=F('stock_quantity') - 1
+                    )
+                    if not reserved:
+                        return False, "This prize is sold out"
+                    Prize.objects.filter(pk=prize.pk, stock_quantity__lte=0).update(status='sold_out')
+                    stock_quantity, status = Prize.objects.values_list('stock_quantity', 'status').get(pk=prize.pk)
+                    # Queryset updates send no post_save, so refresh the catalog cache explicitly.
+                    # Robust, so a cache error cannot report a committed redemption as failed
+                    from .cache import invalidate_prize_catalog
+                    transaction.on_commit(invalidate_prize_catalog, robust=True)
+                else:
+                    stock_quantity, status = prize.stock_quantity, prize.status
+                
+                # Deduct virtual coins
+                expense = WalletTransaction.objects.create(
+                    wallet=wallet,
+                    transaction_type='expense',
+                    amount=prize.coin_cost,
+                    description=f'Prize redemption: {prize.name}',
+                    date=timezone.now().date()
+                )
+                PrizeRedemption.objects.create(
+                    user=user,
+                    prize=prize,
+                    prize_name=prize.name,
+                    wallet=wallet,
+                    transaction=expense,
+                    cost=prize.coin_cost,
+                )
             
-            # Deduct virtual coins
-            WalletTransaction.objects.create(
-                wallet=wallet,
-                transaction_type='expense',
-                amount=self.coin_cost,
-                description=f'Prize redemption: {self.name}',
-                date=timezone.now().date()
-            )
-            
-            # If stock limited, decrease stock
-            if self.stock_quantity >= 0:
-                self.stock_quantity -= 1
-                if self.stock_quantity <= 0:
-                    self.status = 'sold_out'
-                self.save()
-            
+            self.stock_quantity, self.status = stock_quantity, status
             return True, "Prize redeemed successfully"
         except Exception as e:
             return False, f"Error redeeming prize: {str(e)}"
 
 
-
-
+class PrizeRedemption(models.Model):
+    """Prize redemption record"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='prize_redemptions', verbose_name='User')
+    prize = models.ForeignKey(Prize, on_delete=models.SET_NULL, null=True, blank=True, related_name='redemptions', verbose_name='Prize')
+    prize_name = models.CharField(max_length=200, verbose_name='Prize Name', help_text='Prize name at redemption time')
+    wallet = models.ForeignKey('wallet.Wallet', on_delete=models.SET_NULL, null=True, blank=True, related_name='prize_redemptions', verbose_name='Wallet')
+    transaction = models.OneToOneField('wallet.WalletTransaction', on_delete=models.SET_NULL, null=True, blank=True, related_name='prize_redemption', verbose_name='Wallet Transaction')
+    cost = models.DecimalField(max_digits=10, decimal_places=2, verbose_name='Cost')
+    
+    # Timestamps (default instead of auto_now_add so history can be backfilled with original times)
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='Redeemed At')
+    
+    class Meta:
+        ordering = ['-created_at', '-id']
+        verbose_name = 'Prize Redemption'
+        verbose_name_plural = 'Prize Redemptions'
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='prizes_redemption_user_idx'),
+            models.Index(fields=['prize', '-created_at'], name='prizes_redemption_prize_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.prize_name} - {self.cost}"
@@ -0,0 +1,14 @@
+"""Prize system signal handlers"""
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Prize
+from .cache import invalidate_prize_catalog
+
+
+@receiver(post_save, sender=Prize)
+@receiver(post_delete, sender=Prize)
+def invalidate_catalog_on_prize_change(sender, instance, **kwargs):
+    """When a prize is saved or deleted, drop cached catalog snapshots once the change commits"""
+    transaction.on_commit(invalidate_prize_catalog, robust=True)
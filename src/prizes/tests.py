@@ -1,5 +1,140 @@
 # Tests for prizes app
+import copy
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
 
+from wallet.models import Wallet, WalletTransaction
+from .cache import CATALOG_HITS_KEY, CATALOG_MISSES_KEY, get_cached_catalog, get_catalog_version
+from .models import Prize, PrizeRedemption
 
+User = get_user_model()
 
+backfill_migration = importlib.import_module('prizes.migrations.0003_backfill_prizeredemption')
+
+
+class PrizeRedemptionConcurrencyTests(TransactionTestCase):
+    """Stress prize redemption with many parallel requests"""
+    ATTEMPTS = 200
+    WORKERS = 20
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.wallet = Wallet.objects.create(user=self.user, coin_name='Star Coin')
+
+    def _fund_wallet(self, amount):
+        WalletTransaction.objects.create(
+            wallet=self.wallet,
+            transaction_type='income',
+            amount=amount,
+            description='Allowance',
+            date=timezone.now().date()
+        )
+
+    def _redeem_in_parallel(self, prize):
+        def redeem(prize_copy):
+            try:
+                success, _message = prize_copy.redeem_for_user(self.user, self.wallet)
+                return success
+            finally:
+                connection.close()
+
+        # Each request works on its own Prize instance, as separate requests would
+        prize_copies = [copy.copy(prize) for _ in range(self.ATTEMPTS)]
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            results = list(executor.map(redeem, prize_copies))
+        return results.count(True)
+
+    def _redemption_count(self):
+        return WalletTransaction.objects.filter(wallet=self.wallet, transaction_type='expense').count()
+
+    def test_parallel_redemptions_never_oversell_stock(self):
+        self._fund_wallet(Decimal('10000.00'))
+        prize = Prize.objects.create(name='Sticker', description='Shiny sticker', coin_cost=Decimal('10.00'), stock_quantity=5)
+
+        successes = self._redeem_in_parallel(prize)
+
+        prize.refresh_from_db()
+        self.wallet.refresh_from_db()
+        self.assertLessEqual(successes, 5)
+        self.assertGreaterEqual(prize.stock_quantity, 0)
+        self.assertEqual(prize.stock_quantity, 5 - successes)
+        self.assertEqual(self._redemption_count(), successes)
+        self.assertEqual(self.wallet.balance, Decimal('10000.00') - 10 * successes)
+        if connection.features.has_select_for_update:
+            # With real row locks every redemption waits its turn instead of failing
+            self.assertEqual(successes, 5)
+            self.assertEqual(prize.status, 'sold_out')
+
+    def test_parallel_redemptions_never_overdraw_wallet(self):
+        self._fund_wallet(Decimal('50.00'))
+        prize = Prize.objects.create(name='Badge', description='Digital badge', coin_cost=Decimal('10.00'), stock_quantity=-1)
+
+        successes = self._redeem_in_parallel(prize)
+
+        self.wallet.refresh_from_db()
+        self.assertLessEqual(successes, 5)
+        self.assertGreaterEqual(self.wallet.balance, 0)
+        self.assertEqual(self.wallet.balance, Decimal('50.00') - 10 * successes)
+        self.assertEqual(self._redemption_count(), successes)
+        if connection.features.has_select_for_update:
+            self.assertEqual(successes, 5)
+
+
+class PrizeCatalogCacheTests(TestCase):
+    """Catalog snapshots follow committed prize changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.prize = Prize.objects.create(name='Sticker', description='Shiny', coin_cost=Decimal('5.00'))
+
+    def test_prize_change_invalidates_only_after_commit(self):
+        self.assertEqual(get_cached_catalog(), [self.prize])
+        version = get_catalog_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.prize.status = 'inactive'
+            self.prize.save()
+            # A reader before the commit must not cache the old rows under the new version
+            self.assertEqual(get_catalog_version(), version)
+
+        self.assertNotEqual(get_catalog_version(), version)
+        self.assertEqual(get_cached_catalog(), [])
+
+    def test_hits_and_misses_are_counted_only_with_cache_stats(self):
+        get_cached_catalog()
+        get_cached_catalog()
+        self.assertIsNone(cache.get(CATALOG_HITS_KEY))
+
+        with override_settings(CACHE_STATS=True):
+            get_cached_catalog()
+            get_cached_catalog(featured=True)
+        self.assertEqual((cache.get(CATALOG_HITS_KEY), cache.get(CATALOG_MISSES_KEY)), (1, 1))
+
+
+class PrizeRedemptionBackfillTests(TestCase):
+    """The backfill finds the redemptions the old history query showed"""
+
+    def test_redemption_descriptions_match_case_insensitively(self):
+        user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        wallet = Wallet.objects.create(user=user, coin_name='Star Coin')
+        prize = Prize.objects.create(name='Sticker', description='Shiny', coin_cost=Decimal('5.00'))
+        for description in ('Prize redemption: Sticker', 'PRIZE REDEMPTION: Sticker', 'Old prize redemption:Yo-yo', 'Candy'):
+            WalletTransaction.objects.create(
+                wallet=wallet, transaction_type='expense', amount=Decimal('1.00'),
+                description=description, date=timezone.now().date()
+            )
+
+        backfill_migration.backfill_prize_redemptions(apps, None)
+
+        self.assertEqual(
+            list(PrizeRedemption.objects.order_by('transaction_id').values_list('prize_name', 'prize_id')),
+            [('Sticker', prize.pk), ('Sticker', prize.pk), ('Yo-yo', None)]
+        )
@@ -1,5 +1,5 @@
 from django.db.models import Q
-from .models import Prize
+from .models import Prize, PrizeRedemption
 from wallet.utils import get_user_wallets_summary
 
 
@@ -11,9 +11,9 @@ def get_available_prizes(category=None, featured=False):
         featured: Whether to return only featured prizes
     
     Returns:
-        QuerySet: List of available prizes
+        QuerySet: Available prizes (date window and stock filtered in the database)
     """
-    prizes = Prize.objects.filter(status='active')
+    prizes = Prize.objects.available()
     
     if category:
         prizes = prizes.filter(category=category)
@@ -21,38 +21,19 @@ def get_available_prizes(category=None, featured=False):
     if featured:
         prizes = prizes.filter(is_featured=True)
     
-    # Filter out unavailable prizes (based on time and stock)
-    available_prizes = []
-    for prize in prizes:
-        if prize.is_available:
-            available_prizes.append(prize)
-    
-    return available_prizes
+    return prizes
 
 
 def get_user_prize_history(user):
-    """Get user's prize redemption history (via wallet transaction records)
+    """Get user's prize redemption history
     
     Args:
         user: User object
     
     Returns:
-        list: List of prize redemption records (from WalletTransaction)
+        QuerySet: PrizeRedemption records, newest first
     """
-    try:
-        from wallet.models import WalletTransaction
-        from django.utils import timezone
-        
-        # Find all transactions containing "Prize redemption"
-        transactions = WalletTransaction.objects.filter(
-            wallet__user=user,
-            transaction_type='expense',
-            description__icontains='Prize redemption:'
-        ).order_by('-date', '-created_at')
-        
-        return transactions
-    except Exception:
-        return []
+    return PrizeRedemption.objects.filter(user=user).select_related('wallet').order_by('-created_at', '-id')
 
 
 def search_prizes(query, category=None):
@@ -83,7 +64,7 @@ def get_featured_prizes(limit=6):
         limit: Return count limit
     
     Returns:
-        list: List of featured prizes
+        QuerySet: Featured prizes (limited in the database)
     """
     return get_available_prizes(featured=True)[:limit]
 
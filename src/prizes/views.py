@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
@@ -5,7 +6,9 @@ from django.db.models import Q
 
 from .models import Prize
 from .utils import get_available_prizes, get_user_prize_history, search_prizes, get_featured_prizes
-from wallet.utils import get_user_wallets_summary
+from .cache import get_cached_catalog, get_catalog_cache_stats
+from wallet.utils import get_user_wallets_summary, get_user_total_balance
+from mysite.pagination import paginate_keyset
 
 
 def prize_list_view(request):
@@ -15,25 +18,24 @@ def prize_list_view(request):
     search_query = request.GET.get('search', '')
     featured_only = request.GET.get('featured', '') == 'true'
     
-    # Get prizes
+    # Get prizes (catalog browsing is served from the catalog cache)
     if search_query:
         prizes = search_prizes(search_query, category_filter if category_filter else None)
     elif featured_only:
-        prizes = get_available_prizes(category=category_filter if category_filter else None, featured=True)
+        prizes = get_cached_catalog(category=category_filter if category_filter else None, featured=True)
     else:
-        prizes = get_available_prizes(category=category_filter if category_filter else None)
+        prizes = get_cached_catalog(category=category_filter if category_filter else None)
     
     # Get user balance (if logged in)
     user_balance = None
     if request.user.is_authenticated:
-        wallet_summary = get_user_wallets_summary(request.user)
-        user_balance = wallet_summary.get('total_balance', 0)
+        user_balance = get_user_total_balance(request.user)
     
     # Get category options
     categories = Prize.PRIZE_CATEGORIES
     
     # Get featured prizes (for sidebar or recommendation area)
-    featured_prizes = get_featured_prizes(limit=6)
+    featured_prizes = get_cached_catalog(featured=True, limit=6)
     
     context = {
         'prizes': prizes,
@@ -43,6 +45,7 @@ def prize_list_view(request):
         'featured_only': featured_only,
         'user_balance': user_balance,
         'featured_prizes': featured_prizes,
+        'catalog_cache_stats': get_catalog_cache_stats() if settings.CACHE_STATS and request.user.is_staff else None,
     }
     return render(request, 'prizes/prize_list.html', context)
 
@@ -60,8 +63,7 @@ def prize_detail_view(request, pk):
     wallet_count = 0
     
     if request.user.is_authenticated:
-        wallet_summary = get_user_wallets_summary(request.user)
-        user_balance = wallet_summary.get('total_balance', 0)
+        user_balance = get_user_total_balance(request.user)
         can_redeem, redeem_message = prize.can_be_redeemed_by(request.user)
         wallet_count = Wallet.objects.filter(user=request.user).count()
     
@@ -137,15 +139,15 @@ def prize_redeem_view(request, pk):
                 return redirect('prizes:prize_detail', pk=pk)
     
     # Get wallet balance information
-    from wallet.utils import get_user_wallets_summary, calculate_wallet_balance
     wallet_summary = get_user_wallets_summary(request.user)
     wallets_with_balance = []
+    has_selectable_wallets = form.fields['wallet'].queryset.exists()
     
     for wallet_item in wallet_summary['wallets']:
         wallet = wallet_item['wallet']
         balance = wallet_item['balance']
         # Only show wallets with sufficient balance, or if none sufficient, show all wallets
-        if balance >= prize.coin_cost or form.fields['wallet'].queryset.count() == 0:
+        if balance >= prize.coin_cost or not has_selectable_wallets:
             wallets_with_balance.append({
                 'wallet': wallet,
                 'balance': balance,
@@ -164,12 +166,16 @@ def prize_redeem_view(request, pk):
 @login_required
 def my_prizes_view(request):
     """My prizes page (show redemption history)"""
-    # Get user's redemption history (via wallet transaction records)
-    prize_history = get_user_prize_history(request.user)
+    # Get user's redemption history (one keyset page at a time)
+    prize_history = paginate_keyset(
+        get_user_prize_history(request.user),
+        ordering=['-created_at', '-id'],
+        cursor=request.GET.get('cursor'),
+        per_page=20,
+    )
     
     # Get user balance
-    wallet_summary = get_user_wallets_summary(request.user)
-    user_balance = wallet_summary.get('total_balance', 0)
+    user_balance = get_user_total_balance(request.user)
     
     context = {
         'prize_history': prize_history,
@@ -8,6 +8,10 @@
 
     let notificationQueue = [];
     let isShowingNotification = false;
+    let seenAchievementIds = new Set();
+    let pendingNotifiedIds = [];
+    let flushTimer = null;
+    let pollTimer = null;
 
     /**
      * Get Cookie
@@ -28,7 +32,25 @@
     }
 
     /**
-     * Check unnotified achievements
+     * Add achievements to the notification queue (each one only once)
+     */
+    function queueAchievements(achievements) {
+        achievements.forEach(achievement => {
+            if (seenAchievementIds.has(achievement.id)) {
+                return;
+            }
+            seenAchievementIds.add(achievement.id);
+            notificationQueue.push(achievement);
+        });
+
+        // If no notification currently showing, start showing
+        if (!isShowingNotification) {
+            showNextNotification();
+        }
+    }
+
+    /**
+     * Check unnotified achievements (polling fallback)
      */
     function checkUnnotifiedAchievements() {
         fetch('/achievements/api/unnotified/', {
@@ -41,15 +63,7 @@
         .then(response => response.json())
         .then(data => {
             if (data.success && data.achievements && data.achievements.length > 0) {
-                // Add achievements to queue
-                data.achievements.forEach(achievement => {
-                    notificationQueue.push(achievement);
-                });
-                
-                // If no notification currently showing, start showing
-                if (!isShowingNotification) {
-                    showNextNotification();
-                }
+                queueAchievements(data.achievements);
             }
         })
         .catch(error => {
@@ -57,6 +71,45 @@
         });
     }
 
+    /**
+     * Poll every 30 seconds (used when the stream is unavailable)
+     */
+    function startPolling() {
+        if (pollTimer) {
+            return;
+        }
+        checkUnnotifiedAchievements();
+        pollTimer = setInterval(checkUnnotifiedAchievements, 30000);
+    }
+
+    /**
+     * Listen for new achievements on the server-sent event stream
+     */
+    function connectStream() {
+        if (!window.EventSource) {
+            startPolling();
+            return;
+        }
+
+        const source = new EventSource('/achievements/api/stream/');
+        let opened = false;
+
+        source.addEventListener('open', function() {
+            opened = true;
+        });
+        source.addEventListener('achievement', function(event) {
+            queueAchievements([JSON.parse(event.data)]);
+        });
+        source.addEventListener('error', function() {
+            // EventSource reconnects by itself after the server closes the stream;
+            // if it never connected or gave up, fall back to polling
+            if (!opened || source.readyState === EventSource.CLOSED) {
+                source.close();
+                startPolling();
+            }
+        });
+    }
+
     /**
      * Show next notification
      */
@@ -188,25 +241,43 @@
     }
 
     /**
-     * Mark achievement as notified
+     * Mark achievement as notified (sent in batches)
      */
     function markAchievementNotified(achievementId) {
-        fetch(`/achievements/api/${achievementId}/mark-notified/`, {
+        pendingNotifiedIds.push(achievementId);
+        clearTimeout(flushTimer);
+        flushTimer = setTimeout(flushNotifiedAchievements, 1000);
+    }
+
+    /**
+     * Send pending "notified" marks in one request
+     */
+    function flushNotifiedAchievements() {
+        clearTimeout(flushTimer);
+        if (pendingNotifiedIds.length === 0) {
+            return;
+        }
+        const ids = pendingNotifiedIds;
+        pendingNotifiedIds = [];
+
+        fetch('/achievements/api/mark-notified/', {
             method: 'POST',
             headers: {
                 'X-CSRFToken': getCookie('csrftoken'),
                 'Content-Type': 'application/json',
             },
-            credentials: 'same-origin'
+            credentials: 'same-origin',
+            body: JSON.stringify({ ids: ids }),
+            keepalive: true
         })
         .then(response => response.json())
         .then(data => {
             if (data.success) {
-                console.log('Achievement marked as notified');
+                console.log('Achievements marked as notified');
             }
         })
         .catch(error => {
-            console.error('Error marking achievement as notified:', error);
+            console.error('Error marking achievements as notified:', error);
         });
     }
 
@@ -232,17 +303,17 @@
     window.markAchievementNotified = markAchievementNotified;
     window.closeAchievementNotification = closeAchievementNotification;
 
-    // Check unnotified achievements after page loads
+    // Don't lose marks that are still waiting when the page is left
+    window.addEventListener('pagehide', flushNotifiedAchievements);
+
+    // Connect to the notification stream after page loads
     if (document.readyState === 'loading') {
         document.addEventListener('DOMContentLoaded', function() {
-            // Delay check slightly to ensure page is fully loaded
-            setTimeout(checkUnnotifiedAchievements, 1000);
+            // Delay slightly to ensure page is fully loaded
+            setTimeout(connectStream, 1000);
         });
     } else {
-        setTimeout(checkUnnotifiedAchievements, 1000);
+        setTimeout(connectStream, 1000);
     }
-
-    // Periodic check (check every 30 seconds)
-    setInterval(checkUnnotifiedAchievements, 30000);
 })();
 
@@ -1,6 +1,8 @@
 /**
- * Dashboard chart initialization
- * Wallet income and expense trend chart
+ * Dashboard widgets and chart initialization
+ * Each section is fetched from its own endpoint in parallel and filled in
+ * as soon as it arrives; the wallet income and expense trend chart is one
+ * of the sections.
  */
 
 function initWalletTrendChart(chartData) {
@@ -89,14 +91,78 @@ function initWalletTrendChart(chartData) {
     });
 }
 
-// Initialize charts after page loads
-document.addEventListener('DOMContentLoaded', function() {
-    // Get chart data from global variable (set by template)
-    if (typeof window.walletChartData !== 'undefined') {
-        initWalletTrendChart(window.walletChartData);
+function fillDashboardSlots(html) {
+    Object.keys(html).forEach(function(slot) {
+        const element = document.querySelector('[data-dashboard-slot="' + slot + '"]');
+        if (element) {
+            element.innerHTML = html[slot];
+        }
+    });
+}
+
+function showDashboardSectionError(section) {
+    document.querySelectorAll('[data-dashboard-slot^="' + section + '-"]').forEach(function(element) {
+        element.innerHTML = '<div class="text-center text-muted py-4">Could not load this section. Please refresh the page.</div>';
+    });
+}
+
+function showDashboardUpdated(builtAt) {
+    const element = document.querySelector('[data-dashboard-updated]');
+    if (!element) {
+        return;
     }
-});
+    const minutes = Math.floor((Date.now() - builtAt.getTime()) / 60000);
+    element.textContent = minutes < 1 ? 'Updated just now' : 'Updated ' + minutes + ' min ago';
+}
 
+function loadDashboardWidgets(widgetUrls) {
+    let oldestBuiltAt = null;
 
+    // Fire every request at once; each section renders as soon as it arrives
+    const requests = Object.keys(widgetUrls).map(function(section) {
+        return fetch(widgetUrls[section], {
+            credentials: 'same-origin',
+            headers: { 'Accept': 'application/json' }
+        })
+            .then(function(response) {
+                if (!response.ok) {
+                    throw new Error('HTTP ' + response.status);
+                }
+                return response.json();
+            })
+            .then(function(payload) {
+                fillDashboardSlots(payload.html);
+                if (payload.data) {
+                    initWalletTrendChart(payload.data);
+                    if (payload.data.labels.length === 0) {
+                        const container = document.querySelector('[data-dashboard-chart]');
+                        if (container) {
+                            container.style.display = 'none';
+                        }
+                    }
+                }
+                const builtAt = new Date(payload.built_at);
+                if (oldestBuiltAt === null || builtAt < oldestBuiltAt) {
+                    oldestBuiltAt = builtAt;
+                }
+            })
+            .catch(function(error) {
+                console.error('Dashboard section ' + section + ' failed to load:', error);
+                showDashboardSectionError(section);
+            });
+    });
 
+    Promise.all(requests).then(function() {
+        if (oldestBuiltAt !== null) {
+            showDashboardUpdated(oldestBuiltAt);
+        }
+    });
+}
 
+// Load dashboard sections after page loads
+document.addEventListener('DOMContentLoaded', function() {
+    // Get widget endpoints from global variable (set by template)
+    if (typeof window.dashboardWidgetUrls !== 'undefined') {
+        loadDashboardWidgets(window.dashboardWidgetUrls);
+    }
+});
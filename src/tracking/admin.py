@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Spending, SpendingCategory, Saving, SavingGoal
+from .models import Spending, SpendingCategory, SpendingDailyRollup, Saving, SavingGoal
 
 
 class SpendingAdmin(admin.ModelAdmin):
@@ -16,6 +16,13 @@ class SpendingAdmin(admin.ModelAdmin):
             'fields': ('category',)
         }),
     )
+    
+    def delete_queryset(self, request, queryset):
+        # Bulk deletes bypass Spending.delete(), so regroup the affected users' rollups
+        from .utils import rebuild_spending_rollups
+        user_ids = set(queryset.values_list('user_id', flat=True))
+        super().delete_queryset(request, queryset)
+        rebuild_spending_rollups(user_ids)
 
 
 class SpendingCategoryAdmin(admin.ModelAdmin):
@@ -37,13 +44,21 @@ class SavingAdmin(admin.ModelAdmin):
             'fields': ('goal',)
         }),
     )
+    
+    def delete_queryset(self, request, queryset):
+        # Bulk deletes bypass Saving.delete(), so recount the affected goals
+        from .utils import rebuild_goal_progress
+        goal_ids = set(queryset.exclude(saving_goal=None).values_list('saving_goal_id', flat=True))
+        super().delete_queryset(request, queryset)
+        for goal_id in goal_ids:
+            rebuild_goal_progress(goal_id)
 
 
 class SavingGoalAdmin(admin.ModelAdmin):
     list_display = ('goal_name', 'target_amount', 'current_amount', 'progress_percentage', 'child_name', 'user', 'is_completed', 'created_at')
     list_filter = ('created_at', 'child_name', 'deadline')
     search_fields = ('goal_name', 'description', 'child_name', 'user__username')
-    readonly_fields = ('current_amount', 'progress_percentage', 'remaining_amount', 'is_completed', 'created_at', 'updated_at')
+    readonly_fields = ('current_amount', 'completed_at', 'progress_percentage', 'remaining_amount', 'is_completed', 'created_at', 'updated_at')
     date_hierarchy = 'created_at'
     ordering = ('-created_at',)
     fieldsets = (
@@ -57,7 +72,7 @@ class SavingGoalAdmin(admin.ModelAdmin):
             'fields': ('deadline',)
         }),
         ('Progress (Read-only)', {
-            'fields': ('current_amount', 'remaining_amount', 'progress_percentage', 'is_completed')
+            'fields': ('current_amount', 'remaining_amount', 'progress_percentage', 'is_completed', 'completed_at')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at')
@@ -65,8 +80,16 @@ class SavingGoalAdmin(admin.ModelAdmin):
     )
 
 
+class SpendingDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('user', 'date', 'category', 'child_name', 'amount', 'spending_count')
+    list_filter = ('date', 'category')
+    search_fields = ('user__username', 'child_name')
+    readonly_fields = ('user', 'date', 'category', 'child_name', 'amount', 'spending_count')
+
+
 admin.site.register(Spending, SpendingAdmin)
 admin.site.register(SpendingCategory, SpendingCategoryAdmin)
+admin.site.register(SpendingDailyRollup, SpendingDailyRollupAdmin)
 admin.site.register(Saving, SavingAdmin)
 admin.site.register(SavingGoal, SavingGoalAdmin)
 
@@ -4,8 +4,7 @@ from django.apps import AppConfig
 class TrackingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tracking'
-
-
-
-
-
+    
+    def ready(self):
+        """When app is ready, import signal handlers"""
+        import tracking.signals
@@ -0,0 +1,37 @@
+"""
+Management command: Rebuild spending daily rollups from spendings
+Usage: python manage.py backfill_spending_rollups [--chunk-size 200]
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from tracking.utils import rebuild_spending_rollups
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Rebuild SpendingDailyRollup rows from spending records'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Number of users rebuilt per database transaction (default: 200)',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        user_ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        total_users = len(user_ids)
+        rollup_count = 0
+        
+        for start in range(0, total_users, chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            rollup_count += rebuild_spending_rollups(chunk)
+            self.stdout.write(f'  {min(start + chunk_size, total_users)}/{total_users} users')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Rebuilt {rollup_count} spending rollups for {total_users} users'
+        ))
@@ -0,0 +1,52 @@
+"""
+Management command: Verify and repair stored saving goal progress
+Usage: python manage.py rebuild_saving_goal_progress [--check]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tracking.models import SavingGoal
+from tracking.utils import rebuild_goal_progress
+
+
+class Command(BaseCommand):
+    help = 'Recount saving goal amounts and completion from savings and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report goals whose stored progress drifted, do not repair them',
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        
+        # Compare stored amounts with recomputed amounts for every goal in one grouped query
+        goals = SavingGoal.objects.with_saving_totals().order_by('pk')
+        checked_count = 0
+        drifted_ids = []
+        for goal in goals.iterator():
+            checked_count += 1
+            completed = goal.computed_amount >= goal.target_amount
+            if goal.current_amount != goal.computed_amount or (goal.completed_at is not None) != completed:
+                drifted_ids.append(goal.pk)
+                self.stdout.write(self.style.WARNING(
+                    f'↻ Goal {goal.pk} ({goal.goal_name}): stored {goal.current_amount}'
+                    f'{" (completed)" if goal.completed_at else ""}, actual {goal.computed_amount}'
+                    f'{" (completed)" if completed else ""}'
+                ))
+        
+        if not check_only:
+            for goal_id in drifted_ids:
+                with transaction.atomic():
+                    # Lock the goal so concurrent saving writes cannot interleave with the recount
+                    SavingGoal.objects.select_for_update().only('pk').get(pk=goal_id)
+                    rebuild_goal_progress(goal_id)
+        
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Checked {checked_count} saving goals'))
+        if drifted_ids:
+            action = 'Found' if check_only else 'Repaired'
+            self.stdout.write(self.style.WARNING(f'  {action} drift in {len(drifted_ids)} saving goals'))
+        else:
+            self.stdout.write(self.style.SUCCESS('  No drift found'))
@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 14:40
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import F, Max, Sum
+
+
+def backfill_goal_progress(apps, schema_editor):
+    """Fill stored progress for existing goals from their savings"""
+    SavingGoal = apps.get_model('tracking', 'SavingGoal')
+    
+    totals = SavingGoal.objects.annotate(
+        saved=Sum('savings__amount'),
+        last_saved_at=Max('savings__created_at'),
+    ).filter(saved__isnull=False).values('pk', 'saved', 'last_saved_at')
+    for row in totals:
+        SavingGoal.objects.filter(pk=row['pk']).update(current_amount=row['saved'])
+        # The exact completion moment is unknown, the latest saving is the closest guess
+        SavingGoal.objects.filter(pk=row['pk'], current_amount__gte=F('target_amount')).update(completed_at=row['last_saved_at'])
+    # Goals with a zero target are complete without any savings
+    SavingGoal.objects.filter(completed_at__isnull=True, current_amount__gte=F('target_amount')).update(completed_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0004_savinggoal_saving_saving_goal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='savinggoal',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Completed At'),
+        ),
+        migrations.AddField(
+            model_name='savinggoal',
+            name='current_amount',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Current Amount'),
+        ),
+        migrations.RunPython(backfill_goal_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-10-18 15:10
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_spending_rollups(apps, schema_editor):
+    """Build daily rollups for existing spendings"""
+    Spending = apps.get_model('tracking', 'Spending')
+    SpendingDailyRollup = apps.get_model('tracking', 'SpendingDailyRollup')
+    
+    rows = Spending.objects.values('user_id', 'date', 'category_id', 'child_name').annotate(
+        total=Sum('amount'),
+        spending_count=Count('id'),
+    ).order_by()
+    SpendingDailyRollup.objects.bulk_create([
+        SpendingDailyRollup(
+            user_id=row['user_id'],
+            date=row['date'],
+            category_id=row['category_id'],
+            child_name=row['child_name'],
+            amount=row['total'] or Decimal('0.00'),
+            spending_count=row['spending_count'],
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0005_savinggoal_progress'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpendingDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('child_name', models.CharField(blank=True, max_length=50, verbose_name='Child Name')),
+                ('amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Amount')),
+                ('spending_count', models.IntegerField(default=0, verbose_name='Spending Count')),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='tracking.spendingcategory', verbose_name='Category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='spending_rollups', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Spending Daily Rollup',
+                'verbose_name_plural': 'Spending Daily Rollups',
+                'ordering': ['-date'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('user', 'date', 'category', 'child_name'), name='tracking_spending_rollup_uniq'), models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'date', 'child_name'), name='tracking_spending_rollup_uncategorized_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_spending_rollups, migrations.RunPython.noop),
+    ]
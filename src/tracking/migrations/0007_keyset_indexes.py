@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 15:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracking', '0006_spendingdailyrollup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='saving',
+            index=models.Index(fields=['user', '-date', '-created_at', '-id'], name='tracking_saving_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spending',
+            index=models.Index(fields=['user', '-date', '-created_at', '-id'], name='tracking_spending_keyset_idx'),
+        ),
+    ]
@@ -1,9 +1,13 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.db.models import Sum
+from django.utils import timezone
+from django.db.models import Sum, F
+from django.db.models.functions import Coalesce
 from decimal import Decimal
 
+from mysite.stored_aggregates import StoredAggregateMixin
+
 User = get_user_model()
 
 
@@ -23,7 +27,7 @@ class SpendingCategory(models.Model):
         return f"{self.icon} {self.name}"
 
 
-class Spending(models.Model):
+class Spending(StoredAggregateMixin, models.Model):
     """Spending record model"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='spendings', verbose_name='User')
     category = models.ForeignKey(SpendingCategory, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='Category')
@@ -36,16 +40,86 @@ class Spending(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
+    # Fields that place a spending in SpendingDailyRollup
+    AGGREGATE_STATE_FIELDS = ('user_id', 'date', 'category_id', 'child_name', 'amount')
+    
     class Meta:
         ordering = ['-date', '-created_at']
         verbose_name = 'Spending'
         verbose_name_plural = 'Spendings'
+        indexes = [
+            # Keyset pagination of a user's list (DATED_RECORD_ORDERING)
+            models.Index(fields=['user', '-date', '-created_at', '-id'], name='tracking_spending_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.date} - {self.amount} - {self.description}"
     
     def get_absolute_url(self):
         return reverse('tracking:spending_detail', kwargs={'pk': self.pk})
+    
+    def apply_aggregate_change(self, previous, current):
+        """Move the spending between daily rollup rows (or adjust its amount in place)"""
+        from .utils import adjust_spending_rollup, apply_spending_entry
+        
+        if previous is not None and current is not None and previous[:4] == current[:4]:
+            adjust_spending_rollup(*current[:4], Decimal(str(current[4] or 0)) - Decimal(str(previous[4] or 0)), 0)
+            return
+        if previous is not None:
+            apply_spending_entry(*previous, sign=-1)
+        if current is not None:
+            apply_spending_entry(*current)
+
+
+class SpendingDailyRollup(models.Model):
+    """Per-user daily spending totals by category and child (maintained by Spending writes)"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='spending_rollups', verbose_name='User')
+    date = models.DateField(verbose_name='Date')
+    category = models.ForeignKey(SpendingCategory, on_delete=models.CASCADE, null=True, blank=True, verbose_name='Category')
+    child_name = models.CharField(max_length=50, blank=True, verbose_name='Child Name')
+    amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), verbose_name='Amount')
+    spending_count = models.IntegerField(default=0, verbose_name='Spending Count')
+    
+    class Meta:
+        ordering = ['-date']
+        verbose_name = 'Spending Daily Rollup'
+        verbose_name_plural = 'Spending Daily Rollups'
+        constraints = [
+            # NULL categories are never equal in a plain unique index, so they get their own
+            models.UniqueConstraint(
+                fields=['user', 'date', 'category', 'child_name'],
+                condition=models.Q(category__isnull=False),
+                name='tracking_spending_rollup_uniq',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'date', 'child_name'],
+                condition=models.Q(category__isnull=True),
+                name='tracking_spending_rollup_uncategorized_uniq',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.user} - {self.date} - {self.category or 'Uncategorized'} - {self.amount}"
+
+
+class SavingGoalQuerySet(models.QuerySet):
+    """Saving goal queryset with completion filters"""
+    
+    def completed(self):
+        """Goals whose stored saved amount reached the target"""
+        return self.filter(current_amount__gte=F('target_amount'))
+    
+    def in_progress(self):
+        """Goals whose stored saved amount is still below the target"""
+        return self.filter(current_amount__lt=F('target_amount'))
+    
+    def with_saving_totals(self):
+        """Annotate saved amounts recomputed from raw savings in one grouped query
+        
+        Used to verify the stored progress; normal reads should use current_amount.
+        """
+        zero = models.Value(Decimal('0.00'), output_field=models.DecimalField(max_digits=12, decimal_places=2))
+        return self.annotate(computed_amount=Coalesce(Sum('savings__amount'), zero))
 
 
 class SavingGoal(models.Model):
@@ -59,10 +133,18 @@ class SavingGoal(models.Model):
     color = models.CharField(max_length=20, default='#28a745', verbose_name='Color (hex)')
     description = models.TextField(blank=True, verbose_name='Description')
     
+    # Progress (maintained by Saving writes, never edited directly)
+    current_amount = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), editable=False, verbose_name='Current Amount')
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name='Completed At')
+    
+    PROGRESS_FIELDS = ('current_amount', 'completed_at')
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
+    objects = SavingGoalQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Saving Goal'
@@ -74,11 +156,30 @@ class SavingGoal(models.Model):
     def get_absolute_url(self):
         return reverse('tracking:saving_goal_detail', kwargs={'pk': self.pk})
     
-    @property
-    def current_amount(self):
-        """Calculate current saved amount (sum of associated Saving records)"""
-        total = self.savings.aggregate(Sum('amount'))['amount__sum']
-        return total if total else Decimal('0.00')
+    def save(self, *args, **kwargs):
+        """Save goal without overwriting progress from a possibly stale instance
+        
+        A changed target can complete (or reopen) the goal, so completion is
+        re-evaluated against the stored amount and reloaded afterwards.
+        """
+        from .utils import refresh_goal_completion
+        
+        if self._state.adding:
+            if self.completed_at is None and self.current_amount >= self.target_amount:
+                self.completed_at = timezone.now()
+            super().save(*args, **kwargs)
+            return
+        
+        if kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.PROGRESS_FIELDS
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if 'target_amount' in kwargs['update_fields']:
+                refresh_goal_completion([self.pk])
+        self.refresh_from_db(fields=self.PROGRESS_FIELDS)
     
     @property
     def progress_percentage(self):
@@ -100,7 +201,7 @@ class SavingGoal(models.Model):
         return self.current_amount >= self.target_amount
 
 
-class Saving(models.Model):
+class Saving(StoredAggregateMixin, models.Model):
     """Savings record model"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='savings', verbose_name='User')
     saving_goal = models.ForeignKey(SavingGoal, on_delete=models.SET_NULL, null=True, blank=True, related_name='savings', verbose_name='Saving Goal')
@@ -114,15 +215,37 @@ class Saving(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
+    # Fields that place a saving in its goal's stored progress
+    AGGREGATE_STATE_FIELDS = ('saving_goal_id', 'amount')
+    
     class Meta:
         ordering = ['-date', '-created_at']
         verbose_name = 'Saving'
         verbose_name_plural = 'Savings'
+        indexes = [
+            # Keyset pagination of a user's list (DATED_RECORD_ORDERING)
+            models.Index(fields=['user', '-date', '-created_at', '-id'], name='tracking_saving_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.date} - {self.amount} - {self.description}"
     
     def get_absolute_url(self):
         return reverse('tracking:saving_detail', kwargs={'pk': self.pk})
-
-
+    
+    def apply_aggregate_change(self, previous, current):
+        """Move the saving's amount between goals (or adjust it on the same goal)"""
+        from .utils import apply_saving_entry
+        
+        if previous is not None and current is not None and previous[0] == current[0]:
+            apply_saving_entry(current[0], Decimal(str(current[1] or 0)) - Decimal(str(previous[1] or 0)))
+            return
+        if previous is not None:
+            apply_saving_entry(*previous, sign=-1)
+        if current is not None:
+            apply_saving_entry(*current)
+    
+    def aggregates_changed(self):
+        """Reload progress on an already fetched goal so its current amount is not stale"""
+        if Saving.saving_goal.is_cached(self) and self.saving_goal is not None and self.saving_goal.pk:
+            self.saving_goal.refresh_from_db(fields=SavingGoal.PROGRESS_FIELDS)
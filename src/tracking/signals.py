@@ -0,0 +1,22 @@
+"""Tracking signal handlers (keep spending rollups correct when a category is deleted)"""
+from django.db.models.signals import pre_delete, post_delete
+from django.dispatch import receiver
+
+from .models import Spending, SpendingCategory
+from .utils import rebuild_spending_rollups
+
+
+@receiver(pre_delete, sender=SpendingCategory)
+def remember_category_spenders(sender, instance, **kwargs):
+    """Before a category is deleted, remember whose spendings it covers"""
+    instance._rollup_user_ids = list(
+        Spending.objects.filter(category=instance).order_by().values_list('user_id', flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=SpendingCategory)
+def rebuild_rollups_after_category_delete(sender, instance, **kwargs):
+    """Deleting a category nulls its spendings with a bulk update, so regroup them as uncategorized"""
+    user_ids = getattr(instance, '_rollup_user_ids', None)
+    if user_ids:
+        rebuild_spending_rollups(user_ids)
@@ -1,8 +1,302 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Count, Sum
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Saving, SavingGoal, Spending, SpendingCategory, SpendingDailyRollup
+from .views import SAVING_GOALS_PER_PAGE, SAVINGS_PER_PAGE, SPENDINGS_PER_PAGE
+
+User = get_user_model()
+
+
+class SavingGoalProgressTests(TestCase):
+    """Saving writes keep the goal's stored progress in step"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.bike = SavingGoal.objects.create(user=self.user, goal_name='Bike', target_amount=Decimal('10.00'))
+        self.game = SavingGoal.objects.create(user=self.user, goal_name='Game', target_amount=Decimal('20.00'))
+
+    def _save(self, goal, amount):
+        return Saving.objects.create(
+            user=self.user, saving_goal=goal, amount=Decimal(amount),
+            description='Jar', date=timezone.now().date()
+        )
+
+    def _progress(self, goal):
+        goal.refresh_from_db()
+        return goal.current_amount, goal.completed_at is not None
+
+    def test_create_edit_and_delete_update_stored_amount(self):
+        saving = self._save(self.bike, '4.00')
+        self._save(self.bike, '3.00')
+        self.assertEqual(self._progress(self.bike), (Decimal('7.00'), False))
+
+        saving = Saving.objects.get(pk=saving.pk)
+        saving.amount = Decimal('7.00')
+        saving.save()
+        self.assertEqual(self._progress(self.bike), (Decimal('10.00'), True))
+
+        saving.delete()
+        self.assertEqual(self._progress(self.bike), (Decimal('3.00'), False))
+
+    def test_reassigning_a_saving_moves_its_amount(self):
+        saving = self._save(self.bike, '12.00')
+        self.assertEqual(self._progress(self.bike), (Decimal('12.00'), True))
+
+        saving = Saving.objects.get(pk=saving.pk)
+        saving.saving_goal = self.game
+        saving.save()
+        self.assertEqual(self._progress(self.bike), (Decimal('0.00'), False))
+        self.assertEqual(self._progress(self.game), (Decimal('12.00'), False))
+
+        saving.saving_goal = None
+        saving.save()
+        self.assertEqual(self._progress(self.game), (Decimal('0.00'), False))
+
+    def test_deferred_saving_save_reads_previous_state(self):
+        saving = self._save(self.bike, '5.00')
+
+        saving = Saving.objects.only('pk', 'description').get(pk=saving.pk)
+        saving.saving_goal = self.game
+        saving.save()
+
+        self.assertEqual(self._progress(self.bike), (Decimal('0.00'), False))
+        self.assertEqual(self._progress(self.game), (Decimal('5.00'), False))
+
+    def test_completion_keeps_first_timestamp_and_follows_target_changes(self):
+        self._save(self.bike, '10.00')
+        self.bike.refresh_from_db()
+        completed_at = self.bike.completed_at
+        self._save(self.bike, '1.00')
+        self.bike.refresh_from_db()
+        self.assertEqual(self.bike.completed_at, completed_at)
+
+        self.bike.target_amount = Decimal('50.00')
+        self.bike.save()
+        self.assertIsNone(self.bike.completed_at)
+        self.assertEqual(self.bike.current_amount, Decimal('11.00'))
+
+        self.bike.target_amount = Decimal('11.00')
+        self.bike.save()
+        self.assertIsNotNone(self.bike.completed_at)
+
+    def test_stale_goal_save_does_not_overwrite_progress(self):
+        stale_goal = SavingGoal.objects.get(pk=self.bike.pk)
+        self._save(self.bike, '6.00')
+
+        stale_goal.goal_name = 'Red bike'
+        stale_goal.save()
+
+        self.assertEqual(self._progress(self.bike), (Decimal('6.00'), False))
+
+    def test_status_filters_run_on_stored_progress(self):
+        self._save(self.bike, '10.00')
+
+        self.assertQuerySetEqual(SavingGoal.objects.completed(), [self.bike])
+        self.assertQuerySetEqual(SavingGoal.objects.in_progress(), [self.game])
+
+    def test_rebuild_command_repairs_drift(self):
+        self._save(self.bike, '10.00')
+        SavingGoal.objects.filter(pk=self.bike.pk).update(current_amount=Decimal('1.00'))
+
+        out = StringIO()
+        call_command('rebuild_saving_goal_progress', '--check', stdout=out)
+        self.assertIn('Found drift in 1 saving goals', out.getvalue())
+        self.assertEqual(self._progress(self.bike), (Decimal('1.00'), True))
+
+        call_command('rebuild_saving_goal_progress', stdout=StringIO())
+        self.assertEqual(self._progress(self.bike), (Decimal('10.00'), True))
+
+
+class SavingGoalListViewTests(TestCase):
+    """The goal list filters, counts and pages goals in the database"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.client.force_login(self.user)
+
+    def _goal(self, name, target, saved=None, child_name=''):
+        goal = SavingGoal.objects.create(user=self.user, goal_name=name, target_amount=Decimal(target), child_name=child_name)
+        if saved:
+            Saving.objects.create(user=self.user, saving_goal=goal, amount=Decimal(saved), description='Jar', date=timezone.now().date())
+        return goal
+
+    def _list(self, **params):
+        return self.client.get(reverse('tracking:saving_goal_list'), params)
+
+    def test_status_filter_and_totals(self):
+        self._goal('Done', '1.00', saved='1.00')
+        self._goal('Open', '5.00', saved='2.00')
+
+        response = self._list(status='completed')
+        self.assertEqual([goal.goal_name for goal in response.context['saving_goals']], ['Done'])
+
+        response = self._list()
+        self.assertEqual(response.context['total_goals'], 2)
+        self.assertEqual(response.context['completed_goals'], 1)
+        self.assertEqual(response.context['total_target'], Decimal('6.00'))
+        self.assertEqual(response.context['total_current'], Decimal('3.00'))
+
+    def test_query_count_does_not_grow_with_goals(self):
+        for index in range(3):
+            self._goal(f'Goal {index}', '5.00', saved='1.00')
+        # Warm the cached navigation menu
+        self._list()
+        with self.assertNumQueries(6):
+            self._list()
+
+        for index in range(3, 9):
+            self._goal(f'Goal {index}', '5.00', saved='1.00')
+        with self.assertNumQueries(6):
+            self._list()
+
+    def test_pages_keep_filters(self):
+        for index in range(SAVING_GOALS_PER_PAGE + 2):
+            self._goal(f'Goal {index}', '5.00', child_name='Ann')
+        self._goal('Other', '5.00', child_name='Ben')
+
+        first = self._list(child='Ann')
+        self.assertEqual(len(first.context['saving_goals']), SAVING_GOALS_PER_PAGE)
+        self.assertEqual(first.context['total_goals'], SAVING_GOALS_PER_PAGE + 2)
+        next_cursor = first.context['saving_goals'].next_cursor
+        self.assertContains(first, f'?child=Ann&amp;cursor={next_cursor}')
+
+        second = self._list(child='Ann', cursor=next_cursor)
+        names = {goal.goal_name for goal in second.context['saving_goals']}
+        self.assertEqual(names, {'Goal 0', 'Goal 1'})
+        self.assertFalse(second.context['saving_goals'].has_next)
+
+
+class SpendingDailyRollupTests(TestCase):
+    """Spending writes keep the daily rollups equal to the raw totals"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.toys, _ = SpendingCategory.objects.get_or_create(name='Toys')
+        self.food, _ = SpendingCategory.objects.get_or_create(name='Food')
+        self.today = timezone.now().date()
+
+    def _spend(self, amount, category=None, child_name='', date=None):
+        return Spending.objects.create(
+            user=self.user, category=category, amount=Decimal(amount), description='Treat',
+            child_name=child_name, date=date or self.today
+        )
+
+    def _rollups(self):
+        return {
+            (row.date, row.category_id, row.child_name): (row.amount, row.spending_count)
+            for row in SpendingDailyRollup.objects.all()
+        }
+
+    def _raw(self):
+        rows = Spending.objects.values('date', 'category_id', 'child_name').annotate(total=Sum('amount'), count=Count('id'))
+        return {(row['date'], row['category_id'], row['child_name']): (row['total'], row['count']) for row in rows}
+
+    def test_writes_keep_rollups_in_step(self):
+        snack = self._spend('2.00', self.food)
+        self._spend('3.00', self.food)
+        self._spend('4.00', child_name='Ann')
+        self.assertEqual(self._rollups(), self._raw())
+
+        snack = Spending.objects.get(pk=snack.pk)
+        snack.amount = Decimal('5.00')
+        snack.save()
+        self.assertEqual(self._rollups()[(self.today, self.food.pk, '')], (Decimal('8.00'), 2))
+
+        snack.category = self.toys
+        snack.date = self.today - timedelta(days=1)
+        snack.save()
+        self.assertEqual(self._rollups(), self._raw())
+
+        snack.delete()
+        self.assertEqual(self._rollups(), self._raw())
+        self.assertNotIn((self.today - timedelta(days=1), self.toys.pk, ''), self._rollups())
+
+    def test_deleting_a_category_regroups_its_spendings(self):
+        self._spend('2.00', self.toys)
+        self._spend('3.00')
+
+        self.toys.delete()
+
+        self.assertEqual(self._rollups(), {(self.today, None, ''): (Decimal('5.00'), 2)})
+
+    def test_backfill_command_rebuilds_rollups(self):
+        self._spend('2.00', self.food)
+        self._spend('3.00', self.toys, child_name='Ann')
+        SpendingDailyRollup.objects.all().delete()
+
+        call_command('backfill_spending_rollups', stdout=StringIO())
+
+        self.assertEqual(self._rollups(), self._raw())
+
+    def test_dashboard_reads_rollups(self):
+        self._spend('2.00', self.food)
+        self._spend('3.00', self.food, child_name='Ann')
+        self._spend('4.00', self.toys, date=self.today - timedelta(days=40))
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('tracking:spending_dashboard'))
+
+        self.assertEqual(response.context['total_spendings'], 3)
+        self.assertEqual(response.context['recent_total'], Decimal('5.00'))
+        self.assertEqual(response.context['category_stats'][0]['category__name'], 'Food')
+        self.assertEqual(response.context['category_stats'][0]['count'], 2)
+        self.assertEqual([stat['child_name'] for stat in response.context['child_stats']], ['Ann'])
+        self.assertIn('"data": [5.0]', response.context['daily_chart_data_json'])
+
+
+class DatedRecordListPaginationTests(TestCase):
+    """Spending and saving lists page with keyset cursors and keep their filters"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.client.force_login(self.user)
+        self.today = timezone.now().date()
+
+    def _walk(self, url_name, context_name, **params):
+        """Follow next cursors from the first page, returning every record pk seen"""
+        seen = []
+        response = self.client.get(reverse(url_name), params)
+        while True:
+            page = response.context[context_name]
+            seen.extend(record.pk for record in page)
+            if not page.has_next:
+                return seen, response
+            self.assertContains(response, f'cursor={page.next_cursor}')
+            response = self.client.get(reverse(url_name), {**params, 'cursor': page.next_cursor})
 
-# Create your tests here.
+    def test_spending_pages_cover_filtered_records_once(self):
+        expected = [
+            Spending.objects.create(
+                user=self.user, amount=Decimal('1.00'), description='Treat', child_name='Ann',
+                date=self.today - timedelta(days=index % 3)
+            ).pk
+            for index in range(SPENDINGS_PER_PAGE * 2 + 5)
+        ]
+        Spending.objects.create(user=self.user, amount=Decimal('1.00'), description='Treat', child_name='Ben', date=self.today)
 
+        seen, response = self._walk('tracking:spending_list', 'spendings', child='Ann')
 
+        self.assertEqual(sorted(seen), sorted(expected))
+        self.assertEqual(response.context['total_count'], len(expected))
+        self.assertEqual(response.context['total_amount'], Decimal(len(expected)))
 
+    def test_saving_pages_keep_search(self):
+        expected = [
+            Saving.objects.create(user=self.user, amount=Decimal('1.00'), description='Piggy bank', date=self.today).pk
+            for _ in range(SAVINGS_PER_PAGE + 3)
+        ]
+        Saving.objects.create(user=self.user, amount=Decimal('1.00'), description='Jar', date=self.today)
 
+        seen, _response = self._walk('tracking:saving_list', 'savings', search='piggy')
 
+        self.assertEqual(sorted(seen), sorted(expected))
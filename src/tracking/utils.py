@@ -0,0 +1,126 @@
+from decimal import Decimal
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
+from django.utils import timezone
+from .models import Saving, SavingGoal, Spending, SpendingDailyRollup
+
+
+def apply_saving_entry(goal_id, amount, sign=1):
+    """Add one saving amount to a goal's stored progress (sign=-1 removes it)"""
+    if goal_id is None:
+        return
+    delta = Decimal(str(amount or 0)) * sign
+    if not delta:
+        return
+    SavingGoal.objects.filter(pk=goal_id).update(current_amount=F('current_amount') + delta)
+    refresh_goal_completion([goal_id])
+
+
+def refresh_goal_completion(goal_ids):
+    """Set completed_at on goals that reached their target and clear it on goals that fell below
+    
+    Runs after current_amount was updated, so the comparison sees the new amount.
+    """
+    SavingGoal.objects.filter(pk__in=goal_ids).update(completed_at=Case(
+        When(current_amount__gte=F('target_amount'), then=Coalesce(F('completed_at'), Value(timezone.now()))),
+        default=None,
+    ))
+
+
+def compute_goal_progress(goal_id):
+    """Compute the saved amount for a goal from its raw savings
+    
+    Returns:
+        Decimal: Sum of the goal's saving amounts
+    """
+    total = Saving.objects.filter(saving_goal_id=goal_id).aggregate(total=Sum('amount'))['total']
+    return total or Decimal('0.00')
+
+
+def rebuild_goal_progress(goal_id):
+    """Recount stored progress for a goal from its raw savings
+    
+    Returns:
+        Decimal: The recounted current amount
+    """
+    current_amount = compute_goal_progress(goal_id)
+    with transaction.atomic():
+        SavingGoal.objects.filter(pk=goal_id).update(current_amount=current_amount)
+        refresh_goal_completion([goal_id])
+    return current_amount
+
+
+def apply_spending_entry(user_id, date, category_id, child_name, amount, sign=1):
+    """Add one spending to its daily rollup row (sign=-1 removes it)"""
+    adjust_spending_rollup(user_id, date, category_id, child_name, Decimal(str(amount or 0)) * sign, sign)
+
+
+def adjust_spending_rollup(user_id, date, category_id, child_name, amount_delta, count_delta):
+    """Add amount/count deltas to the (user, date, category, child) rollup row
+    
+    The row is created on first use and removed once it counts no spendings.
+    """
+    if not amount_delta and not count_delta:
+        return
+    changes = {'amount': F('amount') + amount_delta, 'spending_count': F('spending_count') + count_delta}
+    rollups = SpendingDailyRollup.objects.filter(user_id=user_id, date=date, category_id=category_id, child_name=child_name)
+    if count_delta < 0:
+        rollups.update(**changes)
+        rollups.filter(spending_count__lte=0).delete()
+        return
+    if rollups.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            SpendingDailyRollup.objects.create(
+                user_id=user_id, date=date, category_id=category_id, child_name=child_name,
+                amount=amount_delta, spending_count=count_delta
+            )
+    except IntegrityError:
+        # Another writer created the row first
+        rollups.update(**changes)
+
+
+# Sent with user_ids after rebuild_spending_rollups() replaced their rollups
+# (bulk writes that send no post_save, e.g. a deleted category)
+spending_rollups_rebuilt = Signal()
+
+
+def rebuild_spending_rollups(user_ids=None):
+    """Replace spending rollups with totals grouped from raw spendings
+    
+    Args:
+        user_ids: User ids to rebuild (optional, defaults to all users)
+    
+    Returns:
+        int: Number of rollup rows written
+    """
+    spendings = Spending.objects.all()
+    stale_rollups = SpendingDailyRollup.objects.all()
+    if user_ids is not None:
+        spendings = spendings.filter(user_id__in=user_ids)
+        stale_rollups = stale_rollups.filter(user_id__in=user_ids)
+    
+    rows = spendings.values('user_id', 'date', 'category_id', 'child_name').annotate(
+        total=Sum('amount'),
+        spending_count=Count('id'),
+    ).order_by()
+    rollups = [
+        SpendingDailyRollup(
+            user_id=row['user_id'],
+            date=row['date'],
+            category_id=row['category_id'],
+            child_name=row['child_name'],
+            amount=row['total'] or Decimal('0.00'),
+            spending_count=row['spending_count'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        stale_rollups.delete()
+        SpendingDailyRollup.objects.bulk_create(rollups, batch_size=500)
+    if user_ids is not None:
+        spending_rollups_rebuilt.send(sender=SpendingDailyRollup, user_ids=list(user_ids))
+    return len(rollups)
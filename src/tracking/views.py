@@ -1,14 +1,21 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
-from django.db.models import Sum, Q, Count
+from django.db.models import Sum, Q, Count, F, Value, DecimalField
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.safestring import mark_safe
 from datetime import datetime, timedelta
+from decimal import Decimal
 import json
 
-from .models import Spending, SpendingCategory, Saving, SavingGoal
+from mysite.pagination import DATED_RECORD_ORDERING, paginate_keyset
+from .models import Spending, SpendingCategory, SpendingDailyRollup, Saving, SavingGoal
 from .forms import SpendingForm, SavingForm, SavingGoalForm
 
+SPENDINGS_PER_PAGE = 24
+SAVINGS_PER_PAGE = 24
+SAVING_GOALS_PER_PAGE = 12
+
 
 # Spending views ==================================================================
 
@@ -16,7 +23,7 @@ from .forms import SpendingForm, SavingForm, SavingGoalForm
 def spending_list_view(request):
     """Spending list page"""
     # Get all spending records for current user
-    spendings = Spending.objects.filter(user=request.user)
+    spendings = Spending.objects.filter(user=request.user).select_related('category')
     
     # Search functionality
     search_query = request.GET.get('search', '')
@@ -45,17 +52,26 @@ def spending_list_view(request):
     if date_to:
         spendings = spendings.filter(date__lte=date_to)
     
-    # Statistics
-    total_amount = spendings.aggregate(Sum('amount'))['amount__sum'] or 0
+    # Statistics (over all matching records, not just the current page)
+    totals = spendings.aggregate(total_amount=Sum('amount'), total_count=Count('id'))
+    
+    # One keyset page of records at a time
+    spendings_page = paginate_keyset(
+        spendings,
+        ordering=DATED_RECORD_ORDERING,
+        cursor=request.GET.get('cursor'),
+        per_page=SPENDINGS_PER_PAGE,
+    )
     
     # Get all categories and child names (for filtering)
     categories = SpendingCategory.objects.all().order_by('name')
-    child_names = Spending.objects.filter(user=request.user).values_list('child_name', flat=True).distinct()
+    child_names = Spending.objects.filter(user=request.user).order_by('child_name').values_list('child_name', flat=True).distinct()
     child_names = [name for name in child_names if name]  # Filter empty values
     
     context = {
-        'spendings': spendings,
-        'total_amount': total_amount,
+        'spendings': spendings_page,
+        'total_amount': totals['total_amount'] or 0,
+        'total_count': totals['total_count'],
         'categories': categories,
         'child_names': child_names,
         'search_query': search_query,
@@ -174,33 +190,31 @@ def spending_delete_view(request, pk):
 
 @login_required
 def spending_dashboard_view(request):
-    """Spending statistics dashboard"""
-    # Get all spending records for current user
-    spendings = Spending.objects.filter(user=request.user)
+    """Spending statistics dashboard (read from daily rollups, not raw spendings)"""
+    rollups = SpendingDailyRollup.objects.filter(user=request.user)
     
-    # This month statistics
+    # This month, last 7 days and all-time statistics in one query
     today = timezone.now().date()
     first_day_of_month = today.replace(day=1)
-    this_month_spendings = spendings.filter(date__gte=first_day_of_month)
-    this_month_total = this_month_spendings.aggregate(Sum('amount'))['amount__sum'] or 0
-    
-    # Statistics by category
-    category_stats = spendings.values('category__name', 'category__icon').annotate(
+    seven_days_ago = today - timedelta(days=7)
+    totals = rollups.aggregate(
+        this_month_total=Sum('amount', filter=Q(date__gte=first_day_of_month)),
+        recent_total=Sum('amount', filter=Q(date__gte=seven_days_ago)),
+        total_spendings=Sum('spending_count'),
+    )
+    
+    # Statistics by category (listed once, reused by the table and the pie chart)
+    category_stats = list(rollups.values('category__name', 'category__icon').annotate(
         total=Sum('amount'),
-        count=Count('id')
-    ).order_by('-total')
+        count=Sum('spending_count')
+    ).order_by('-total'))
     
     # Statistics by child
-    child_stats = spendings.exclude(child_name='').values('child_name').annotate(
+    child_stats = rollups.exclude(child_name='').values('child_name').annotate(
         total=Sum('amount'),
-        count=Count('id')
+        count=Sum('spending_count')
     ).order_by('-total')
     
-    # Last 7 days statistics
-    seven_days_ago = today - timedelta(days=7)
-    recent_spendings = spendings.filter(date__gte=seven_days_ago)
-    recent_total = recent_spendings.aggregate(Sum('amount'))['amount__sum'] or 0
-    
     # Prepare chart data - by category (pie chart)
     category_chart_data = {
         'labels': [],
@@ -217,7 +231,7 @@ def spending_dashboard_view(request):
     
     # Prepare chart data - last 30 days trend (line chart)
     thirty_days_ago = today - timedelta(days=30)
-    daily_spendings = spendings.filter(date__gte=thirty_days_ago).values('date').annotate(
+    daily_spendings = rollups.filter(date__gte=thirty_days_ago).values('date').annotate(
         total=Sum('amount')
     ).order_by('date')
     
@@ -230,11 +244,11 @@ def spending_dashboard_view(request):
         daily_chart_data['data'].append(float(item['total']))
     
     context = {
-        'this_month_total': this_month_total,
-        'recent_total': recent_total,
+        'this_month_total': totals['this_month_total'] or 0,
+        'recent_total': totals['recent_total'] or 0,
         'category_stats': category_stats,
         'child_stats': child_stats,
-        'total_spendings': spendings.count(),
+        'total_spendings': totals['total_spendings'] or 0,
         'category_chart_data_json': mark_safe(json.dumps(category_chart_data)),
         'daily_chart_data_json': mark_safe(json.dumps(daily_chart_data)),
     }
@@ -271,16 +285,25 @@ def saving_list_view(request):
     if date_to:
         savings = savings.filter(date__lte=date_to)
     
-    # Statistics
-    total_amount = savings.aggregate(Sum('amount'))['amount__sum'] or 0
+    # Statistics (over all matching records, not just the current page)
+    totals = savings.aggregate(total_amount=Sum('amount'), total_count=Count('id'))
+    
+    # One keyset page of records at a time
+    savings_page = paginate_keyset(
+        savings,
+        ordering=DATED_RECORD_ORDERING,
+        cursor=request.GET.get('cursor'),
+        per_page=SAVINGS_PER_PAGE,
+    )
     
     # Get all child names (for filtering)
-    child_names = Saving.objects.filter(user=request.user).values_list('child_name', flat=True).distinct()
+    child_names = Saving.objects.filter(user=request.user).order_by('child_name').values_list('child_name', flat=True).distinct()
     child_names = [name for name in child_names if name]  # Filter empty values
     
     context = {
-        'savings': savings,
-        'total_amount': total_amount,
+        'savings': savings_page,
+        'total_amount': totals['total_amount'] or 0,
+        'total_count': totals['total_count'],
         'child_names': child_names,
         'search_query': search_query,
         'child_filter': child_filter,
@@ -388,7 +411,7 @@ def saving_dashboard_view(request):
     # Get all savings goals
     saving_goals = SavingGoal.objects.filter(user=request.user).order_by('-created_at')[:6]
     total_goals = SavingGoal.objects.filter(user=request.user).count()
-    completed_goals = sum(1 for goal in SavingGoal.objects.filter(user=request.user) if goal.is_completed)
+    completed_goals = SavingGoal.objects.filter(user=request.user).completed().count()
     
     context = {
         'this_month_total': this_month_total,
@@ -425,31 +448,39 @@ def saving_goal_list_view(request):
         saving_goals = saving_goals.filter(child_name=child_filter)
     
     # Get all child names (for filtering)
-    child_names = SavingGoal.objects.filter(user=request.user).values_list('child_name', flat=True).distinct()
+    child_names = SavingGoal.objects.filter(user=request.user).order_by('child_name').values_list('child_name', flat=True).distinct()
     child_names = [name for name in child_names if name]  # Filter empty values
     
-    # Convert to list for filtering
-    saving_goals_list = list(saving_goals)
-    
-    # Filter by completion status
+    # Filter by completion status (on the stored progress)
     status_filter = request.GET.get('status', '')
     if status_filter == 'completed':
-        saving_goals_list = [goal for goal in saving_goals_list if goal.is_completed]
+        saving_goals = saving_goals.completed()
     elif status_filter == 'in_progress':
-        saving_goals_list = [goal for goal in saving_goals_list if not goal.is_completed]
-    
-    # Calculate total statistics
-    total_goals = len(saving_goals_list)
-    completed_goals = sum(1 for goal in saving_goals_list if goal.is_completed)
-    total_target = sum(goal.target_amount for goal in saving_goals_list)
-    total_current = sum(goal.current_amount for goal in saving_goals_list)
+        saving_goals = saving_goals.in_progress()
+    
+    # Calculate total statistics for the filtered goals in one query
+    zero = Value(Decimal('0.00'), output_field=DecimalField(max_digits=12, decimal_places=2))
+    totals = saving_goals.aggregate(
+        total_goals=Count('id'),
+        completed_goals=Count('id', filter=Q(current_amount__gte=F('target_amount'))),
+        total_target=Coalesce(Sum('target_amount'), zero),
+        total_current=Coalesce(Sum('current_amount'), zero),
+    )
+    
+    # One keyset page of goals at a time
+    goals_page = paginate_keyset(
+        saving_goals,
+        ordering=['-created_at', '-id'],
+        cursor=request.GET.get('cursor'),
+        per_page=SAVING_GOALS_PER_PAGE,
+    )
     
     context = {
-        'saving_goals': saving_goals_list,
-        'total_goals': total_goals,
-        'completed_goals': completed_goals,
-        'total_target': total_target,
-        'total_current': total_current,
+        'saving_goals': goals_page,
+        'total_goals': totals['total_goals'],
+        'completed_goals': totals['completed_goals'],
+        'total_target': totals['total_target'],
+        'total_current': totals['total_current'],
         'child_names': child_names,
         'search_query': search_query,
         'child_filter': child_filter,
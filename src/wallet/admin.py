@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Wallet, WalletTransaction
+from .models import Wallet, WalletTransaction, WalletDailyRollup
 
 
 @admin.register(Wallet)
@@ -7,7 +7,7 @@ class WalletAdmin(admin.ModelAdmin):
     list_display = ['user', 'child_name', 'coin_name', 'is_practice_mode', 'balance', 'created_at']
     list_filter = ['is_practice_mode', 'user', 'child_name', 'created_at']
     search_fields = ['user__username', 'child_name', 'coin_name']
-    readonly_fields = ['balance', 'created_at', 'updated_at']
+    readonly_fields = ['balance', 'total_income', 'total_expense', 'created_at', 'updated_at']
     
     fieldsets = (
         ('Basic Information', {
@@ -18,7 +18,7 @@ class WalletAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
         ('Statistics', {
-            'fields': ('balance',)
+            'fields': ('balance', 'total_income', 'total_expense')
         }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at')
@@ -32,4 +32,19 @@ class WalletTransactionAdmin(admin.ModelAdmin):
     list_filter = ['transaction_type', 'date', 'created_at']
     search_fields = ['wallet__child_name', 'description']
     readonly_fields = ['created_at', 'updated_at']
+    
+    def delete_queryset(self, request, queryset):
+        # Bulk deletes bypass WalletTransaction.delete(), so recount the affected wallets
+        from .utils import rebuild_wallet_ledger
+        wallet_ids = set(queryset.values_list('wallet_id', flat=True))
+        super().delete_queryset(request, queryset)
+        for wallet_id in wallet_ids:
+            rebuild_wallet_ledger(wallet_id)
+
 
+@admin.register(WalletDailyRollup)
+class WalletDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ['wallet', 'date', 'income', 'expense', 'transaction_count']
+    list_filter = ['date']
+    search_fields = ['wallet__child_name', 'wallet__coin_name']
+    readonly_fields = ['wallet', 'date', 'income', 'expense', 'transaction_count']
@@ -0,0 +1,35 @@
+"""
+Management command: Rebuild wallet daily rollups from transactions
+Usage: python manage.py backfill_wallet_rollups [--chunk-size 200]
+"""
+from django.core.management.base import BaseCommand
+
+from wallet.models import Wallet
+from wallet.utils import rebuild_daily_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild WalletDailyRollup rows from wallet transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=200,
+            help='Number of wallets rebuilt per database transaction (default: 200)',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        wallet_ids = list(Wallet.objects.order_by('pk').values_list('pk', flat=True))
+        total_wallets = len(wallet_ids)
+        rollup_count = 0
+        
+        for start in range(0, total_wallets, chunk_size):
+            chunk = wallet_ids[start:start + chunk_size]
+            rollup_count += rebuild_daily_rollups(chunk)
+            self.stdout.write(f'  {min(start + chunk_size, total_wallets)}/{total_wallets} wallets')
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Rebuilt {rollup_count} daily rollups for {total_wallets} wallets'
+        ))
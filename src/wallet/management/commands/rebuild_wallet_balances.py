@@ -0,0 +1,50 @@
+"""
+Management command: Verify and repair wallet ledger totals
+Usage: python manage.py rebuild_wallet_balances [--check]
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wallet.models import Wallet
+from wallet.utils import rebuild_wallet_ledger
+
+
+class Command(BaseCommand):
+    help = 'Recount wallet income/expense totals from transactions and repair any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report wallets whose stored totals drifted, do not repair them',
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        
+        # Compare stored totals with recomputed totals for every wallet in one grouped query
+        wallets = Wallet.objects.with_transaction_totals().order_by('pk')
+        checked_count = 0
+        drifted_ids = []
+        for wallet in wallets.iterator():
+            checked_count += 1
+            if wallet.total_income != wallet.computed_income or wallet.total_expense != wallet.computed_expense:
+                drifted_ids.append(wallet.pk)
+                self.stdout.write(self.style.WARNING(
+                    f'↻ Wallet {wallet.pk} ({wallet}): stored {wallet.total_income}/{wallet.total_expense}, '
+                    f'actual {wallet.computed_income}/{wallet.computed_expense}'
+                ))
+        
+        if not check_only:
+            for wallet_id in drifted_ids:
+                with transaction.atomic():
+                    # Lock the wallet so concurrent transaction writes cannot interleave with the recount
+                    Wallet.objects.select_for_update().only('pk').get(pk=wallet_id)
+                    rebuild_wallet_ledger(wallet_id)
+        
+        self.stdout.write(self.style.SUCCESS(f'\n✓ Checked {checked_count} wallets'))
+        if drifted_ids:
+            action = 'Found' if check_only else 'Repaired'
+            self.stdout.write(self.style.WARNING(f'  {action} drift in {len(drifted_ids)} wallets'))
+        else:
+            self.stdout.write(self.style.SUCCESS('  No drift found'))
@@ -0,0 +1,43 @@
+# Generated by Django 6.0 on 2026-10-18 09:12
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Q, Sum
+
+
+def backfill_ledger_totals(apps, schema_editor):
+    """Fill ledger totals for existing wallets from their transactions"""
+    Wallet = apps.get_model('wallet', 'Wallet')
+    WalletTransaction = apps.get_model('wallet', 'WalletTransaction')
+    
+    totals = WalletTransaction.objects.values('wallet_id').annotate(
+        income=Sum('amount', filter=Q(transaction_type='income')),
+        expense=Sum('amount', filter=Q(transaction_type='expense')),
+    ).order_by()
+    for row in totals:
+        Wallet.objects.filter(pk=row['wallet_id']).update(
+            total_income=row['income'] or Decimal('0.00'),
+            total_expense=row['expense'] or Decimal('0.00'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0002_wallet_practice_mode'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='wallet',
+            name='total_expense',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Total Expense'),
+        ),
+        migrations.AddField(
+            model_name='wallet',
+            name='total_income',
+            field=models.DecimalField(decimal_places=2, default=Decimal('0.00'), editable=False, max_digits=12, verbose_name='Total Income'),
+        ),
+        migrations.RunPython(backfill_ledger_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 6.0 on 2026-10-18 10:05
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_daily_rollups(apps, schema_editor):
+    """Build daily rollups for existing transactions"""
+    WalletTransaction = apps.get_model('wallet', 'WalletTransaction')
+    WalletDailyRollup = apps.get_model('wallet', 'WalletDailyRollup')
+    
+    rows = WalletTransaction.objects.values('wallet_id', 'date').annotate(
+        income=Sum('amount', filter=Q(transaction_type='income')),
+        expense=Sum('amount', filter=Q(transaction_type='expense')),
+        transaction_count=Count('id'),
+    ).order_by()
+    WalletDailyRollup.objects.bulk_create([
+        WalletDailyRollup(
+            wallet_id=row['wallet_id'],
+            date=row['date'],
+            income=row['income'] or Decimal('0.00'),
+            expense=row['expense'] or Decimal('0.00'),
+            transaction_count=row['transaction_count'],
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallet', '0003_wallet_ledger_totals'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Date')),
+                ('income', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Income')),
+                ('expense', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name='Expense')),
+                ('transaction_count', models.IntegerField(default=0, verbose_name='Transaction Count')),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='wallet.wallet', verbose_name='Wallet')),
+            ],
+            options={
+                'verbose_name': 'Wallet Daily Rollup',
+                'verbose_name_plural': 'Wallet Daily Rollups',
+                'ordering': ['-date'],
+                'unique_together': {('wallet', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_rollups, migrations.RunPython.noop),
+    ]
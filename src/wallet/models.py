@@ -1,11 +1,50 @@
+from decimal import Decimal
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.urls import reverse
-from django.db.models import Sum, Q
+from django.db.models import Sum, Q, F
+from django.db.models.functions import Coalesce
+
+from mysite.stored_aggregates import StoredAggregateMixin
 
 User = get_user_model()
 
 
+class WalletQuerySet(models.QuerySet):
+    """Wallet queryset with bulk balance helpers"""
+    
+    def with_balances(self):
+        """Annotate each wallet with current_balance (from the ledger totals)"""
+        return self.annotate(current_balance=F('total_income') - F('total_expense'))
+    
+    def with_transaction_totals(self):
+        """Annotate income, expense and balance recomputed from raw transactions in one grouped query
+        
+        Used to verify the ledger totals; normal reads should use with_balances().
+        """
+        zero = models.Value(Decimal('0.00'), output_field=models.DecimalField(max_digits=12, decimal_places=2))
+        return self.annotate(
+            computed_income=Coalesce(Sum('transactions__amount', filter=Q(transactions__transaction_type='income')), zero),
+            computed_expense=Coalesce(Sum('transactions__amount', filter=Q(transactions__transaction_type='expense')), zero),
+        ).annotate(computed_balance=F('computed_income') - F('computed_expense'))
+    
+    def balance_totals(self):
+        """Aggregate wallet counts and balances (all, practice, real) in one query"""
+        balance = F('total_income') - F('total_expense')
+        practice = Q(is_practice_mode=True)
+        totals = self.aggregate(
+            total_wallets=models.Count('pk'),
+            total_balance=Sum(balance),
+            practice_count=models.Count('pk', filter=practice),
+            practice_balance=Sum(balance, filter=practice),
+            real_count=models.Count('pk', filter=~practice),
+            real_balance=Sum(balance, filter=~practice),
+        )
+        for key in ('total_balance', 'practice_balance', 'real_balance'):
+            totals[key] = totals[key] or Decimal('0.00')
+        return totals
+
+
 class Wallet(models.Model):
     """Virtual coin wallet model"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='wallets', verbose_name='User')
@@ -24,10 +63,18 @@ class Wallet(models.Model):
         help_text='Initial balance for practice mode wallet (optional)'
     )
     
+    # Ledger totals (maintained by WalletTransaction writes, never edited directly)
+    total_income = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), editable=False, verbose_name='Total Income')
+    total_expense = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), editable=False, verbose_name='Total Expense')
+    
+    LEDGER_FIELDS = ('total_income', 'total_expense')
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
+    objects = WalletQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Wallet'
@@ -43,14 +90,22 @@ class Wallet(models.Model):
     def get_absolute_url(self):
         return reverse('wallet:wallet_detail', kwargs={'pk': self.pk})
     
+    def save(self, *args, **kwargs):
+        """Save wallet without overwriting ledger totals from a possibly stale instance"""
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.LEDGER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+    
     @property
     def balance(self):
-        """Calculate wallet balance"""
-        from .utils import calculate_wallet_balance
-        return calculate_wallet_balance(self)
+        """Wallet balance from the maintained ledger totals"""
+        return self.total_income - self.total_expense
 
 
-class WalletTransaction(models.Model):
+class WalletTransaction(StoredAggregateMixin, models.Model):
     """Wallet transaction record model"""
     TRANSACTION_TYPE_CHOICES = [
         ('income', 'Income'),
@@ -67,14 +122,52 @@ class WalletTransaction(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='Created At')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='Updated At')
     
+    # Fields that place a transaction in the wallet ledger and daily rollup
+    AGGREGATE_STATE_FIELDS = ('wallet_id', 'transaction_type', 'amount', 'date')
+    
     class Meta:
         ordering = ['-date', '-created_at']
         verbose_name = 'Wallet Transaction'
         verbose_name_plural = 'Wallet Transactions'
+        indexes = [
+            # Keyset pagination of a wallet's list (DATED_RECORD_ORDERING)
+            models.Index(fields=['wallet', '-date', '-created_at', '-id'], name='wallet_txn_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.date} - {self.transaction_type} - {self.amount} - {self.description}"
     
     def get_absolute_url(self):
         return reverse('wallet:transaction_detail', kwargs={'pk': self.pk})
+    
+    def apply_aggregate_change(self, previous, current):
+        """Move the transaction between wallet ledger totals and daily rollups"""
+        from .utils import apply_ledger_entry
+        
+        if previous is not None:
+            apply_ledger_entry(*previous, sign=-1)
+        if current is not None:
+            apply_ledger_entry(*current)
+    
+    def aggregates_changed(self):
+        """Reload ledger totals on an already fetched wallet so its balance is not stale"""
+        if WalletTransaction.wallet.is_cached(self) and self.wallet.pk:
+            self.wallet.refresh_from_db(fields=Wallet.LEDGER_FIELDS)
 
+
+class WalletDailyRollup(models.Model):
+    """Per-wallet daily income/expense totals (maintained by WalletTransaction writes)"""
+    wallet = models.ForeignKey(Wallet, on_delete=models.CASCADE, related_name='daily_rollups', verbose_name='Wallet')
+    date = models.DateField(verbose_name='Date')
+    income = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), verbose_name='Income')
+    expense = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'), verbose_name='Expense')
+    transaction_count = models.IntegerField(default=0, verbose_name='Transaction Count')
+    
+    class Meta:
+        ordering = ['-date']
+        verbose_name = 'Wallet Daily Rollup'
+        verbose_name_plural = 'Wallet Daily Rollups'
+        unique_together = [['wallet', 'date']]
+    
+    def __str__(self):
+        return f"{self.wallet} - {self.date} - +{self.income} / -{self.expense}"
@@ -1,7 +1,153 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .admin import WalletTransactionAdmin
+from .models import Wallet, WalletDailyRollup, WalletTransaction
+from .views import TRANSACTIONS_PER_PAGE
+
+User = get_user_model()
+
+
+class TransactionListPaginationTests(TestCase):
+    """The transaction list pages with keyset cursors and keeps its filters"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.client.force_login(self.user)
+        self.wallet = Wallet.objects.create(user=self.user, coin_name='Star Coin')
+        self.url = reverse('wallet:transaction_list', args=[self.wallet.pk])
+
+    def _add(self, transaction_type, count):
+        return [
+            WalletTransaction.objects.create(
+                wallet=self.wallet, transaction_type=transaction_type, amount=Decimal('2.00'),
+                description='Allowance', date=timezone.now().date()
+            ).pk
+            for _ in range(count)
+        ]
+
+    def test_pages_cover_filtered_transactions_once(self):
+        expected = self._add('income', TRANSACTIONS_PER_PAGE + 4)
+        self._add('expense', 3)
+
+        first = self.client.get(self.url, {'type': 'income'})
+        page = first.context['transactions']
+        self.assertEqual(len(page), TRANSACTIONS_PER_PAGE)
+        self.assertContains(first, f'?type=income&amp;cursor={page.next_cursor}')
+        self.assertEqual(first.context['total_income'], Decimal('2.00') * len(expected))
+        self.assertEqual(first.context['total_expense'], 0)
+
+        second = self.client.get(self.url, {'type': 'income', 'cursor': page.next_cursor})
+        seen = [transaction.pk for transaction in page] + [transaction.pk for transaction in second.context['transactions']]
+
+        self.assertFalse(second.context['transactions'].has_next)
+        self.assertEqual(sorted(seen), sorted(expected))
+
+
+class WalletLedgerTests(TestCase):
+    """Transaction writes keep the wallet ledger totals and daily rollups in step"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='kid', email='kid@example.com', password='secret')
+        self.wallet = Wallet.objects.create(user=self.user, coin_name='Star Coin')
+        self.other = Wallet.objects.create(user=self.user, coin_name='Moon Coin')
+        self.today = timezone.now().date()
+
+    def _add(self, transaction_type, amount, wallet=None):
+        return WalletTransaction.objects.create(
+            wallet=wallet or self.wallet, transaction_type=transaction_type, amount=Decimal(amount),
+            description='Allowance', date=self.today
+        )
+
+    def _ledger(self, wallet):
+        wallet.refresh_from_db()
+        return wallet.total_income, wallet.total_expense
+
+    def _rollup(self, wallet):
+        rollup = WalletDailyRollup.objects.filter(wallet=wallet, date=self.today).first()
+        return rollup and (rollup.income, rollup.expense, rollup.transaction_count)
+
+    def test_create_and_edit_amount_and_type(self):
+        self._add('income', '10.00')
+        expense = self._add('expense', '4.00')
+        self.assertEqual(self._ledger(self.wallet), (Decimal('10.00'), Decimal('4.00')))
+
+        expense = WalletTransaction.objects.get(pk=expense.pk)
+        expense.amount = Decimal('6.00')
+        expense.save()
+        self.assertEqual(self._ledger(self.wallet), (Decimal('10.00'), Decimal('6.00')))
+
+        expense.transaction_type = 'income'
+        expense.save()
+        self.assertEqual(self._ledger(self.wallet), (Decimal('16.00'), Decimal('0.00')))
+        self.assertEqual(self._rollup(self.wallet), (Decimal('16.00'), Decimal('0.00'), 2))
+
+    def test_reassigning_wallet_moves_the_amount(self):
+        transaction = WalletTransaction.objects.get(pk=self._add('income', '5.00').pk)
+        transaction.wallet = self.other
+        transaction.save()
+
+        self.assertEqual(self._ledger(self.wallet), (Decimal('0.00'), Decimal('0.00')))
+        self.assertEqual(self._ledger(self.other), (Decimal('5.00'), Decimal('0.00')))
+        self.assertEqual(self._rollup(self.other), (Decimal('5.00'), Decimal('0.00'), 1))
+
+    def test_deferred_save_reads_previous_state(self):
+        transaction = self._add('income', '5.00')
+
+        transaction = WalletTransaction.objects.only('pk', 'description').get(pk=transaction.pk)
+        transaction.wallet = self.other
+        transaction.save()
+
+        self.assertEqual(self._ledger(self.wallet), (Decimal('0.00'), Decimal('0.00')))
+        self.assertEqual(self._ledger(self.other), (Decimal('5.00'), Decimal('0.00')))
+        self.assertEqual(self._rollup(self.other), (Decimal('5.00'), Decimal('0.00'), 1))
+
+    def test_delete_removes_the_amount(self):
+        self._add('income', '10.00')
+        expense = self._add('expense', '3.00')
+        expense.delete()
+
+        self.assertEqual(self._ledger(self.wallet), (Decimal('10.00'), Decimal('0.00')))
+        self.assertEqual(self._rollup(self.wallet), (Decimal('10.00'), Decimal('0.00'), 1))
+
+    def test_deleting_a_days_last_transaction_removes_its_rollup(self):
+        transaction = self._add('income', '10.00')
+        transaction.delete()
+
+        self.assertIsNone(self._rollup(self.wallet))
+        self.assertFalse(WalletDailyRollup.objects.exists())
+
+    def test_cached_wallet_balance_is_refreshed(self):
+        transaction = self._add('income', '7.00')
+        self.assertEqual(transaction.wallet.balance, Decimal('7.00'))
+
+    def test_admin_bulk_delete_recounts_wallets(self):
+        self._add('income', '10.00')
+        self._add('expense', '2.00')
+        self._add('income', '3.00', wallet=self.other)
 
-# Create your tests here.
+        model_admin = WalletTransactionAdmin(WalletTransaction, admin.site)
+        model_admin.delete_queryset(None, WalletTransaction.objects.filter(transaction_type='income'))
 
+        self.assertEqual(self._ledger(self.wallet), (Decimal('0.00'), Decimal('2.00')))
+        self.assertEqual(self._ledger(self.other), (Decimal('0.00'), Decimal('0.00')))
+        self.assertEqual(self._rollup(self.wallet), (Decimal('0.00'), Decimal('2.00'), 1))
 
+    def test_rebuild_wallet_balances_reports_and_repairs_drift(self):
+        self._add('income', '10.00')
+        Wallet.objects.filter(pk=self.wallet.pk).update(total_income=Decimal('99.00'))
 
+        out = StringIO()
+        call_command('rebuild_wallet_balances', '--check', stdout=out)
+        self.assertIn(f'Wallet {self.wallet.pk}', out.getvalue())
+        self.assertEqual(self._ledger(self.wallet), (Decimal('99.00'), Decimal('0.00')))
 
+        call_command('rebuild_wallet_balances', stdout=StringIO())
+        self.assertEqual(self._ledger(self.wallet), (Decimal('10.00'), Decimal('0.00')))
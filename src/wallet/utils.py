@@ -1,65 +1,183 @@
 from decimal import Decimal
-from django.db.models import Sum, Q
-from .models import Wallet, WalletTransaction
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Q, F, Count
+from .models import Wallet, WalletTransaction, WalletDailyRollup
 
 
-def calculate_wallet_balance(wallet):
-    """Calculate wallet balance"""
-    income = WalletTransaction.objects.filter(
-        wallet=wallet,
-        transaction_type='income'
-    ).aggregate(Sum('amount'))['amount__sum'] or Decimal('0.00')
+# Wallet ledger / daily rollup fields updated by each transaction type
+LEDGER_FIELD_BY_TYPE = {
+    'income': 'total_income',
+    'expense': 'total_expense',
+}
+ROLLUP_FIELD_BY_TYPE = {
+    'income': 'income',
+    'expense': 'expense',
+}
+
+
+def apply_ledger_entry(wallet_id, transaction_type, amount, date, sign=1):
+    """Add one transaction to the wallet ledger totals and its daily rollup (sign=-1 removes it)"""
+    field = LEDGER_FIELD_BY_TYPE.get(transaction_type)
+    if field is None or wallet_id is None:
+        return
+    delta = Decimal(str(amount or 0)) * sign
+    if delta:
+        Wallet.objects.filter(pk=wallet_id).update(**{field: F(field) + delta})
+    _apply_daily_rollup(wallet_id, date, ROLLUP_FIELD_BY_TYPE[transaction_type], delta, sign)
+
+
+def _apply_daily_rollup(wallet_id, date, field, delta, count_delta):
+    """Add amount/count deltas to the (wallet, date) rollup row
     
-    expense = WalletTransaction.objects.filter(
-        wallet=wallet,
-        transaction_type='expense'
-    ).aggregate(Sum('amount'))['amount__sum'] or Decimal('0.00')
+    The row is created on first use and removed once it counts no transactions.
+    """
+    changes = {field: F(field) + delta, 'transaction_count': F('transaction_count') + count_delta}
+    rollups = WalletDailyRollup.objects.filter(wallet_id=wallet_id, date=date)
+    if count_delta < 0:
+        rollups.update(**changes)
+        rollups.filter(transaction_count__lte=0).delete()
+        return
+    if rollups.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            WalletDailyRollup.objects.create(wallet_id=wallet_id, date=date, **{field: delta}, transaction_count=count_delta)
+    except IntegrityError:
+        # Another writer created the row first
+        rollups.update(**changes)
+
+
+def bulk_create_transactions(transactions):
+    """Insert many wallet transactions and apply their ledger/rollup deltas in grouped updates
     
-    return income - expense
+    WalletTransaction.save() is bypassed by bulk_create, so the deltas are
+    applied here once per (wallet, type, date) instead of once per row.
+    
+    Returns:
+        list: Created WalletTransaction objects
+    """
+    transactions = list(transactions)
+    if not transactions:
+        return transactions
+    
+    groups = {}
+    for wallet_transaction in transactions:
+        key = (wallet_transaction.wallet_id, wallet_transaction.transaction_type, wallet_transaction.date)
+        amount, count = groups.get(key, (Decimal('0.00'), 0))
+        groups[key] = (amount + Decimal(str(wallet_transaction.amount or 0)), count + 1)
+    
+    with transaction.atomic():
+        created = WalletTransaction.objects.bulk_create(transactions)
+        for (wallet_id, transaction_type, date), (amount, count) in groups.items():
+            field = LEDGER_FIELD_BY_TYPE.get(transaction_type)
+            if field is None:
+                continue
+            if amount:
+                Wallet.objects.filter(pk=wallet_id).update(**{field: F(field) + amount})
+            _apply_daily_rollup(wallet_id, date, ROLLUP_FIELD_BY_TYPE[transaction_type], amount, count)
+    return created
 
 
-def get_wallet_statistics(wallet):
-    """Get wallet statistics"""
-    transactions = WalletTransaction.objects.filter(wallet=wallet)
+def compute_wallet_ledger(wallet_id):
+    """Compute ledger totals for a wallet from its raw transactions
+    
+    Returns:
+        tuple: (total_income, total_expense)
+    """
+    totals = WalletTransaction.objects.filter(wallet_id=wallet_id).aggregate(
+        income=Sum('amount', filter=Q(transaction_type='income')),
+        expense=Sum('amount', filter=Q(transaction_type='expense')),
+    )
+    return totals['income'] or Decimal('0.00'), totals['expense'] or Decimal('0.00')
+
+
+def rebuild_wallet_ledger(wallet_id):
+    """Recount ledger totals and daily rollups for a wallet from its raw transactions
     
-    total_income = transactions.filter(transaction_type='income').aggregate(
-        Sum('amount')
-    )['amount__sum'] or Decimal('0.00')
+    Returns:
+        tuple: (total_income, total_expense)
+    """
+    total_income, total_expense = compute_wallet_ledger(wallet_id)
+    Wallet.objects.filter(pk=wallet_id).update(total_income=total_income, total_expense=total_expense)
+    rebuild_daily_rollups([wallet_id])
+    return total_income, total_expense
+
+
+def rebuild_daily_rollups(wallet_ids=None):
+    """Replace daily rollups with totals grouped from raw transactions
     
-    total_expense = transactions.filter(transaction_type='expense').aggregate(
-        Sum('amount')
-    )['amount__sum'] or Decimal('0.00')
+    Args:
+        wallet_ids: Wallet ids to rebuild (optional, defaults to all wallets)
     
-    balance = calculate_wallet_balance(wallet)
+    Returns:
+        int: Number of rollup rows written
+    """
+    transactions = WalletTransaction.objects.all()
+    stale_rollups = WalletDailyRollup.objects.all()
+    if wallet_ids is not None:
+        transactions = transactions.filter(wallet_id__in=wallet_ids)
+        stale_rollups = stale_rollups.filter(wallet_id__in=wallet_ids)
     
+    rows = transactions.values('wallet_id', 'date').annotate(
+        income=Sum('amount', filter=Q(transaction_type='income')),
+        expense=Sum('amount', filter=Q(transaction_type='expense')),
+        transaction_count=Count('id'),
+    ).order_by()
+    rollups = [
+        WalletDailyRollup(
+            wallet_id=row['wallet_id'],
+            date=row['date'],
+            income=row['income'] or Decimal('0.00'),
+            expense=row['expense'] or Decimal('0.00'),
+            transaction_count=row['transaction_count'],
+        )
+        for row in rows
+    ]
+    with transaction.atomic():
+        stale_rollups.delete()
+        WalletDailyRollup.objects.bulk_create(rollups, batch_size=500)
+    return len(rollups)
+
+
+def calculate_wallet_balance(wallet):
+    """Calculate wallet balance (read from the maintained ledger totals)"""
+    return wallet.balance
+
+
+def get_wallet_statistics(wallet):
+    """Get wallet statistics"""
     return {
-        'total_income': total_income,
-        'total_expense': total_expense,
-        'balance': balance,
-        'transaction_count': transactions.count(),
+        'total_income': wallet.total_income,
+        'total_expense': wallet.total_expense,
+        'balance': wallet.balance,
+        'transaction_count': WalletTransaction.objects.filter(wallet=wallet).count(),
     }
 
 
 def get_user_wallets_summary(user):
-    """Get summary information for all user wallets"""
-    wallets = Wallet.objects.filter(user=user)
+    """Get summary information for all user wallets (single query)"""
+    wallets = list(Wallet.objects.filter(user=user).with_balances())
     
     summary = {
-        'total_wallets': wallets.count(),
+        'total_wallets': len(wallets),
         'wallets': [],
         'total_balance': Decimal('0.00'),
     }
     
     for wallet in wallets:
-        balance = calculate_wallet_balance(wallet)
         summary['wallets'].append({
             'wallet': wallet,
-            'balance': balance,
+            'balance': wallet.current_balance,
         })
-        summary['total_balance'] += balance
+        summary['total_balance'] += wallet.current_balance
     
     return summary
 
 
+def get_user_total_balance(user):
+    """Get total balance across all user wallets (single aggregate query)"""
+    return Wallet.objects.filter(user=user).balance_totals()['total_balance']
+
+
 
 
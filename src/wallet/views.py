@@ -5,10 +5,13 @@ from django.db.models import Sum, Q, Count
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import Wallet, WalletTransaction
+from mysite.pagination import DATED_RECORD_ORDERING, paginate_keyset
+from .models import Wallet, WalletTransaction, WalletDailyRollup
 from .forms import WalletForm, WalletTransactionForm
 from .utils import calculate_wallet_balance, get_wallet_statistics, get_user_wallets_summary
 
+TRANSACTIONS_PER_PAGE = 25
+
 
 # Wallet views ==================================================================
 
@@ -37,14 +40,11 @@ def wallet_list_view(request):
     elif mode_filter == 'real':
         wallets = wallets.filter(is_practice_mode=False)
     
-    # Calculate balance for each wallet
-    wallets_with_balance = []
-    for wallet in wallets:
-        balance = calculate_wallet_balance(wallet)
-        wallets_with_balance.append({
-            'wallet': wallet,
-            'balance': balance,
-        })
+    # Balance for each wallet is annotated in the same query
+    wallets_with_balance = [
+        {'wallet': wallet, 'balance': wallet.current_balance}
+        for wallet in wallets.with_balances()
+    ]
     
     # Get all child names (for filtering)
     child_names = Wallet.objects.filter(user=request.user).values_list('child_name', flat=True).distinct()
@@ -169,54 +169,38 @@ def wallet_dashboard_view(request):
     """Wallet statistics dashboard"""
     wallets = Wallet.objects.filter(user=request.user)
     
-    # Get summary of all wallets
-    summary = get_user_wallets_summary(request.user)
+    # Get summary of all wallets (counts and balances in one aggregate query)
+    summary = wallets.balance_totals()
     
-    # This month statistics
+    # This month / last 7 days statistics (read from daily rollups, cost scales with days shown)
     today = timezone.now().date()
     first_day_of_month = today.replace(day=1)
-    this_month_transactions = WalletTransaction.objects.filter(
-        wallet__user=request.user,
-        date__gte=first_day_of_month
-    )
-    this_month_income = this_month_transactions.filter(
-        transaction_type='income'
-    ).aggregate(Sum('amount'))['amount__sum'] or 0
-    this_month_expense = this_month_transactions.filter(
-        transaction_type='expense'
-    ).aggregate(Sum('amount'))['amount__sum'] or 0
-    
-    # Last 7 days statistics
     seven_days_ago = today - timedelta(days=7)
-    recent_transactions = WalletTransaction.objects.filter(
-        wallet__user=request.user,
-        date__gte=seven_days_ago
+    rollups = WalletDailyRollup.objects.filter(wallet__user=request.user)
+    period_totals = rollups.aggregate(
+        this_month_income=Sum('income', filter=Q(date__gte=first_day_of_month)),
+        this_month_expense=Sum('expense', filter=Q(date__gte=first_day_of_month)),
+        recent_income=Sum('income', filter=Q(date__gte=seven_days_ago)),
+        recent_expense=Sum('expense', filter=Q(date__gte=seven_days_ago)),
+        total_transactions=Sum('transaction_count'),
     )
-    recent_income = recent_transactions.filter(
-        transaction_type='income'
-    ).aggregate(Sum('amount'))['amount__sum'] or 0
-    recent_expense = recent_transactions.filter(
-        transaction_type='expense'
-    ).aggregate(Sum('amount'))['amount__sum'] or 0
     
     # Statistics by child
-    child_stats = WalletTransaction.objects.filter(
-        wallet__user=request.user
-    ).exclude(wallet__child_name='').values('wallet__child_name').annotate(
-        total_income=Sum('amount', filter=Q(transaction_type='income')),
-        total_expense=Sum('amount', filter=Q(transaction_type='expense')),
-        count=Count('id')
+    child_stats = rollups.exclude(wallet__child_name='').values('wallet__child_name').annotate(
+        total_income=Sum('income'),
+        total_expense=Sum('expense'),
+        count=Sum('transaction_count')
     ).order_by('-total_income')
     
     context = {
         'total_wallets': summary['total_wallets'],
         'total_balance': summary['total_balance'],
-        'this_month_income': this_month_income,
-        'this_month_expense': this_month_expense,
-        'recent_income': recent_income,
-        'recent_expense': recent_expense,
+        'this_month_income': period_totals['this_month_income'] or 0,
+        'this_month_expense': period_totals['this_month_expense'] or 0,
+        'recent_income': period_totals['recent_income'] or 0,
+        'recent_expense': period_totals['recent_expense'] or 0,
         'child_stats': child_stats,
-        'total_transactions': WalletTransaction.objects.filter(wallet__user=request.user).count(),
+        'total_transactions': period_totals['total_transactions'] or 0,
     }
     return render(request, 'wallet/wallet_dashboard.html', context)
 
@@ -247,15 +231,25 @@ def transaction_list_view(request, wallet_pk):
     if date_to:
         transactions = transactions.filter(date__lte=date_to)
     
-    # Statistics
-    total_income = transactions.filter(transaction_type='income').aggregate(Sum('amount'))['amount__sum'] or 0
-    total_expense = transactions.filter(transaction_type='expense').aggregate(Sum('amount'))['amount__sum'] or 0
+    # Statistics (over all matching transactions, not just the current page)
+    totals = transactions.aggregate(
+        total_income=Sum('amount', filter=Q(transaction_type='income')),
+        total_expense=Sum('amount', filter=Q(transaction_type='expense')),
+    )
+    
+    # One keyset page of transactions at a time
+    transactions_page = paginate_keyset(
+        transactions,
+        ordering=DATED_RECORD_ORDERING,
+        cursor=request.GET.get('cursor'),
+        per_page=TRANSACTIONS_PER_PAGE,
+    )
     
     context = {
         'wallet': wallet,
-        'transactions': transactions,
-        'total_income': total_income,
-        'total_expense': total_expense,
+        'transactions': transactions_page,
+        'total_income': totals['total_income'] or 0,
+        'total_expense': totals['total_expense'] or 0,
         'search_query': search_query,
         'type_filter': type_filter,
         'date_from': date_from,